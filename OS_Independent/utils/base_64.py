@@ -2,16 +2,178 @@
 # -*- coding: utf-8 -*-
 
 """Utility functions for base 64 conversion
+
+Other binary to text encodings (base 16, base 32, url safe base 64 and base 85)
+are available through the codec registry: every streaming, chunked and file to
+file function accepts a codec name ("base64" by default).
 """
 __author__ = 'Quentin Comte-Gaz'
 __email__ = "quentin@comte-gaz.com"
 __license__ = "MIT License"
 __copyright__ = "Copyright Quentin Comte-Gaz (2016)"
-__python_version__ = "2.7+ and 3.+"
-__version__ = "0.1 (2016/03/27)"
+__python_version__ = "3.4+"
+__version__ = "0.2 (2026/10/18)"
 __status__ = "Usable for any project"
 
+import argparse # Manage program arguments
 import base64 # For base 64 conversion
+import binascii # Decode buffers without copying them first
+import collections # Keep parallel results and batch input files in order
+import glob # Expand input file patterns
+import logging
+import math
+import mmap # Map big files in memory instead of reading them
+import multiprocessing # Use every core for big files
+import multiprocessing.pool
+import os
+import re
+import sys
+
+# Size of the chunks read from the input when streaming (rounded down to a multiple
+# of the codec blocks so that chunks can be converted separately)
+DEFAULT_ENCODE_CHUNK_SIZE = 3 * 64 * 1024
+DEFAULT_DECODE_CHUNK_SIZE = 4 * 64 * 1024
+# Size of the file slices encoded by each worker in parallel mode
+DEFAULT_PARALLEL_SLICE_SIZE = 3 * 4 * 1024 * 1024
+
+DEFAULT_CODEC = "base64"
+
+_WHITESPACES = b" \t\r\n\v\f"
+
+class Base64DecodingError(ValueError):
+  """Error raised when base 64 (or any other codec) data can't be decoded
+
+  The offset attribute is the position (in the input data) of the first invalid character.
+  """
+
+  def __init__(self, message, offset):
+    ValueError.__init__(self, "{} (offset {})".format(message, offset))
+    self.offset = offset
+
+class Codec(object):
+  """Binary to text encoding working on independent blocks of data
+
+  Data is encoded by blocks of data_block_size bytes giving encoded_block_size
+  characters, so data split on block boundaries can be converted separately.
+  The last block is completed with padding characters (if padding is set) or
+  is shorter (partial_group_sizes gives the valid sizes of this last group).
+  """
+
+  def __init__(self, name, encode, decode, data_block_size, encoded_block_size, alphabet,
+               padding=None, padding_positions=(), partial_group_sizes=(), extension=None):
+    """Initialize the codec
+
+    Keyword arguments:
+        name -- (string) Name of the codec in the registry
+        encode -- (function) Encode bytes (or buffer) to encoded bytes
+        decode -- (function) Decode bytes (or buffer) without white spaces to bytes
+        data_block_size -- (int) Number of bytes of a block of data
+        encoded_block_size -- (int) Number of characters of an encoded block
+        alphabet -- (bytes) Characters accepted by the decode function (padding excluded)
+        padding -- (bytes, optional) Padding character (None if the codec has no padding)
+        padding_positions -- (tuple, optional) Positions in the last group where padding may start
+        partial_group_sizes -- (tuple, optional) Valid sizes of the last group (codec without padding)
+        extension -- (string, optional) Extension of encoded files (default: ".<name>")
+    """
+    self.name = name
+    self.encode = encode
+    self.decode = decode
+    self.data_block_size = data_block_size
+    self.encoded_block_size = encoded_block_size
+    self.alphabet = alphabet
+    self.padding = padding
+    self.padding_positions = padding_positions
+    self.partial_group_sizes = partial_group_sizes
+    self.extension = extension if extension is not None else "." + name
+
+    accepted_characters = bytearray(alphabet + (padding or b""))
+    # Characters silently dropped in non strict mode (everything not in the alphabet)
+    self.ignored_characters = bytes(bytearray(c for c in range(256) if c not in accepted_characters))
+    # First character of a chunk needing a closer look in strict mode (padding or invalid character)
+    self.strict_special_character = re.compile(b"[^" + re.escape(alphabet + _WHITESPACES) + b"]")
+
+  def getEncodedSize(self, data_size):
+    """Get the size of data once encoded
+
+    Keyword arguments:
+      data_size -- (int) Size of the data to encode
+
+    return: (int) Size of the encoded data
+    """
+    full_blocks, last_block_size = divmod(data_size, self.data_block_size)
+    encoded_size = full_blocks * self.encoded_block_size
+    if last_block_size > 0:
+      if self.padding is not None:
+        encoded_size += self.encoded_block_size
+      else:
+        encoded_size += int(math.ceil(last_block_size * self.encoded_block_size / float(self.data_block_size)))
+    return encoded_size
+
+  def getDecodedSize(self, encoded_size, padding_size=0):
+    """Get the size of encoded data once decoded (data without white spaces)
+
+    Keyword arguments:
+      encoded_size -- (int) Number of encoded characters (padding included)
+      padding_size -- (int, optional) Number of padding characters at the end of the data
+
+    return: (int) Size of the decoded data
+    """
+    full_groups, last_group_size = divmod(encoded_size - padding_size, self.encoded_block_size)
+    decoded_size = full_groups * self.data_block_size
+    if last_group_size > 0:
+      decoded_size += last_group_size * self.data_block_size // self.encoded_block_size
+    return decoded_size
+
+_CODECS = {}
+
+def registerCodec(codec):
+  """Add a codec to the registry (replacing any codec with the same name)
+
+  Keyword arguments:
+    codec -- (Codec) Codec to register
+  """
+  _CODECS[codec.name] = codec
+
+def getCodec(codec=DEFAULT_CODEC):
+  """Get a codec from the registry
+
+  Keyword arguments:
+    codec -- (string or Codec, optional) Name of the codec (or codec itself)
+
+  return: (Codec) Codec
+  """
+  if isinstance(codec, Codec):
+    return codec
+  try:
+    return _CODECS[codec]
+  except KeyError:
+    raise ValueError("Unknown codec {} (available: {})".format(codec, ", ".join(getCodecNames())))
+
+def getCodecNames():
+  """Get the name of every registered codec
+
+  return: (list) Sorted codec names
+  """
+  return sorted(_CODECS)
+
+_BASE32_ALPHABET = b"ABCDEFGHIJKLMNOPQRSTUVWXYZ234567"
+_BASE64_ALPHABET = b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
+
+registerCodec(Codec("base16", base64.b16encode, lambda data: base64.b16decode(data, casefold=True),
+                    1, 2, b"0123456789ABCDEFabcdef", extension=".b16"))
+registerCodec(Codec("base32", base64.b32encode, lambda data: base64.b32decode(data, casefold=True),
+                    5, 8, _BASE32_ALPHABET + _BASE32_ALPHABET.lower(), padding=b"=",
+                    padding_positions=(2, 4, 5, 7), extension=".b32"))
+registerCodec(Codec("base64", base64.b64encode, binascii.a2b_base64,
+                    3, 4, _BASE64_ALPHABET + b"+/", padding=b"=",
+                    padding_positions=(2, 3), extension=".b64"))
+registerCodec(Codec("urlsafe_base64", base64.urlsafe_b64encode, base64.urlsafe_b64decode,
+                    3, 4, _BASE64_ALPHABET + b"-_", padding=b"=",
+                    padding_positions=(2, 3), extension=".b64u"))
+registerCodec(Codec("base85", base64.b85encode, base64.b85decode,
+                    4, 5, b"0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+                          b"abcdefghijklmnopqrstuvwxyz!#$%&()*+-;<=>?@^_`{|}~",
+                    partial_group_sizes=(2, 3, 4), extension=".b85"))
 
 def encodeDataToBase64(data):
   """Encore data to base 64 data
@@ -33,6 +195,563 @@ def decodeDataFromBase64(data):
   """
   return base64.b64decode(data)
 
+def encodeData(data, codec=DEFAULT_CODEC):
+  """Encode data with any registered codec
+
+  Keyword arguments:
+    data -- (bytes or buffer) Normal data
+    codec -- (string or Codec, optional) Codec to use
+
+  return: (bytes) Encoded data
+  """
+  return getCodec(codec).encode(data)
+
+def decodeData(data, codec=DEFAULT_CODEC):
+  """Decode data with any registered codec (white spaces and invalid characters are discarded)
+
+  Keyword arguments:
+    data -- (bytes or string) Encoded data
+    codec -- (string or Codec, optional) Codec to use
+
+  return: (bytes) Normal data
+  """
+  return b"".join(iterDecodeBase64([data], codec=codec))
+
+def _alignChunkSize(chunk_size, block_size):
+  """Round a chunk size down to a multiple of block_size (at least one block)"""
+  return max(block_size, chunk_size - (chunk_size % block_size))
+
+def _toBytes(data):
+  """Get bytes (or buffer) from base 64 data given as bytes, buffer or (ASCII) string"""
+  if isinstance(data, str) and not isinstance(data, bytes):
+    return data.encode("ascii")
+  return data
+
+class Base64Decoder(object):
+  """Decode base 64 (or any other codec) data received in chunks split anywhere (socket, email parts, ...)
+
+  Incomplete groups of characters are kept until the next chunk is received and
+  white spaces (new lines, ...) are skipped. In strict mode, any other character
+  which is not part of the codec alphabet, misplaced padding and data received
+  after padding raise a Base64DecodingError giving the offset of the bad character.
+  In non strict mode, the result is the same as base64.b64decode() wherever the
+  data is split: misplaced padding is discarded and decoding stops after the
+  first group completed by padding.
+
+  example:
+    '''
+    decoder = Base64Decoder(strict=True)
+    with open("file.bin", "wb") as _file:
+      for chunk in received_chunks:
+        _file.write(decoder.decode(chunk))
+      _file.write(decoder.finish())
+    '''
+  """
+
+  def __init__(self, strict=False, codec=DEFAULT_CODEC):
+    """Initialize the decoder
+
+    Keyword arguments:
+        strict -- (bool, optional) Validate the data (default: silently discard
+                                   invalid characters like decodeDataFromBase64())
+        codec -- (string or Codec, optional) Codec of the data
+    """
+    self.strict = strict
+    self.codec = getCodec(codec)
+    # Number of characters received
+    self.offset = 0
+    # Data not decoded yet because it is not a full group of characters
+    self._remaining_data = b""
+    # Number of alphabet and padding characters received (strict mode)
+    self._data_size = 0
+    self._padding_size = 0
+    # Padding characters at the end of the previous chunk and end of the data found (non strict mode)
+    self._pending_padding_size = 0
+    self._padding_done = False
+
+  def decode(self, chunk):
+    """Decode a new chunk of encoded data
+
+    Keyword arguments:
+        chunk -- (bytes or string) Encoded data following the previous chunk
+
+    return: (bytes) Decoded data (may be empty if the chunk is too small)
+    """
+    chunk = _toBytes(chunk)
+    chunk_offset = self.offset
+    self.offset += len(chunk)
+
+    if self.strict:
+      data = self._validate(chunk, chunk_offset)
+    elif self._padding_done:
+      return b""
+    else:
+      data = chunk.translate(None, self.codec.ignored_characters)
+      if self.codec.padding is not None:
+        if self.codec.padding in data:
+          data = self._removePadding(data)
+        elif data:
+          self._pending_padding_size = 0
+
+    data = self._remaining_data + data
+    aligned_size = len(data) - (len(data) % self.codec.encoded_block_size)
+    self._remaining_data = data[aligned_size:]
+    if aligned_size == 0:
+      return b""
+    try:
+      return self.codec.decode(data[:aligned_size])
+    except (TypeError, ValueError) as err:
+      raise Base64DecodingError(str(err), chunk_offset)
+
+  def finish(self):
+    """Notify the decoder that all the data has been received
+
+    return: (bytes) Last decoded data
+    """
+    remaining_data = self._remaining_data
+    self._remaining_data = b""
+    if not remaining_data:
+      return b""
+    if self.strict and len(remaining_data) not in self.codec.partial_group_sizes:
+      raise Base64DecodingError("Incomplete {} data".format(self.codec.name), self.offset)
+    try:
+      return self.codec.decode(remaining_data)
+    except (TypeError, ValueError) as err:
+      raise Base64DecodingError(str(err), self.offset)
+
+  def _removePadding(self, data):
+    """Remove padding characters of a chunk in non strict mode (like binascii.a2b_base64())
+
+    Padding is only kept when it completes a group, then the end of the data is discarded.
+
+    return: (bytes) Alphabet characters of the chunk (and final padding)
+    """
+    group_size = self.codec.encoded_block_size
+    group_position = len(self._remaining_data)
+    padding_size = self._pending_padding_size
+    pieces = []
+    start = 0
+    while True:
+      padding_offset = data.find(self.codec.padding, start)
+      piece = data[start:] if padding_offset < 0 else data[start:padding_offset]
+      if piece:
+        pieces.append(piece)
+        group_position = (group_position + len(piece)) % group_size
+        padding_size = 0
+      if padding_offset < 0:
+        break
+      if group_position in self.codec.padding_positions:
+        padding_size += 1
+        if group_position + padding_size >= group_size:
+          pieces.append(self.codec.padding * (group_size - group_position))
+          self._padding_done = True
+          break
+      start = padding_offset + 1
+    self._pending_padding_size = padding_size
+    return b"".join(pieces)
+
+  def _validate(self, chunk, chunk_offset):
+    """Check a chunk in strict mode
+
+    return: (bytes) Chunk without white spaces
+    """
+    match = self.codec.strict_special_character.search(chunk)
+    if match is None and self._padding_size == 0:
+      data = chunk.translate(None, _WHITESPACES)
+      self._data_size += len(data)
+      return data
+
+    # Only the end of the data (padding) or invalid data needs a character by character check
+    group_size = self.codec.encoded_block_size
+    start = match.start() if (match is not None and self._padding_size == 0) else 0
+    self._data_size += len(chunk[:start].translate(None, _WHITESPACES))
+    for index, character in enumerate(bytearray(chunk[start:]), start):
+      character = bytes(bytearray((character,)))
+      if character in _WHITESPACES:
+        continue
+      if character == self.codec.padding:
+        if (self._padding_size == 0 and (self._data_size % group_size) not in self.codec.padding_positions) or \
+           (self._padding_size > 0 and (self._data_size % group_size) == 0):
+          raise Base64DecodingError("Unexpected padding", chunk_offset + index)
+        self._padding_size += 1
+      elif character in self.codec.alphabet:
+        if self._padding_size > 0:
+          raise Base64DecodingError("Data after padding", chunk_offset + index)
+      else:
+        raise Base64DecodingError("Invalid character {!r}".format(character), chunk_offset + index)
+      self._data_size += 1
+
+    return chunk.translate(None, _WHITESPACES)
+
+def _toByteView(data):
+  """Get a memoryview of bytes from any buffer (bytes, bytearray, memoryview, mmap, array, ...)"""
+  view = memoryview(data)
+  if view.format != "B" or view.ndim != 1:
+    view = view.cast("B")
+  return view
+
+def getBase64EncodedSize(data_size, codec=DEFAULT_CODEC):
+  """Get the size of data once encoded in base 64
+
+  Keyword arguments:
+    data_size -- (int) Size of the data to encode
+    codec -- (string or Codec, optional) Codec to use
+
+  return: (int) Size of the base 64 encoded data
+  """
+  return getCodec(codec).getEncodedSize(data_size)
+
+def getBase64DecodedSize(base64_encoded_data, codec=DEFAULT_CODEC):
+  """Get the size of base 64 data once decoded (data must not contain white spaces)
+
+  Keyword arguments:
+    base64_encoded_data -- (buffer or string) Base 64 encoded data
+    codec -- (string or Codec, optional) Codec of the data
+
+  return: (int) Size of the decoded data
+  """
+  codec = getCodec(codec)
+  view = _toByteView(_toBytes(base64_encoded_data))
+  padding_size = 0
+  if codec.padding is not None:
+    last_group = bytes(view[-codec.encoded_block_size:])
+    padding_size = len(last_group) - len(last_group.rstrip(codec.padding))
+  return codec.getDecodedSize(len(view), padding_size)
+
+def encodeDataToBase64Into(data, output, output_offset=0, chunk_size=DEFAULT_ENCODE_CHUNK_SIZE,
+                           codec=DEFAULT_CODEC):
+  """Encode data to base 64 directly into a preallocated buffer
+
+  The input is read by slices of a memoryview (never copied as a whole) and the
+  output buffer can be reused between calls to avoid new allocations.
+
+  Keyword arguments:
+    data -- (buffer) Any object supporting the buffer protocol (bytes, bytearray, memoryview, mmap, ...)
+    output -- (bytearray or writable buffer) Buffer to write the base 64 data to
+    output_offset -- (int, optional) Position in the output buffer to write the data to
+    chunk_size -- (int, optional) Size of the slices encoded at once (rounded to a multiple of the codec block)
+    codec -- (string or Codec, optional) Codec to use
+
+  return: (int) Number of bytes written in the output buffer
+  """
+  codec = getCodec(codec)
+  data = _toByteView(data)
+  output_view = _toByteView(output)
+  encoded_size = codec.getEncodedSize(len(data))
+  if output_offset + encoded_size > len(output_view):
+    raise ValueError("Output buffer too small ({} bytes needed from offset {}, {} available)"
+                     .format(encoded_size, output_offset, len(output_view) - output_offset))
+
+  chunk_size = _alignChunkSize(chunk_size, codec.data_block_size)
+  position = output_offset
+  for offset in range(0, len(data), chunk_size):
+    encoded_chunk = codec.encode(data[offset:offset + chunk_size])
+    output_view[position:position + len(encoded_chunk)] = encoded_chunk
+    position += len(encoded_chunk)
+  return position - output_offset
+
+def decodeDataFromBase64Into(base64_encoded_data, output, output_offset=0,
+                             chunk_size=DEFAULT_DECODE_CHUNK_SIZE, codec=DEFAULT_CODEC):
+  """Decode base 64 data directly into a preallocated buffer
+
+  The data must not contain white spaces (use Base64Decoder for such data).
+
+  Keyword arguments:
+    base64_encoded_data -- (buffer or string) Base 64 encoded data
+    output -- (bytearray or writable buffer) Buffer to write the decoded data to
+    output_offset -- (int, optional) Position in the output buffer to write the data to
+    chunk_size -- (int, optional) Size of the slices decoded at once (rounded to a multiple of the codec group)
+    codec -- (string or Codec, optional) Codec of the data
+
+  return: (int) Number of bytes written in the output buffer
+  """
+  codec = getCodec(codec)
+  data = _toByteView(_toBytes(base64_encoded_data))
+  output_view = _toByteView(output)
+  last_group_size = len(data) % codec.encoded_block_size
+  if last_group_size != 0 and last_group_size not in codec.partial_group_sizes:
+    raise Base64DecodingError("Incomplete {} data".format(codec.name), len(data))
+  decoded_size = getBase64DecodedSize(data, codec)
+  if output_offset + decoded_size > len(output_view):
+    raise ValueError("Output buffer too small ({} bytes needed from offset {}, {} available)"
+                     .format(decoded_size, output_offset, len(output_view) - output_offset))
+
+  chunk_size = _alignChunkSize(chunk_size, codec.encoded_block_size)
+  position = output_offset
+  for offset in range(0, len(data), chunk_size):
+    try:
+      decoded_chunk = codec.decode(data[offset:offset + chunk_size])
+    except (TypeError, ValueError) as err:
+      raise Base64DecodingError(str(err), offset)
+    if position + len(decoded_chunk) > len(output_view):
+      raise ValueError("Output buffer too small (invalid {} data size)".format(codec.name))
+    output_view[position:position + len(decoded_chunk)] = decoded_chunk
+    position += len(decoded_chunk)
+  return position - output_offset
+
+def iterEncodeStreamToBase64(input_stream, chunk_size=DEFAULT_ENCODE_CHUNK_SIZE, codec=DEFAULT_CODEC):
+  """Encode a binary stream to base 64 chunk by chunk
+
+  Keyword arguments:
+    input_stream -- (file object) Stream opened in binary mode to encode
+    chunk_size -- (int, optional) Amount of data read at once (rounded to a multiple of the codec block)
+    codec -- (string or Codec, optional) Codec to use
+
+  return: (generator) Base 64 encoded chunks (their concatenation is the
+          same as the result of encodeDataToBase64() on the whole stream)
+  """
+  codec = getCodec(codec)
+  block_size = codec.data_block_size
+  chunk_size = _alignChunkSize(chunk_size, block_size)
+  while True:
+    chunk = input_stream.read(chunk_size)
+    if not chunk:
+      break
+    # Streams may return less than requested, keep chunks aligned on codec blocks
+    while len(chunk) % block_size != 0:
+      missing_data = input_stream.read(block_size - (len(chunk) % block_size))
+      if not missing_data:
+        break
+      chunk += missing_data
+    yield codec.encode(chunk)
+
+def iterDecodeBase64(base64_chunks, strict=False, codec=DEFAULT_CODEC):
+  """Decode base 64 chunks of any size
+
+  Characters which are not part of the base 64 alphabet (new lines, spaces, ...)
+  are discarded like in decodeDataFromBase64() (unless strict is True).
+
+  Keyword arguments:
+    base64_chunks -- (iterable) Base 64 encoded chunks (bytes or string)
+    strict -- (bool, optional) Raise Base64DecodingError on invalid characters or padding
+    codec -- (string or Codec, optional) Codec of the data
+
+  return: (generator) Decoded chunks
+  """
+  decoder = Base64Decoder(strict, codec)
+  for chunk in base64_chunks:
+    decoded_chunk = decoder.decode(chunk)
+    if decoded_chunk:
+      yield decoded_chunk
+  decoded_chunk = decoder.finish()
+  if decoded_chunk:
+    yield decoded_chunk
+
+def iterDecodeStreamFromBase64(input_stream, chunk_size=DEFAULT_DECODE_CHUNK_SIZE, codec=DEFAULT_CODEC,
+                               strict=False):
+  """Decode a base 64 stream chunk by chunk
+
+  Keyword arguments:
+    input_stream -- (file object) Stream containing base 64 encoded data
+    chunk_size -- (int, optional) Amount of data read at once
+    codec -- (string or Codec, optional) Codec of the data
+    strict -- (bool, optional) Raise Base64DecodingError on invalid characters or padding
+
+  return: (generator) Decoded chunks
+  """
+  return iterDecodeBase64(iter(lambda: input_stream.read(chunk_size), input_stream.read(0)), strict, codec)
+
+def iterEncodeFileToBase64(file_name, chunk_size=DEFAULT_ENCODE_CHUNK_SIZE, codec=DEFAULT_CODEC):
+  """Encode a file to base 64 chunk by chunk (memory usage does not depend on file size)
+
+  Keyword arguments:
+    file_name -- (string) Normal file name
+    chunk_size -- (int, optional) Amount of data read at once (rounded to a multiple of the codec block)
+    codec -- (string or Codec, optional) Codec to use
+
+  return: (generator) Base 64 encoded chunks of the file
+  """
+  with open(file_name, "rb") as _file:
+    for encoded_chunk in iterEncodeStreamToBase64(_file, chunk_size, codec):
+      yield encoded_chunk
+
+def encodeStreamToBase64(input_stream, output_stream, chunk_size=DEFAULT_ENCODE_CHUNK_SIZE,
+                         codec=DEFAULT_CODEC):
+  """Encode a binary stream to base 64 into another stream
+
+  Keyword arguments:
+    input_stream -- (file object) Stream opened in binary mode to encode
+    output_stream -- (file object) Stream opened in binary mode to write the base 64 data to
+    chunk_size -- (int, optional) Amount of data read at once (rounded to a multiple of the codec block)
+    codec -- (string or Codec, optional) Codec to use
+
+  return: (int) Number of base 64 bytes written
+  """
+  written_size = 0
+  for encoded_chunk in iterEncodeStreamToBase64(input_stream, chunk_size, codec):
+    output_stream.write(encoded_chunk)
+    written_size += len(encoded_chunk)
+  return written_size
+
+def decodeStreamFromBase64(input_stream, output_stream, chunk_size=DEFAULT_DECODE_CHUNK_SIZE,
+                           codec=DEFAULT_CODEC, strict=False):
+  """Decode a base 64 stream into another stream
+
+  Keyword arguments:
+    input_stream -- (file object) Stream containing base 64 encoded data
+    output_stream -- (file object) Stream opened in binary mode to write decoded data to
+    chunk_size -- (int, optional) Amount of data read at once
+    codec -- (string or Codec, optional) Codec of the data
+    strict -- (bool, optional) Raise Base64DecodingError on invalid characters or padding
+
+  return: (int) Number of decoded bytes written
+  """
+  written_size = 0
+  for decoded_chunk in iterDecodeStreamFromBase64(input_stream, chunk_size, codec, strict):
+    output_stream.write(decoded_chunk)
+    written_size += len(decoded_chunk)
+  return written_size
+
+def convertFileToBase64File(file_from, file_to, chunk_size=DEFAULT_ENCODE_CHUNK_SIZE, codec=DEFAULT_CODEC):
+  """Encode a file to a base 64 file without loading it in memory
+
+  Keyword arguments:
+    file_from -- (string) Normal file name
+    file_to -- (string) Base 64 encoded file name
+    codec -- (string or Codec, optional) Codec to use
+
+  return: (int) Number of base 64 bytes written
+  """
+  with open(file_from, "rb") as input_file:
+    with open(file_to, "wb") as output_file:
+      return encodeStreamToBase64(input_file, output_file, chunk_size, codec)
+
+def convertBase64FileToFile(file_from, file_to, chunk_size=DEFAULT_DECODE_CHUNK_SIZE, codec=DEFAULT_CODEC):
+  """Decode a base 64 file to a normal file without loading it in memory
+
+  Keyword arguments:
+    file_from -- (string) Base 64 encoded file name
+    file_to -- (string) Normal file name
+    codec -- (string or Codec, optional) Codec of the data
+
+  return: (int) Number of decoded bytes written
+  """
+  with open(file_from, "rb") as input_file:
+    with open(file_to, "wb") as output_file:
+      return decodeStreamFromBase64(input_file, output_file, chunk_size, codec)
+
+def _encodeMappedSlice(mapped_file, offset, length, codec):
+  """Encode a slice of a memory mapped file without copying it first"""
+  view = memoryview(mapped_file)
+  try:
+    return getCodec(codec).encode(view[offset:offset + length])
+  finally:
+    view.release()
+
+def _encodeFileSlice(file_slice):
+  """Encode a slice of a file (process pool worker)
+
+  Keyword arguments:
+    file_slice -- (tuple) File name, offset, length of the slice and codec name
+
+  return: (bytes) Encoded slice
+  """
+  file_name, offset, length, codec = file_slice
+  with open(file_name, "rb") as _file:
+    mapped_file = mmap.mmap(_file.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+      return _encodeMappedSlice(mapped_file, offset, length, codec)
+    finally:
+      mapped_file.close()
+
+def iterEncodeFileToBase64Parallel(file_name, workers=None, use_processes=True,
+                                   slice_size=DEFAULT_PARALLEL_SLICE_SIZE, codec=DEFAULT_CODEC):
+  """Encode a file to base 64 using several workers on a memory mapped file
+
+  The file is split into slices aligned on codec blocks encoded by a pool of workers,
+  encoded slices are returned in the file order. Only a few slices per worker
+  are in progress at the same time so memory usage stays bounded.
+
+  Keyword arguments:
+    file_name -- (string) Normal file name
+    workers -- (int, optional) Number of workers (default: number of CPU)
+    use_processes -- (bool, optional) Use processes (True) or threads (False)
+                                      Threads avoid copying the encoded slices between
+                                      processes but base 64 encoding does not release the GIL
+    slice_size -- (int, optional) Size of the slices (rounded to a multiple of the codec block)
+    codec -- (string, optional) Name of a registered codec (must be registered at import
+                                time to be available in worker processes)
+
+  return: (generator) Base 64 encoded chunks of the file
+  """
+  codec_name = getCodec(codec).name
+  if workers is None:
+    workers = multiprocessing.cpu_count()
+  slice_size = _alignChunkSize(slice_size, getCodec(codec).data_block_size)
+  file_size = os.path.getsize(file_name)
+
+  # Not worth starting workers for small files
+  if workers <= 1 or file_size <= slice_size:
+    for encoded_chunk in iterEncodeFileToBase64(file_name, codec=codec):
+      yield encoded_chunk
+    return
+
+  slices = [(offset, min(slice_size, file_size - offset)) for offset in range(0, file_size, slice_size)]
+  max_pending_slices = 2 * workers
+
+  with open(file_name, "rb") as _file:
+    mapped_file = None
+    if use_processes:
+      pool = multiprocessing.Pool(workers)
+      encode_slice = lambda offset, length: pool.apply_async(_encodeFileSlice,
+                                                             ((file_name, offset, length, codec_name),))
+    else:
+      mapped_file = mmap.mmap(_file.fileno(), 0, access=mmap.ACCESS_READ)
+      pool = multiprocessing.pool.ThreadPool(workers)
+      encode_slice = lambda offset, length: pool.apply_async(_encodeMappedSlice,
+                                                             (mapped_file, offset, length, codec))
+
+    try:
+      pending_slices = collections.deque()
+      for offset, length in slices:
+        pending_slices.append(encode_slice(offset, length))
+        if len(pending_slices) >= max_pending_slices:
+          yield pending_slices.popleft().get()
+      while pending_slices:
+        yield pending_slices.popleft().get()
+    finally:
+      pool.terminate()
+      pool.join()
+      if mapped_file is not None:
+        mapped_file.close()
+
+def encodeFileToBase64StreamParallel(file_name, output_stream, workers=None, use_processes=True,
+                                     slice_size=DEFAULT_PARALLEL_SLICE_SIZE, codec=DEFAULT_CODEC):
+  """Encode a file to base 64 into a stream using several workers
+
+  Keyword arguments:
+    file_name -- (string) Normal file name
+    output_stream -- (file object) Stream opened in binary mode to write the base 64 data to
+    workers -- (int, optional) Number of workers (default: number of CPU)
+    use_processes -- (bool, optional) Use processes (True) or threads (False)
+    slice_size -- (int, optional) Size of the slices (rounded to a multiple of the codec block)
+    codec -- (string, optional) Name of a registered codec
+
+  return: (int) Number of base 64 bytes written
+  """
+  written_size = 0
+  for encoded_chunk in iterEncodeFileToBase64Parallel(file_name, workers, use_processes, slice_size, codec):
+    output_stream.write(encoded_chunk)
+    written_size += len(encoded_chunk)
+  return written_size
+
+def convertFileToBase64FileParallel(file_from, file_to, workers=None, use_processes=True,
+                                    slice_size=DEFAULT_PARALLEL_SLICE_SIZE, codec=DEFAULT_CODEC):
+  """Encode a file to a base 64 file using several workers
+
+  Keyword arguments:
+    file_from -- (string) Normal file name
+    file_to -- (string) Base 64 encoded file name
+    workers -- (int, optional) Number of workers (default: number of CPU)
+    use_processes -- (bool, optional) Use processes (True) or threads (False)
+    slice_size -- (int, optional) Size of the slices (rounded to a multiple of the codec block)
+    codec -- (string, optional) Name of a registered codec
+
+  return: (int) Number of base 64 bytes written
+  """
+  with open(file_to, "wb") as output_file:
+    return encodeFileToBase64StreamParallel(file_from, output_file, workers, use_processes, slice_size, codec)
+
 def convertFileToBase64(file_name):
   """Encore file to base 64 data
 
@@ -41,9 +760,8 @@ def convertFileToBase64(file_name):
 
   return: (string) Base 64 encoded data from file
   """
-  with open(file_name, "rb") as _file:
-    file_data = _file.read()
-    return encodeDataToBase64(file_data)
+  # Encoding by chunks avoids keeping the whole file in memory next to its encoded version
+  return b"".join(iterEncodeFileToBase64(file_name))
 
 def convertBase64ToFile(base64_encoded_data, file_name):
   """Decode data from base 64 to file
@@ -51,11 +769,123 @@ def convertBase64ToFile(base64_encoded_data, file_name):
   Keyword arguments:
     data -- (string) Base 64 encoded data
   """
-  reconstructed_data = decodeDataFromBase64(base64_encoded_data)
+  chunks = (base64_encoded_data[i:i + DEFAULT_DECODE_CHUNK_SIZE]
+            for i in range(0, len(base64_encoded_data), DEFAULT_DECODE_CHUNK_SIZE))
   with open(file_name, "wb") as _file:
-    _file.write(reconstructed_data)
+    for decoded_chunk in iterDecodeBase64(chunks):
+      _file.write(decoded_chunk)
 
-def main():
+def checkBase64RoundTrip(original_file, encoded_file, codec=DEFAULT_CODEC):
+  """Check that an encoded file decodes to the original file (both files are streamed)
+
+  Keyword arguments:
+    original_file -- (string) Normal file name
+    encoded_file -- (string) Base 64 encoded file name
+    codec -- (string or Codec, optional) Codec of the encoded file
+
+  return: (bool) Encoded file matches the original file
+  """
+  with open(original_file, "rb") as original_stream:
+    with open(encoded_file, "rb") as encoded_stream:
+      try:
+        for decoded_chunk in iterDecodeStreamFromBase64(encoded_stream, codec=codec):
+          if original_stream.read(len(decoded_chunk)) != decoded_chunk:
+            return False
+      except Base64DecodingError as err:
+        logging.debug("Could not decode {}: {}".format(encoded_file, err))
+        return False
+      return original_stream.read(1) == b""
+
+def _getOutputFileName(input_file, output_folder, decode, codec):
+  """Get the name of the file written when converting input_file"""
+  codec = getCodec(codec)
+  output_file = os.path.basename(input_file)
+  if not decode:
+    output_file += codec.extension
+  elif output_file.endswith(codec.extension) and len(output_file) > len(codec.extension):
+    output_file = output_file[:-len(codec.extension)]
+  else:
+    output_file += ".decoded"
+  if output_folder is None:
+    output_folder = os.path.dirname(input_file)
+  return os.path.join(output_folder, output_file)
+
+def _convertFileJob(job):
+  """Encode or decode a file (batch mode worker)
+
+  Keyword arguments:
+    job -- (tuple) Input file, output file, decode (bool), codec name, strict (bool), check (bool)
+
+  return: (tuple) Input file, output file, error message (None if no error)
+  """
+  input_file, output_file, decode, codec, strict, check = job
+  try:
+    with open(input_file, "rb") as input_stream:
+      with open(output_file, "wb") as output_stream:
+        if decode:
+          decodeStreamFromBase64(input_stream, output_stream, codec=codec, strict=strict)
+        else:
+          encodeStreamToBase64(input_stream, output_stream, codec=codec)
+    if check:
+      original_file, encoded_file = (output_file, input_file) if decode else (input_file, output_file)
+      if not checkBase64RoundTrip(original_file, encoded_file, codec):
+        return (input_file, output_file, "Round trip check failed")
+  except (IOError, OSError, Base64DecodingError) as err:
+    return (input_file, output_file, str(err))
+  return (input_file, output_file, None)
+
+def convertFiles(input_files, output_folder=None, decode=False, codec=DEFAULT_CODEC,
+                 strict=False, check=False, jobs=None):
+  """Encode or decode several files concurrently (one worker process per CPU by default)
+
+  A file given several times (same path, glob overlapping a file name, link, ...)
+  is converted once. Nothing is converted (ValueError raised) if two files would
+  be converted to the same output file (same name in different folders with
+  output_folder) or if an output file is one of the input files.
+
+  Keyword arguments:
+    input_files -- (list) Files to convert
+    output_folder -- (string, optional) Folder of converted files (default: folder of each input file)
+    decode -- (bool, optional) Decode files (default: encode files)
+    codec -- (string, optional) Name of a registered codec
+    strict -- (bool, optional) Reject invalid characters when decoding
+    check -- (bool, optional) Check that each converted file round trips to its input file
+    jobs -- (int, optional) Number of worker processes (default: number of CPU)
+
+  return: (list) (input file, output file, error message or None) for each file
+  """
+  codec = getCodec(codec).name
+  # Two jobs must never write the same output file at the same time
+  input_files_by_path = collections.OrderedDict()
+  for input_file in input_files:
+    input_files_by_path.setdefault(os.path.normcase(os.path.realpath(input_file)), input_file)
+  file_jobs = [(input_file, _getOutputFileName(input_file, output_folder, decode, codec),
+                decode, codec, strict, check) for input_file in input_files_by_path.values()]
+
+  # Nothing is converted if a file would overwrite the output or the input of another one
+  output_files_by_path = {}
+  for input_file, output_file, _, _, _, _ in file_jobs:
+    output_path = os.path.normcase(os.path.realpath(output_file))
+    other_file = output_files_by_path.setdefault(output_path, input_file)
+    if other_file != input_file:
+      raise ValueError("{} and {} would both be converted to {}".format(other_file, input_file, output_file))
+    if output_path in input_files_by_path:
+      raise ValueError("{} would overwrite input file {}".format(input_file, input_files_by_path[output_path]))
+  if jobs is None:
+    jobs = multiprocessing.cpu_count()
+  jobs = min(jobs, len(file_jobs))
+
+  # Starting worker processes is only worth it when there are several files
+  if jobs <= 1:
+    return [_convertFileJob(job) for job in file_jobs]
+  pool = multiprocessing.Pool(jobs)
+  try:
+    return pool.map(_convertFileJob, file_jobs, chunksize=1)
+  finally:
+    pool.close()
+    pool.join()
+
+def demo():
   """Demo of the base 64 encoding utility functions"""
 
   print("\n----------------------------------------------------")
@@ -63,28 +893,100 @@ def main():
   print("----------------------------------------------------")
 
   print("\n------------Encode data to base 64------------------")
-  data = "Normal string"
+  data = b"Normal string"
   encoded_data = encodeDataToBase64(data)
-  print("Base 64 encoded string of \""+data+"\": \""+encoded_data+"\"")
+  print("Base 64 encoded string of \""+data.decode()+"\": \""+encoded_data.decode()+"\"")
 
   print("\n------------Decode data from base 64----------------")
   decoded_data = decodeDataFromBase64(encoded_data)
-  print("Base 64 decoded string of \""+encoded_data+"\": \""+decoded_data+"\"")
+  print("Base 64 decoded string of \""+encoded_data.decode()+"\": \""+decoded_data.decode()+"\"")
 
   print("\n-------Decode data from base 64 to file-------------")
   dummy_file = "dummy_file.txt"
-  print("Convert \""+encoded_data+"\" encoded string to file "+dummy_file)
+  print("Convert \""+encoded_data.decode()+"\" encoded string to file "+dummy_file)
   convertBase64ToFile(encoded_data, dummy_file)
   with open(dummy_file, "rb") as _file:
-    print("Data contained in file "+dummy_file+": \""+_file.read()+"\"")
+    print("Data contained in file "+dummy_file+": \""+_file.read().decode()+"\"")
 
   print("\n-------Encode data from file to base 64-------------")
   file_encoded_data = convertFileToBase64(dummy_file)
-  print("Encoded data from file "+dummy_file+": \""+file_encoded_data+"\"")
+  print("Encoded data from file "+dummy_file+": \""+file_encoded_data.decode()+"\"")
 
   print("\n----------------------------------------------------")
   print("-------------------End of demo----------------------")
   print("----------------------------------------------------\n")
 
+def main():
+  """Shell base 64 utility function (stdin to stdout or batch of files)"""
+
+  parser = argparse.ArgumentParser(description="Encode/decode data in base 64 (or other codecs). "
+                                               "Without input files, stdin is converted to stdout.")
+  parser.add_argument("inputs", nargs="*", help="Input files or glob patterns (\"-\" for stdin)")
+  parser.add_argument("-d", "--decode", action="store_true", help="Decode data (default: encode data)")
+  parser.add_argument("-c", "--codec", default=DEFAULT_CODEC, choices=getCodecNames(),
+                      help="Codec to use (default: {})".format(DEFAULT_CODEC))
+  parser.add_argument("-o", "--output-dir", help="Folder of converted files (default: folder of each input file)")
+  parser.add_argument("-j", "--jobs", type=int, help="Number of files converted concurrently (default: number of CPU)")
+  parser.add_argument("-s", "--strict", action="store_true", help="Reject invalid characters when decoding")
+  parser.add_argument("--check", action="store_true", help="Check that every converted file round trips to its input file")
+  parser.add_argument("--demo", action="store_true", help="Show a demo of the utility functions")
+  parser.add_argument("-v", "--verbose", action="store_true", help="Show debug information")
+  args = parser.parse_args()
+
+  if args.verbose:
+    logger = logging.getLogger()
+    logger.setLevel(logging.DEBUG)
+
+  if args.demo:
+    demo()
+    sys.exit(0)
+
+  # Stream stdin to stdout (for shell pipelines)
+  if args.inputs in ([], ["-"]):
+    if args.check:
+      logging.error("Round trip check needs input files.")
+      sys.exit(1)
+    try:
+      if args.decode:
+        decodeStreamFromBase64(sys.stdin.buffer, sys.stdout.buffer, codec=args.codec, strict=args.strict)
+      else:
+        encodeStreamToBase64(sys.stdin.buffer, sys.stdout.buffer, codec=args.codec)
+      sys.stdout.buffer.flush()
+    except Base64DecodingError as err:
+      logging.error("Could not decode data: {}".format(err))
+      sys.exit(1)
+    sys.exit(0)
+
+  input_files = []
+  for pattern in args.inputs:
+    matching_files = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+    if not matching_files:
+      logging.error("No file matching {}.".format(pattern))
+      sys.exit(1)
+    input_files += [input_file for input_file in matching_files if not os.path.isdir(input_file)]
+
+  if args.output_dir is not None and not os.path.isdir(args.output_dir):
+    logging.error("Output folder {} does not exist.".format(args.output_dir))
+    sys.exit(1)
+
+  try:
+    results = convertFiles(input_files, args.output_dir, args.decode, args.codec, args.strict, args.check, args.jobs)
+  except ValueError as err:
+    logging.error(str(err))
+    sys.exit(1)
+
+  return_value = True
+  for input_file, output_file, error in results:
+    if error is None:
+      logging.debug("{} converted to {}".format(input_file, output_file))
+    else:
+      logging.error("Could not convert {}: {}".format(input_file, error))
+      return_value = False
+
+  if return_value:
+    sys.exit(0)
+
+  sys.exit(1)
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,272 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+  Benchmark of the base 64 utility functions (throughput, peak memory and traced Python memory)
+"""
+__author__ = 'Quentin Comte-Gaz'
+__email__ = "quentin@comte-gaz.com"
+__license__ = "MIT License"
+__copyright__ = "Copyright Quentin Comte-Gaz (2026)"
+__python_version__ = "3.4+"
+__version__ = "1.0 (2026/10/18)"
+__status__ = "Usable for any project"
+
+import argparse # Manage program arguments
+import json # Machine readable results
+import logging
+import multiprocessing # Run every case in its own process to measure its peak memory
+import os
+import platform
+import queue # Timeout of the benchmark processes
+import resource # Peak memory of the process and of its workers (Unix only)
+import sys
+import tempfile
+import time
+import tracemalloc # Peak of the Python memory allocated by a call
+
+import base_64
+
+DEFAULT_SIZES = "1K,64K,1M,16M,256M"
+MODES = ["memory", "into", "file", "stream", "decode_stream", "parallel"]
+
+def parseSize(size):
+  """Convert a human readable size to bytes
+
+  Keyword arguments:
+    size -- (string) Size (for example "512", "64K", "16M" or "4G")
+
+  return: (int) Size in bytes
+  """
+  size = size.strip().upper().rstrip("B")
+  multipliers = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+  if size and size[-1] in multipliers:
+    return int(float(size[:-1]) * multipliers[size[-1]])
+  return int(size)
+
+def createInputFile(folder, size):
+  """Create a synthetic input file (repeated random block)
+
+  Keyword arguments:
+    folder -- (string) Folder of the file
+    size -- (int) Size of the file
+
+  return: (string) File name
+  """
+  file_name = os.path.join(folder, "input_{}.bin".format(size))
+  block = os.urandom(min(size, 1024 * 1024))
+  with open(file_name, "wb") as _file:
+    remaining_size = size
+    while remaining_size > 0:
+      _file.write(block[:remaining_size])
+      remaining_size -= len(block)
+  return file_name
+
+# Delay between two checks of a benchmark process (seconds)
+_PROCESS_POLL_DELAY = 1
+
+def _getPeakRss(who=resource.RUSAGE_SELF):
+  """Get the peak resident memory of the current process (bytes)
+
+  Keyword arguments:
+    who -- (int, optional) resource.RUSAGE_SELF or resource.RUSAGE_CHILDREN (largest terminated worker)
+  """
+  peak_rss = resource.getrusage(who).ru_maxrss
+  # Linux gives kilobytes, macOS gives bytes
+  return peak_rss if sys.platform == "darwin" else peak_rss * 1024
+
+def _prepareCase(mode, input_file, encoded_file, output_file, codec, workers):
+  """Get the function to benchmark for a mode (input data is loaded before measuring)"""
+  if mode == "memory":
+    with open(input_file, "rb") as _file:
+      data = _file.read()
+    return lambda: base_64.encodeData(data, codec)
+  if mode == "into":
+    with open(input_file, "rb") as _file:
+      data = _file.read()
+    output = bytearray(base_64.getBase64EncodedSize(len(data), codec))
+    return lambda: base_64.encodeDataToBase64Into(data, output, codec=codec)
+  if mode == "file":
+    return lambda: b"".join(base_64.iterEncodeFileToBase64(input_file, codec=codec))
+  if mode == "stream":
+    return lambda: base_64.convertFileToBase64File(input_file, output_file, codec=codec)
+  if mode == "decode_stream":
+    return lambda: base_64.convertBase64FileToFile(encoded_file, output_file, codec=codec)
+  if mode == "parallel":
+    return lambda: base_64.convertFileToBase64FileParallel(input_file, output_file, workers=workers, codec=codec)
+  raise ValueError("Unknown mode {}".format(mode))
+
+def _runCase(mode, size, input_file, encoded_file, output_file, codec, workers, repeat, results):
+  """Benchmark a mode (run in a dedicated process)"""
+  function = _prepareCase(mode, input_file, encoded_file, output_file, codec, workers)
+  rss_before = _getPeakRss()
+
+  timings = []
+  for _ in range(repeat):
+    start = time.perf_counter()
+    function()
+    timings.append(time.perf_counter() - start)
+  peak_rss = _getPeakRss()
+  # Workers of the parallel mode (joined at the end of each call)
+  workers_peak_rss = _getPeakRss(resource.RUSAGE_CHILDREN)
+
+  # Python memory is traced on a separate call since tracing slows down the code (memory
+  # of the worker processes and memory allocated outside of Python are not traced)
+  tracemalloc.start()
+  function()
+  _, traced_peak = tracemalloc.get_traced_memory()
+  tracemalloc.stop()
+
+  processed_size = os.path.getsize(encoded_file) if mode == "decode_stream" else size
+  best_time = min(timings)
+  results.put({
+    "mode": mode,
+    "codec": codec,
+    "size": size,
+    "repeat": repeat,
+    "best_time_sec": best_time,
+    "mean_time_sec": sum(timings) / len(timings),
+    "throughput_mb_per_sec": (processed_size / (1024.0 * 1024.0)) / best_time if best_time > 0 else None,
+    "peak_rss_bytes": peak_rss,
+    "peak_rss_increase_bytes": peak_rss - rss_before,
+    "workers_peak_rss_bytes": workers_peak_rss,
+    "traced_peak_bytes": traced_peak,
+  })
+
+def _waitCaseResult(process, case_results, timeout):
+  """Wait for the result of a benchmark process
+
+  return: (dict) Result, or None with the error if the process died or timed out
+  """
+  start = time.monotonic()
+  while True:
+    try:
+      return case_results.get(timeout=_PROCESS_POLL_DELAY), None
+    except queue.Empty:
+      pass
+    if process.exitcode is not None:
+      # Result may have been sent just before the end of the process
+      try:
+        return case_results.get(timeout=_PROCESS_POLL_DELAY), None
+      except queue.Empty:
+        return None, "process exited with code {}".format(process.exitcode)
+    if timeout is not None and time.monotonic() - start > timeout:
+      process.terminate()
+      return None, "timed out after {} seconds".format(timeout)
+
+def runBenchmark(sizes, modes=MODES, codec=base_64.DEFAULT_CODEC, workers=None, repeat=3, folder=None,
+                 timeout=None):
+  """Benchmark the base 64 utility functions
+
+  Every (size, mode) case runs in its own process so that peak memory values are not
+  affected by the previous cases. Peak RSS is the memory of this process, the peak RSS
+  of the largest worker of the parallel mode is given separately.
+  A case whose process dies or times out is reported with an "error" instead of its measures.
+
+  Keyword arguments:
+    sizes -- (list) Input sizes in bytes
+    modes -- (list, optional) Modes to benchmark (see MODES)
+    codec -- (string, optional) Codec to benchmark
+    workers -- (int, optional) Number of workers of the parallel mode (default: number of CPU)
+    repeat -- (int, optional) Number of timed calls per case (best time is kept)
+    folder -- (string, optional) Folder of the temporary files (default: system temporary folder)
+    timeout -- (float, optional) Maximum duration of a case in seconds (default: no limit)
+
+  return: (list) Result (dict) of each case
+  """
+  results = []
+  context = multiprocessing.get_context("fork") if hasattr(os, "fork") else multiprocessing.get_context()
+  with tempfile.TemporaryDirectory(dir=folder) as temporary_folder:
+    for size in sizes:
+      input_file = createInputFile(temporary_folder, size)
+      encoded_file = input_file + ".encoded"
+      output_file = input_file + ".output"
+      base_64.convertFileToBase64File(input_file, encoded_file, codec=codec)
+
+      for mode in modes:
+        logging.debug("Benchmark {} mode with {} bytes".format(mode, size))
+        case_results = context.Queue()
+        process = context.Process(target=_runCase, args=(mode, size, input_file, encoded_file, output_file,
+                                                         codec, workers, repeat, case_results))
+        process.start()
+        result, error = _waitCaseResult(process, case_results, timeout)
+        process.join()
+        if error is not None:
+          logging.error("Benchmark of {} mode with {} bytes failed: {}".format(mode, size, error))
+          result = {"mode": mode, "codec": codec, "size": size, "repeat": repeat, "error": error}
+        results.append(result)
+
+      for file_name in (input_file, encoded_file, output_file):
+        if os.path.exists(file_name):
+          os.remove(file_name)
+  return results
+
+def _formatSize(size):
+  """Get a human readable size"""
+  for unit in ("B", "KB", "MB", "GB"):
+    if abs(size) < 1024 or unit == "GB":
+      return "{:.0f}{}".format(size, unit) if unit == "B" else "{:.1f}{}".format(size, unit)
+    size /= 1024.0
+
+def main():
+  """Shell base 64 benchmark"""
+
+  parser = argparse.ArgumentParser(description="Benchmark base_64.py functions")
+  parser.add_argument("-s", "--sizes", default=DEFAULT_SIZES,
+                      help="Comma separated input sizes (default: {})".format(DEFAULT_SIZES))
+  parser.add_argument("-m", "--modes", default=",".join(MODES),
+                      help="Comma separated modes to benchmark (default: {})".format(",".join(MODES)))
+  parser.add_argument("-c", "--codec", default=base_64.DEFAULT_CODEC, choices=base_64.getCodecNames(),
+                      help="Codec to benchmark (default: {})".format(base_64.DEFAULT_CODEC))
+  parser.add_argument("-w", "--workers", type=int, help="Workers of the parallel mode (default: number of CPU)")
+  parser.add_argument("-r", "--repeat", type=int, default=3, help="Timed calls per case (default: 3)")
+  parser.add_argument("-t", "--temp-dir", help="Folder of the temporary input files")
+  parser.add_argument("-T", "--timeout", type=float, help="Maximum duration of a case in seconds (default: no limit)")
+  parser.add_argument("-j", "--json", help="Write results as JSON to this file (\"-\" for stdout)")
+  parser.add_argument("-v", "--verbose", action="store_true", help="Show debug information")
+  args = parser.parse_args()
+
+  if args.verbose:
+    logger = logging.getLogger()
+    logger.setLevel(logging.DEBUG)
+
+  sizes = [parseSize(size) for size in args.sizes.split(",")]
+  modes = [mode.strip() for mode in args.modes.split(",")]
+  for mode in modes:
+    if mode not in MODES:
+      logging.error("Unknown mode {} (available: {}).".format(mode, ", ".join(MODES)))
+      sys.exit(1)
+
+  results = runBenchmark(sizes, modes, args.codec, args.workers, args.repeat, args.temp_dir, args.timeout)
+
+  if args.json is not None:
+    report = {
+      "python_version": platform.python_version(),
+      "platform": platform.platform(),
+      "cpu_count": multiprocessing.cpu_count(),
+      "timestamp": time.time(),
+      "results": results,
+    }
+    if args.json == "-":
+      json.dump(report, sys.stdout, indent=2)
+      print("")
+      sys.exit(0)
+    with open(args.json, "w") as _file:
+      json.dump(report, _file, indent=2)
+
+  print("{:<14} {:>10} {:>12} {:>12} {:>12} {:>12} {:>12}".format("Mode", "Size", "MB/s", "Peak RSS",
+                                                                  "RSS increase", "Workers RSS", "Traced peak"))
+  for result in results:
+    if "error" in result:
+      print("{:<14} {:>10} failed: {}".format(result["mode"], _formatSize(result["size"]), result["error"]))
+      continue
+    throughput = result["throughput_mb_per_sec"]
+    print("{:<14} {:>10} {:>12} {:>12} {:>12} {:>12} {:>12}".format(
+      result["mode"], _formatSize(result["size"]),
+      "{:.1f}".format(throughput) if throughput is not None else "-",
+      _formatSize(result["peak_rss_bytes"]), _formatSize(result["peak_rss_increase_bytes"]),
+      _formatSize(result["workers_peak_rss_bytes"]) if result["workers_peak_rss_bytes"] else "-",
+      _formatSize(result["traced_peak_bytes"])))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+  Test the chunked base 64 decoding of base_64.py against the standard library
+  (python -m unittest base_64_test)
+"""
+__author__ = 'Quentin Comte-Gaz'
+__email__ = "quentin@comte-gaz.com"
+__license__ = "MIT License"
+__copyright__ = "Copyright Quentin Comte-Gaz (2026)"
+__python_version__ = "3.4+"
+__version__ = "1.0 (2026/10/18)"
+__status__ = "Usable for any project"
+
+import os
+import sys
+import base64
+import binascii
+import random
+import unittest
+
+# Modules of this folder (even when the tests are run from another folder)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import base_64
+
+# Data after padding, misplaced padding and invalid characters
+PADDING_CASES = [b"QQ==QUJD", b"QQ==QQ==", b"QQ=QQ==", b"Q=Q==", b"=QQ==", b"QUJD=QQ==", b"QU\nJD\nQQ==\nQUJD\n",
+                 b"QUJ=D", b"QUI=QUJD", b"QQ=!=", b"QUJDQUJD", b""]
+
+class TestBase64Decoder(unittest.TestCase):
+  def setUp(self):
+    self.random = random.Random(0)
+
+  def _decodeStandard(self, data):
+    """Decode with base64.b64decode() (None if the data is invalid)"""
+    try:
+      return base64.b64decode(data)
+    except binascii.Error:
+      return None
+
+  def _decodeChunks(self, data, split_count):
+    """Decode data split at random positions (None if the data is invalid)"""
+    splits = sorted(self.random.randint(0, len(data)) for _ in range(split_count))
+    chunks = [data[start:end] for start, end in zip([0] + splits, splits + [len(data)])]
+    try:
+      return b"".join(base_64.iterDecodeBase64(chunks))
+    except base_64.Base64DecodingError:
+      return None
+
+  def testPaddingCasesAtEverySplit(self):
+    for data in PADDING_CASES:
+      expected = self._decodeStandard(data)
+      for split in range(len(data) + 1):
+        chunks = [data[:split], data[split:]]
+        self.assertEqual(b"".join(base_64.iterDecodeBase64(chunks)), expected, (data, chunks))
+
+  def testRandomDataAtRandomSplits(self):
+    characters = b"QUJDab+/==\n!"
+    for _ in range(2000):
+      data = bytes(bytearray(self.random.choice(characters) for _ in range(self.random.randint(0, 32))))
+      expected = self._decodeStandard(data)
+      for split_count in (1, 2, 5):
+        self.assertEqual(self._decodeChunks(data, split_count), expected, data)
+
+  def testEncodedFileAtRandomSplits(self):
+    data = base64.encodebytes(os.urandom(10000) + b"end")
+    for split_count in (1, 10, 100):
+      self.assertEqual(self._decodeChunks(data, split_count), base64.b64decode(data))
+
+  def testStrictModeRejectsDataAfterPadding(self):
+    decoder = base_64.Base64Decoder(strict=True)
+    decoder.decode(b"QQ=")
+    with self.assertRaises(base_64.Base64DecodingError) as context:
+      decoder.decode(b"=QUJD")
+    self.assertEqual(context.exception.offset, 4)
+
+if __name__ == '__main__':
+  unittest.main()
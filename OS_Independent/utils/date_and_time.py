@@ -8,34 +8,324 @@ __author__ = 'Quentin Comte-Gaz'
 __email__ = "quentin@comte-gaz.com"
 __license__ = "MIT License"
 __copyright__ = "Copyright Quentin Comte-Gaz (2016)"
-__python_version__ = "2.7+ and 3.+"
-__version__ = "1.0 (2016/08/12)"
+__python_version__ = "3.5+"
+__version__ = "1.1 (2026/10/18)"
 __status__ = "Usable for any project"
 
+import asyncio # Periodic tasks without threads
+import calendar # UTC timestamps and month lengths of the bulk parser
 import time
-import datetime
+import heapq # Timer queue of the periodic scheduler
+import math
 import logging
 import threading
-import thread
 from threading import Thread
 
+class CachedClock(object):
+  """Current date and time strings formatted at most once per second (thread safe)
+
+  The date string is only formatted when the day changes and the time string when
+  the second changes, other calls only read the clock and return cached strings.
+
+  example:
+    '''
+    clock = CachedClock()
+    for line in lines:
+      log_file.write(clock.getIsoDateTime()+" "+line)
+    '''
+  """
+
+  def __init__(self, time_function=time.time):
+    """Initialize the clock
+
+    Keyword arguments:
+        time_function -- (function, optional) Function giving the current time (seconds since epoch)
+    """
+    self._time_function = time_function
+    self._lock = threading.Lock()
+    # (second, date, time, UTC offset) replaced at once so readers never need the lock
+    self._cache = (None, "", "", "")
+    self._day = None
+    self._date = ""
+
+  def _refresh(self, second):
+    """Format the strings of a new second"""
+    with self._lock:
+      cache = self._cache
+      if cache[0] == second:
+        return cache
+      local_time = time.localtime(second)
+      if local_time[:3] != self._day:
+        self._day = local_time[:3]
+        self._date = time.strftime('%Y-%m-%d', local_time)
+      utc_offset = time.strftime('%z', local_time)
+      cache = (second, self._date, time.strftime('%H:%M:%S', local_time), utc_offset[:3]+":"+utc_offset[3:])
+      self._cache = cache
+      return cache
+
+  def _getCache(self):
+    """Get the current time and the strings of the current second"""
+    now = self._time_function()
+    cache = self._cache
+    if cache[0] != int(now):
+      cache = self._refresh(int(now))
+    return now, cache
+
+  def getDate(self):
+    """Get current date (%Y-%m-%d format)
+
+    return: (str) Current date
+    """
+    return self._getCache()[1][1]
+
+  def getTime(self):
+    """Get current time (%H:%M:%S format)
+
+    return: (str) Current time
+    """
+    return self._getCache()[1][2]
+
+  def getTimeMs(self):
+    """Get current time with milliseconds (%H:%M:%S.mmm format)
+
+    return: (str) Current time
+    """
+    now, cache = self._getCache()
+    return "{}.{:03d}".format(cache[2], int((now - cache[0]) * 1000))
+
+  def getIsoDateTime(self, milliseconds=True):
+    """Get current date and time in ISO 8601 format (%Y-%m-%dT%H:%M:%S.mmm+HH:MM)
+
+    Keyword arguments:
+        milliseconds -- (bool, optional) Add milliseconds
+
+    return: (str) Current date and time
+    """
+    now, cache = self._getCache()
+    if milliseconds:
+      return "{}T{}.{:03d}{}".format(cache[1], cache[2], int((now - cache[0]) * 1000), cache[3])
+    return cache[1]+"T"+cache[2]+cache[3]
+
+# Clock shared by the date and time functions
+_clock = CachedClock()
+
 def getDate():
   """Get current date (%Y-%m-%d format)
 
   return: (str) Current date
   """
-  return str(datetime.datetime.strftime(datetime.datetime.now(), '%Y-%m-%d'))
+  return _clock.getDate()
 
 def getTime():
   """Get current time (%H:%M:%S format)
 
   return: (str) Current time
   """
-  return str(datetime.datetime.strftime(datetime.datetime.now(), '%H:%M:%S'))
+  return _clock.getTime()
+
+def getTimeMs():
+  """Get current time with milliseconds (%H:%M:%S.mmm format)
+
+  return: (str) Current time
+  """
+  return _clock.getTimeMs()
+
+def getIsoDateTime(milliseconds=True):
+  """Get current date and time in ISO 8601 format (%Y-%m-%dT%H:%M:%S.mmm+HH:MM)
+
+  Keyword arguments:
+      milliseconds -- (bool, optional) Add milliseconds
+
+  return: (str) Current date and time
+  """
+  return _clock.getIsoDateTime(milliseconds)
+
+# Tables of the bulk timestamp functions ("00" to "99", "000" to "999" and their values)
+_TWO_DIGITS = ["{:02d}".format(value) for value in range(100)]
+_THREE_DIGITS = ["{:03d}".format(value) for value in range(1000)]
+_MINUTE_VALUES = dict((_TWO_DIGITS[value], value * 60) for value in range(60))
+_SECOND_VALUES = dict((_TWO_DIGITS[value], value) for value in range(61)) # 60: leap second
+_ASCII_DIGITS = frozenset("0123456789")
+# Maximum number of cached minute prefixes (about 45 days)
+_MAX_PREFIX_CACHE_SIZE = 65536
+
+def formatTimestamps(timestamps, show_date = True, show_time = True, milliseconds = False, utc = False,
+                     separator = " "):
+  """Format many timestamps at once (%Y-%m-%d<separator>%H:%M:%S[.mmm] format)
+
+  Much faster than calling time.strftime() for each timestamp: the date and
+  "%H:%M:" part is formatted once per minute and the seconds and milliseconds
+  come from precomputed tables (UTC offsets of the local time zone are expected
+  to be whole minutes).
+
+  Keyword arguments:
+      timestamps -- (iterable) Seconds since epoch (list, array, generator, ...)
+      show_date -- (bool, optional) Add the date
+      show_time -- (bool, optional) Add the time
+      milliseconds -- (bool, optional) Add milliseconds to the time (same value as datetime)
+      utc -- (bool, optional) Format UTC time instead of local time
+      separator -- (str, optional) Separator between date and time
+
+  return: (list) Formatted timestamps (str)
+  """
+  convert = time.gmtime if utc else time.localtime
+  date_separator = separator if show_date and show_time else ""
+  day_cache = {}
+  prefix_cache = {}
+  two_digits = _TWO_DIGITS
+  three_digits = _THREE_DIGITS
+  results = []
+  append = results.append
+  # Minute of the previous timestamp (log timestamps are mostly sorted)
+  minute_start = minute_end = 0
+  prefix = ""
+
+  for timestamp in timestamps:
+    second = int(timestamp)
+    if milliseconds:
+      # Fraction rounded to the microsecond like datetime (1.123 is stored as 1.12299999...)
+      microsecond = round((timestamp - second) * 1000000)
+      if microsecond >= 1000000:
+        second += 1
+        microsecond -= 1000000
+      elif microsecond < 0:
+        second -= 1 # Negative timestamps
+        microsecond += 1000000
+    elif second > timestamp:
+      second -= 1 # Round negative timestamps down
+    if not minute_start <= second < minute_end:
+      minute = second // 60
+      minute_start = minute * 60
+      minute_end = minute_start + 60
+      prefix = prefix_cache.get(minute)
+      if prefix is None:
+        if len(prefix_cache) >= _MAX_PREFIX_CACHE_SIZE:
+          prefix_cache.clear()
+        date_time = convert(minute_start)
+        prefix = ""
+        if show_date:
+          day = date_time[:3]
+          prefix = day_cache.get(day)
+          if prefix is None:
+            prefix = day_cache[day] = "{:04d}-{}-{}".format(day[0], two_digits[day[1]], two_digits[day[2]])
+        if show_time:
+          prefix += date_separator+two_digits[date_time[3]]+":"+two_digits[date_time[4]]+":"
+        prefix_cache[minute] = prefix
+    if not show_time:
+      append(prefix)
+    elif milliseconds:
+      append(prefix+two_digits[second - minute_start]+"."+three_digits[microsecond // 1000])
+    else:
+      append(prefix+two_digits[second - minute_start])
+  return results
+
+def _getHourTimestamp(text, utc):
+  """Get the timestamp of the "%Y-%m-%d?%H" start of a timestamp string (None if invalid)"""
+  if len(text) != 13 or text[4] != "-" or text[7] != "-":
+    return None
+  # ASCII digits only: int() would also accept signs, spaces, underscores and other digits ("-001", " 1", "1_0", ...)
+  fields = (text[0:4], text[5:7], text[8:10], text[11:13])
+  if not all(character in _ASCII_DIGITS for field in fields for character in field):
+    return None
+  year, month, day, hour = [int(field) for field in fields]
+  # Checked here since mktime() would silently normalize an invalid date (February 31 to March 2 or 3)
+  if not (1 <= year and 1 <= month <= 12 and 0 <= hour <= 23 and 1 <= day <= calendar.monthrange(year, month)[1]):
+    return None
+  if utc:
+    return calendar.timegm((year, month, day, hour, 0, 0, 0, 0, 0))
+  return int(time.mktime((year, month, day, hour, 0, 0, 0, 0, -1)))
+
+def parseTimestamps(texts, utc = False):
+  """Parse many timestamps at once (%Y-%m-%d?%H:%M:%S[.fff] format, as given by formatTimestamps())
+
+  Much faster than calling time.strptime() for each string: the date and hour
+  are converted once per hour and the minutes and seconds come from precomputed tables.
+  Any character can separate the date and the time ("T", " ", ...).
+  Invalid strings (including dates like February 31) raise ValueError like time.strptime().
+
+  Keyword arguments:
+      texts -- (iterable) Timestamp strings (list, generator, file lines, ...)
+      utc -- (bool, optional) Strings are UTC time instead of local time
+
+  return: (list) Seconds since epoch (int, or float for strings with a fractional part)
+  """
+  hour_cache = {}
+  minute_values = _MINUTE_VALUES
+  second_values = _SECOND_VALUES
+  results = []
+  append = results.append
+
+  for text in texts:
+    hour_timestamp = hour_cache.get(text[:13])
+    if hour_timestamp is None:
+      hour_timestamp = _getHourTimestamp(text[:13], utc)
+      if hour_timestamp is None:
+        raise ValueError("Invalid timestamp {!r}".format(text))
+      hour_cache[text[:13]] = hour_timestamp
+    try:
+      if text[13] != ":" or text[16] != ":":
+        raise ValueError("Invalid timestamp {!r}".format(text))
+      timestamp = hour_timestamp + minute_values[text[14:16]] + second_values[text[17:19]]
+      if len(text) > 19:
+        fraction = text[19:].rstrip()
+        if fraction:
+          if fraction[0] != "." or not fraction[1:].isdigit():
+            raise ValueError("Invalid timestamp {!r}".format(text))
+          timestamp += float(fraction)
+    except (IndexError, KeyError):
+      raise ValueError("Invalid timestamp {!r}".format(text))
+    append(timestamp)
+  return results
+
+def getCurrentTimeToShow(show_date = True, show_time = True):
+  """Get the current date and/or time as shown by the periodic display
+
+  Keyword arguments:
+      show_date -- (bool, optional) Show date
+      show_time -- (bool, optional) Show time
+
+  return: (str) "------ <date> <time> ------"
+  """
+  date_to_show = ""
+  if (show_date):
+    date_to_show += getDate()
+  if (show_time):
+    if date_to_show != "":
+      date_to_show += " "
+    date_to_show += getTime()
+  return "------ "+str(date_to_show)+" ------"
+
+def printCurrentTime(show_date = True, show_time = True):
+  """Print the current date and/or time (periodic job, see PeriodicScheduler)
+
+  Keyword arguments:
+      show_date -- (bool, optional) Show date
+      show_time -- (bool, optional) Show time
+  """
+  print(getCurrentTimeToShow(show_date, show_time))
+
+def _getNextDeadline(deadline, period_sec, now):
+  """Get the next deadline of a periodic task (missed periods are skipped, no drift)
+
+  Keyword arguments:
+      deadline -- (float) Deadline of the last run (monotonic clock)
+      period_sec -- (float) Period of the task
+      now -- (float) Current monotonic time
+
+  return: (float) Next deadline (always a multiple of the period after the first deadline)
+  """
+  deadline += period_sec
+  if deadline <= now:
+    deadline += period_sec * (int((now - deadline) // period_sec) + 1)
+  return deadline
 
 class printCurrentTimePeriodicallyThread(threading.Thread):
   """Show date and/or time periodically asynchronously from the rest of the app
 
+  Every display happens at an absolute deadline (no drift due to the display time)
+  and stop() is immediately effective.
+  Note: PeriodicScheduler runs many periodic tasks (printCurrentTime included) from one thread.
+
   example:
     '''
     time_thread = printCurrentTimePeriodicallyThread(time_sec=1, show_date = True, show_time = True)
@@ -61,6 +351,7 @@ class printCurrentTimePeriodicallyThread(threading.Thread):
 
     self.show_date = show_date
     self.show_time = show_time
+    self._stop_event = threading.Event()
 
     if (time_sec >= 1 and (show_date or show_time)):
       self.time_sec = time_sec
@@ -71,21 +362,456 @@ class printCurrentTimePeriodicallyThread(threading.Thread):
       self.is_running = False
 
   def run(self):
+    deadline = time.monotonic()
     while self.is_running:
-      date_to_show = ""
-      if (self.show_date):
-        date_to_show += getDate()
-      if (self.show_time):
-        if date_to_show != "":
-          date_to_show += " "
-        date_to_show += getTime()
-
-      print("------ "+str(date_to_show)+" ------")
-      time.sleep(self.time_sec)
+      printCurrentTime(self.show_date, self.show_time)
+      now = time.monotonic()
+      deadline = _getNextDeadline(deadline, self.time_sec, now)
+      if self._stop_event.wait(deadline - now):
+        break
 
   def stop(self):
-    """Stop the thread (it may take up to time_sec seconds to be effective)"""
+    """Stop the thread (immediately effective)"""
     self.is_running = False
+    self._stop_event.set()
+
+class PeriodicScheduler(threading.Thread):
+  """Run many periodic jobs from a single thread
+
+  Jobs are kept in a heap ordered by their next deadline (monotonic clock, absolute
+  deadlines so periods do not drift with the jobs duration). The thread sleeps
+  until the next deadline, adding/removing a job or stopping wakes it up immediately.
+  Jobs run one after the other so they should be short.
+
+  example:
+    '''
+    scheduler = PeriodicScheduler()
+    scheduler.start()
+    time_job = scheduler.addJob(1, printCurrentTime, args=(True, True))
+    flush_job = scheduler.addJob(0.5, log_file.flush)
+    time.sleep(10)
+    scheduler.removeJob(flush_job)
+    scheduler.stop()
+    '''
+  """
+
+  def __init__(self):
+    """Initialize the scheduler thread"""
+    threading.Thread.__init__(self)
+    self.daemon = True
+
+    self._condition = threading.Condition()
+    self._is_running = True
+    # Heap of [deadline, job id, job] (job is None once removed)
+    self._deadlines = []
+    self._jobs = {}
+    self._next_job_id = 0
+
+  def addJob(self, period_sec, function, args=(), kwargs=None, first_delay_sec=None):
+    """Add a periodic job
+
+    Keyword arguments:
+        period_sec -- (float) Delay between two runs of the job (must be > 0)
+        function -- (function) Function to call
+        args -- (tuple, optional) Arguments of the function
+        kwargs -- (dict, optional) Keyword arguments of the function
+        first_delay_sec -- (float, optional) Delay before the first run (default: period_sec)
+
+    return: (int) Job identifier (see removeJob())
+    """
+    if period_sec <= 0:
+      raise ValueError("Period must be > 0 (got {})".format(period_sec))
+    if first_delay_sec is None:
+      first_delay_sec = period_sec
+
+    with self._condition:
+      job_id = self._next_job_id
+      self._next_job_id += 1
+      entry = [time.monotonic() + first_delay_sec, job_id, (period_sec, function, args, kwargs or {})]
+      self._jobs[job_id] = entry
+      heapq.heappush(self._deadlines, entry)
+      self._condition.notify()
+    return job_id
+
+  def removeJob(self, job_id):
+    """Remove a periodic job
+
+    Keyword arguments:
+        job_id -- (int) Job identifier given by addJob()
+
+    return: (bool) Job found and removed
+    """
+    with self._condition:
+      entry = self._jobs.pop(job_id, None)
+      if entry is None:
+        return False
+      # Removed from the heap when reaching the top
+      entry[2] = None
+      self._condition.notify()
+    return True
+
+  def getJobCount(self):
+    """Get the number of periodic jobs
+
+    return: (int) Number of jobs
+    """
+    with self._condition:
+      return len(self._jobs)
+
+  def stop(self):
+    """Stop the thread (immediately effective, a job being run is not interrupted)"""
+    with self._condition:
+      self._is_running = False
+      self._condition.notify()
+
+  def run(self):
+    with self._condition:
+      while self._is_running:
+        if not self._deadlines:
+          self._condition.wait()
+          continue
+        entry = self._deadlines[0]
+        if entry[2] is None:
+          heapq.heappop(self._deadlines)
+          continue
+        now = time.monotonic()
+        if entry[0] > now:
+          self._condition.wait(entry[0] - now)
+          continue
+
+        period_sec, function, args, kwargs = entry[2]
+        entry[0] = _getNextDeadline(entry[0], period_sec, now)
+        heapq.heapreplace(self._deadlines, entry)
+
+        # Jobs can add/remove jobs while running
+        self._condition.release()
+        try:
+          function(*args, **kwargs)
+        except Exception:
+          logging.exception("Periodic job {} failed".format(entry[1]))
+        finally:
+          self._condition.acquire()
+
+class AsyncPeriodicTicker(object):
+  """Asynchronous iterator giving a tick periodically (asyncio equivalent of a periodic thread)
+
+  Ticks happen at absolute deadlines of the event loop monotonic clock so the
+  period does not drift with the work done between two ticks (missed ticks are
+  skipped). Stop it with stop(), by leaving the loop or by cancelling the task.
+
+  example:
+    '''
+    async def flushPeriodically(log_file):
+      async for _ in AsyncPeriodicTicker(period_sec=0.5):
+        log_file.flush()
+
+    flush_task = asyncio.ensure_future(flushPeriodically(log_file))
+    ...
+    flush_task.cancel()
+    '''
+  """
+
+  def __init__(self, period_sec, first_delay_sec=0):
+    """Initialize the ticker
+
+    Keyword arguments:
+        period_sec -- (float) Delay between two ticks (must be > 0)
+        first_delay_sec -- (float, optional) Delay before the first tick
+    """
+    if period_sec <= 0:
+      raise ValueError("Period must be > 0 (got {})".format(period_sec))
+    self.period_sec = period_sec
+    self.first_delay_sec = first_delay_sec
+    self._deadline = None
+    self._is_running = True
+
+  def stop(self):
+    """Stop the ticker (the iteration ends at the next tick)"""
+    self._is_running = False
+
+  def __aiter__(self):
+    return self
+
+  async def __anext__(self):
+    """Wait for the next tick
+
+    return: (float) Deadline of the tick (event loop time)
+    """
+    loop = asyncio.get_event_loop()
+    if self._deadline is None:
+      self._deadline = loop.time() + self.first_delay_sec
+    else:
+      self._deadline = _getNextDeadline(self._deadline, self.period_sec, loop.time())
+    delay = self._deadline - loop.time()
+    if delay > 0 and self._is_running:
+      await asyncio.sleep(delay)
+    if not self._is_running:
+      raise StopAsyncIteration
+    return self._deadline
+
+async def runPeriodicallyAsync(period_sec, function, *args, **kwargs):
+  """Call a function (or coroutine function) periodically until the task is cancelled
+
+  Keyword arguments:
+      period_sec -- (float) Delay between two calls
+      function -- (function or coroutine function) Function to call
+      args, kwargs -- Arguments of the function
+  """
+  async for _ in AsyncPeriodicTicker(period_sec):
+    try:
+      result = function(*args, **kwargs)
+      if asyncio.iscoroutine(result):
+        await result
+    except asyncio.CancelledError:
+      raise
+    except Exception:
+      logging.exception("Periodic task {} failed".format(function))
+
+async def printCurrentTimePeriodicallyAsync(time_sec, show_date = True, show_time = True):
+  """Show date and/or time periodically (asyncio equivalent of printCurrentTimePeriodicallyThread)
+
+  example:
+    '''
+    time_task = asyncio.ensure_future(printCurrentTimePeriodicallyAsync(time_sec=1))
+    await asyncio.sleep(10)
+    time_task.cancel()
+    '''
+
+  Keyword arguments:
+      time_sec -- (int) Delay beween every display of the time or/and date
+      show_date -- (bool, optional) Show date
+      show_time -- (bool, optional) Show time
+
+  Note: At least one of show_date and show_time must be True and time_sec must be >= 1
+  """
+  if not (time_sec >= 1 and (show_date or show_time)):
+    logging.error("Wrong parameters")
+    return
+  await runPeriodicallyAsync(time_sec, printCurrentTime, show_date, show_time)
+
+async def _demoAsync():
+  """Show time every sec for 3sec from an asyncio task"""
+  time_task = asyncio.ensure_future(printCurrentTimePeriodicallyAsync(time_sec=1, show_date = True,
+                                                                      show_time = True))
+  await asyncio.sleep(3.5)
+  print("Cancelling time task from _demoAsync() coroutine")
+  time_task.cancel()
+  try:
+    await time_task
+  except asyncio.CancelledError:
+    pass
+
+class TimingWheelTimer(object):
+  """Timer of a TimingWheel (see TimingWheel.schedule())"""
+  __slots__ = ("expiration_tick", "callback", "args", "slot", "cancelled")
+
+  def __init__(self, expiration_tick, callback, args):
+    self.expiration_tick = expiration_tick
+    self.callback = callback
+    self.args = args
+    # Set containing the timer in the wheel (None once expired or cancelled)
+    self.slot = None
+    self.cancelled = False
+
+class TimingWheel(object):
+  """Hierarchical timing wheel handling a very large number of timers (timeouts, deadlines, ...)
+
+  Time is split in ticks of tick_sec seconds. The first wheel has a slot per tick,
+  each slot of the next wheels covers a whole turn of the previous wheel and its
+  timers are moved to the previous wheel when their turn comes (cascading).
+  Scheduling and cancelling a timer are O(1), expired timers cost O(1) each.
+  Timers expire within one tick after their deadline (timers further than the last
+  wheel are parked in it and placed again with their remaining delay).
+
+  Trade-off against a heapq of timers (date_and_time_benchmark.py, 100k to 1M timers):
+  schedule is about 2x slower (~2-3us vs ~1-1.5us) and cancel about 6x slower (~0.6us
+  vs ~0.1us, the heap only flags the timer and keeps it in memory until it expires),
+  but expiring all the timers is 4x to 8x faster (~0.8s vs ~6s for 1M timers).
+  Use it when most timers expire or when cancelled timers must be freed right away.
+
+  The wheel has no thread: call advance() regularly (every tick) or use a TimingWheelThread.
+
+  example:
+    '''
+    wheel = TimingWheel(tick_sec=0.01)
+    timer = wheel.schedule(30, closeConnection, connection)
+    ...
+    wheel.cancel(timer) # Connection activity, cancel the timeout
+    ...
+    wheel.advance() # In the main loop
+    '''
+  """
+
+  def __init__(self, tick_sec=0.01, wheel_sizes=(256, 64, 64, 64), time_function=time.monotonic):
+    """Initialize the wheels
+
+    Keyword arguments:
+        tick_sec -- (float, optional) Resolution of the timers in seconds
+        wheel_sizes -- (tuple, optional) Number of slots of each wheel (default covers
+                                         2^32 ticks, longer timers are cascaded several times)
+        time_function -- (function, optional) Monotonic clock in seconds
+    """
+    if tick_sec <= 0:
+      raise ValueError("Tick must be > 0 (got {})".format(tick_sec))
+    self.tick_sec = tick_sec
+    self._ticks_per_sec = 1.0 / tick_sec
+    self.wheel_sizes = tuple(wheel_sizes)
+    self._time_function = time_function
+    self._start_time = time_function()
+    self._current_tick = 0
+    self._timer_count = 0
+    self._lock = threading.Lock()
+    self._wheels = [[set() for _ in range(size)] for size in self.wheel_sizes]
+    # Number of ticks covered by a slot of each wheel and by each whole wheel
+    self._slot_ticks = []
+    self._wheel_ticks = []
+    ticks = 1
+    for size in self.wheel_sizes:
+      self._slot_ticks.append(ticks)
+      ticks *= size
+      self._wheel_ticks.append(ticks)
+    # (slots, ticks of the wheel, ticks of a slot) of each wheel, read for each scheduled timer
+    self._levels = list(zip(self._wheels, self._wheel_ticks, self._slot_ticks))
+
+  def __len__(self):
+    return self._timer_count
+
+  def _place(self, timer):
+    """Put a timer in the slot matching its expiration tick"""
+    expiration_tick = timer.expiration_tick
+    remaining_ticks = expiration_tick - self._current_tick
+    for slots, wheel_ticks, slot_ticks in self._levels:
+      if remaining_ticks < wheel_ticks:
+        break
+    else:
+      # Too far away: park it in the farthest slot of the last wheel, it is placed again
+      # (with its remaining delay) when this slot comes up
+      expiration_tick = self._current_tick + wheel_ticks - slot_ticks
+    slot = slots[(expiration_tick // slot_ticks) % len(slots)]
+    slot.add(timer)
+    timer.slot = slot
+
+  def schedule(self, delay_sec, callback, *args):
+    """Call a function after a delay
+
+    Keyword arguments:
+        delay_sec -- (float) Delay before calling the function (rounded up to a tick)
+        callback -- (function) Function to call (from the thread calling advance())
+        args -- Arguments of the function
+
+    return: (TimingWheelTimer) Timer (see cancel())
+    """
+    with self._lock:
+      expiration_tick = math.ceil((self._time_function() - self._start_time + delay_sec) * self._ticks_per_sec)
+      if expiration_tick <= self._current_tick:
+        expiration_tick = self._current_tick + 1
+      timer = TimingWheelTimer(expiration_tick, callback, args)
+      self._place(timer)
+      self._timer_count += 1
+    return timer
+
+  def cancel(self, timer):
+    """Cancel a timer
+
+    Keyword arguments:
+        timer -- (TimingWheelTimer) Timer given by schedule()
+
+    return: (bool) Timer cancelled (False if already expired or cancelled)
+    """
+    with self._lock:
+      slot = timer.slot
+      if slot is None:
+        return False
+      slot.discard(timer)
+      timer.slot = None
+      timer.cancelled = True
+      self._timer_count -= 1
+    return True
+
+  def advance(self, now=None):
+    """Expire the timers whose deadline is reached
+
+    Keyword arguments:
+        now -- (float, optional) Current time (default: time_function())
+
+    return: (int) Number of timers expired
+    """
+    if now is None:
+      now = self._time_function()
+    target_tick = int((now - self._start_time) / self.tick_sec)
+    expired_count = 0
+
+    while True:
+      with self._lock:
+        if self._current_tick >= target_tick:
+          break
+        self._current_tick += 1
+        tick = self._current_tick
+        for level in range(1, len(self.wheel_sizes)):
+          if tick % self._slot_ticks[level] != 0:
+            break
+          slot_index = (tick // self._slot_ticks[level]) % self.wheel_sizes[level]
+          cascaded_timers = self._wheels[level][slot_index]
+          self._wheels[level][slot_index] = set()
+          for timer in cascaded_timers:
+            self._place(timer)
+
+        slot_index = tick % self.wheel_sizes[0]
+        slot = self._wheels[0][slot_index]
+        expired_timers = []
+        if slot:
+          self._wheels[0][slot_index] = set()
+          for timer in slot:
+            if timer.expiration_tick <= tick:
+              expired_timers.append(timer)
+              timer.slot = None
+            else:
+              # Parked timer of a single wheel (further than the wheel range)
+              self._place(timer)
+          self._timer_count -= len(expired_timers)
+
+      # Callbacks are called without the lock so they can schedule/cancel timers
+      for timer in expired_timers:
+        try:
+          timer.callback(*timer.args)
+        except Exception:
+          logging.exception("Timer callback {} failed".format(timer.callback))
+      expired_count += len(expired_timers)
+
+    return expired_count
+
+class TimingWheelThread(threading.Thread):
+  """Thread advancing a TimingWheel every tick (timer callbacks are called from this thread)
+
+  example:
+    '''
+    wheel_thread = TimingWheelThread(tick_sec=0.01)
+    wheel_thread.start()
+    timer = wheel_thread.wheel.schedule(30, closeConnection, connection)
+    ...
+    wheel_thread.stop()
+    '''
+  """
+
+  def __init__(self, tick_sec=0.01, wheel_sizes=(256, 64, 64, 64)):
+    """Initialize the thread and its timing wheel (see TimingWheel)"""
+    threading.Thread.__init__(self)
+    self.daemon = True
+    self.wheel = TimingWheel(tick_sec, wheel_sizes)
+    self._stop_event = threading.Event()
+
+  def run(self):
+    deadline = time.monotonic()
+    while True:
+      self.wheel.advance()
+      now = time.monotonic()
+      deadline = _getNextDeadline(deadline, self.wheel.tick_sec, now)
+      if self._stop_event.wait(deadline - now):
+        break
+
+  def stop(self):
+    """Stop the thread (immediately effective)"""
+    self._stop_event.set()
 
 def main():
   """Demo of the date and time utility functions"""
@@ -102,6 +828,14 @@ def main():
 
   print("\n---------------Get current time---------------------")
   print("Time: "+getTime())
+  print("Time with milliseconds: "+getTimeMs())
+  print("ISO 8601 date and time: "+getIsoDateTime())
+
+  print("\n-------Format and parse timestamps in bulk----------")
+  timestamps = [time.time() + hour * 3600.5 for hour in range(3)]
+  texts = formatTimestamps(timestamps, milliseconds = True)
+  print("Formatted: "+str(texts))
+  print("Parsed: "+str(parseTimestamps(texts)))
 
   print("\n---Show time every sec for 10sec (asynchronously)---")
   time_thread = printCurrentTimePeriodicallyThread(time_sec=1, show_date = True,
@@ -113,6 +847,30 @@ def main():
   print("Stopping time thread from main() function")
   time_thread.stop()
 
+  print("\n--Show date every 2sec and time every sec for 5sec--")
+  scheduler = PeriodicScheduler()
+  scheduler.start()
+  scheduler.addJob(2, printCurrentTime, kwargs={"show_date": True, "show_time": False})
+  scheduler.addJob(1, printCurrentTime, kwargs={"show_date": False, "show_time": True})
+  time.sleep(5)
+  print("Stopping scheduler from main() function")
+  scheduler.stop()
+
+  print("\n----Show time after 1sec and 2sec (timing wheel)----")
+  wheel_thread = TimingWheelThread(tick_sec=0.01)
+  wheel_thread.start()
+  wheel_thread.wheel.schedule(1, printCurrentTime, False, True)
+  wheel_thread.wheel.schedule(2, printCurrentTime, False, True)
+  cancelled_timer = wheel_thread.wheel.schedule(1.5, printCurrentTime, True, True)
+  wheel_thread.wheel.cancel(cancelled_timer)
+  time.sleep(2.5)
+  wheel_thread.stop()
+
+  print("\n--Show time every sec for 3sec (asyncio, no thread)--")
+  loop = asyncio.new_event_loop()
+  loop.run_until_complete(_demoAsync())
+  loop.close()
+
   print("\n----------------------------------------------------")
   print("-------------------End of demo----------------------")
   print("----------------------------------------------------\n")
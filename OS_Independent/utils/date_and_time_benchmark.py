@@ -0,0 +1,317 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+  Benchmark of the date and time utility functions (timers and bulk timestamp formatting/parsing)
+"""
+__author__ = 'Quentin Comte-Gaz'
+__email__ = "quentin@comte-gaz.com"
+__license__ = "MIT License"
+__copyright__ = "Copyright Quentin Comte-Gaz (2026)"
+__python_version__ = "3.5+"
+__version__ = "1.0 (2026/10/18)"
+__status__ = "Usable for any project"
+
+import argparse # Manage program arguments
+import calendar
+import datetime # Reference millisecond formatting
+import heapq
+import json # Machine readable results
+import logging
+import platform
+import random
+import sys
+import threading
+import time
+
+import date_and_time
+
+DEFAULT_TIMER_COUNTS = "1000,10000,100000,1000000"
+# Threads are expensive: the thread per timer implementation is only run up to this number of timers
+DEFAULT_MAX_THREAD_TIMERS = 1000
+TIMER_IMPLEMENTATIONS = ["wheel", "heap", "thread"]
+DEFAULT_FORMAT_COUNT = 1000000
+
+class _HeapTimers(object):
+  """Reference implementation: binary heap with lazy cancellation (as PeriodicScheduler)"""
+
+  def __init__(self, time_function):
+    self._time_function = time_function
+    self._heap = []
+    self._counter = 0
+
+  def schedule(self, delay_sec, callback, *args):
+    self._counter += 1
+    entry = [self._time_function() + delay_sec, self._counter, callback, args]
+    heapq.heappush(self._heap, entry)
+    return entry
+
+  def cancel(self, entry):
+    entry[2] = None
+    return True
+
+  def advance(self):
+    now = self._time_function()
+    expired_count = 0
+    while self._heap and self._heap[0][0] <= now:
+      _, _, callback, args = heapq.heappop(self._heap)
+      if callback is not None:
+        callback(*args)
+        expired_count += 1
+    return expired_count
+
+class _ThreadTimers(object):
+  """Reference implementation: a threading.Timer per timer"""
+
+  def __init__(self, time_function):
+    pass
+
+  def schedule(self, delay_sec, callback, *args):
+    timer = threading.Timer(delay_sec, callback, args)
+    timer.daemon = True
+    timer.start()
+    return timer
+
+  def cancel(self, timer):
+    timer.cancel()
+    return True
+
+  def advance(self):
+    return 0
+
+def _createTimers(implementation, time_function, tick_sec):
+  """Create the timers of an implementation"""
+  if implementation == "wheel":
+    return date_and_time.TimingWheel(tick_sec=tick_sec, time_function=time_function)
+  if implementation == "heap":
+    return _HeapTimers(time_function)
+  if implementation == "thread":
+    return _ThreadTimers(time_function)
+  raise ValueError("Unknown timer implementation {}".format(implementation))
+
+def benchmarkTimers(implementation, timer_count, max_delay_sec=60.0, cancel_ratio=0.5, tick_sec=0.01):
+  """Benchmark scheduling, cancelling and expiring timers
+
+  Timers get random delays up to max_delay_sec, part of them are cancelled (timeout pattern:
+  most timeouts never expire) and the other ones are expired. Wheel and heap use a simulated
+  clock so that expiration is measured without waiting, threads use real time (their delays
+  are divided by 100 and start after 1 second so that none expires before being cancelled).
+
+  Keyword arguments:
+    implementation -- (string) Implementation to benchmark (see TIMER_IMPLEMENTATIONS)
+    timer_count -- (int) Number of timers
+    max_delay_sec -- (float, optional) Maximum delay of the timers
+    cancel_ratio -- (float, optional) Part of the timers cancelled before expiring
+    tick_sec -- (float, optional) Resolution of the timing wheel
+
+  return: (dict) Result (microseconds per operation)
+  """
+  now = [0.0]
+  timers = _createTimers(implementation, lambda: now[0], tick_sec)
+  random_generator = random.Random(timer_count)
+  delays = [random_generator.uniform(0, max_delay_sec) for _ in range(timer_count)]
+  if implementation == "thread":
+    delays = [1.0 + delay / 100.0 for delay in delays]
+  cancel_count = int(timer_count * cancel_ratio)
+  expired = [0]
+  expired_event = threading.Event()
+  expected_expired_count = timer_count - cancel_count
+
+  def callback():
+    expired[0] += 1
+    if expired[0] == expected_expired_count:
+      expired_event.set()
+
+  start = time.perf_counter()
+  handles = [timers.schedule(delay, callback) for delay in delays]
+  schedule_time = time.perf_counter() - start
+
+  start = time.perf_counter()
+  for handle in handles[:cancel_count]:
+    timers.cancel(handle)
+  cancel_time = time.perf_counter() - start
+
+  start = time.perf_counter()
+  if implementation == "thread":
+    expired_event.wait(max(delays) + 10)
+  else:
+    # Advance the simulated clock tick after tick (as a TimingWheelThread does)
+    step_count = int(max_delay_sec / tick_sec) + 2
+    for step in range(step_count):
+      now[0] = (step + 1) * tick_sec
+      timers.advance()
+  expire_time = time.perf_counter() - start
+
+  if expired[0] != expected_expired_count:
+    logging.warning("{}: {} timers expired instead of {}".format(implementation, expired[0],
+                                                                 expected_expired_count))
+
+  return {
+    "implementation": implementation,
+    "timer_count": timer_count,
+    "schedule_us": schedule_time / timer_count * 1e6,
+    "cancel_us": cancel_time / max(cancel_count, 1) * 1e6,
+    "expire_total_sec": expire_time,
+    "expired_count": expired[0],
+  }
+
+def runBenchmark(timer_counts, implementations=TIMER_IMPLEMENTATIONS, max_thread_timers=DEFAULT_MAX_THREAD_TIMERS,
+                 max_delay_sec=60.0, cancel_ratio=0.5, tick_sec=0.01):
+  """Benchmark the timer implementations
+
+  Keyword arguments:
+    timer_counts -- (list) Numbers of timers
+    implementations -- (list, optional) Implementations to benchmark (see TIMER_IMPLEMENTATIONS)
+    max_thread_timers -- (int, optional) Maximum number of timers of the thread implementation
+    max_delay_sec -- (float, optional) Maximum delay of the timers
+    cancel_ratio -- (float, optional) Part of the timers cancelled before expiring
+    tick_sec -- (float, optional) Resolution of the timing wheel
+
+  return: (list) Result (dict) of each case
+  """
+  results = []
+  for timer_count in timer_counts:
+    for implementation in implementations:
+      if implementation == "thread" and timer_count > max_thread_timers:
+        logging.debug("Skip thread implementation with {} timers".format(timer_count))
+        continue
+      logging.debug("Benchmark {} implementation with {} timers".format(implementation, timer_count))
+      results.append(benchmarkTimers(implementation, timer_count, max_delay_sec, cancel_ratio, tick_sec))
+  return results
+
+def _measure(function, *args):
+  """Get the duration of a call (seconds) and its result"""
+  start = time.perf_counter()
+  result = function(*args)
+  return time.perf_counter() - start, result
+
+def benchmarkFormatting(count, utc=False, span_sec=7 * 24 * 3600, milliseconds=True):
+  """Benchmark bulk timestamp formatting/parsing against datetime/time.strftime() and time.strptime()
+
+  Timestamps are sorted and spread over span_sec seconds (as the lines of a log file).
+
+  Keyword arguments:
+    count -- (int) Number of timestamps
+    utc -- (bool, optional) Use UTC time instead of local time
+    span_sec -- (float, optional) Time covered by the timestamps
+    milliseconds -- (bool, optional) Format timestamps with milliseconds
+
+  return: (dict) Result (microseconds per timestamp)
+  """
+  random_generator = random.Random(count)
+  start_timestamp = time.time() - span_sec
+  timestamps = sorted(start_timestamp + random_generator.uniform(0, span_sec) for _ in range(count))
+  convert = time.gmtime if utc else time.localtime
+
+  def formatWithStrftime(timestamps):
+    if milliseconds:
+      time_zone = datetime.timezone.utc if utc else None
+      return [datetime.datetime.fromtimestamp(timestamp, time_zone).strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+              for timestamp in timestamps]
+    return [time.strftime("%Y-%m-%d %H:%M:%S", convert(timestamp)) for timestamp in timestamps]
+
+  def parseWithStrptime(texts):
+    to_timestamp = calendar.timegm if utc else time.mktime
+    results = []
+    for text in texts:
+      timestamp = to_timestamp(time.strptime(text[:19], "%Y-%m-%d %H:%M:%S"))
+      if len(text) > 19:
+        timestamp += float(text[19:])
+      results.append(timestamp)
+    return results
+
+  strftime_time, expected_texts = _measure(formatWithStrftime, timestamps)
+  bulk_format_time, texts = _measure(date_and_time.formatTimestamps, timestamps, True, True, milliseconds, utc)
+  if texts != expected_texts:
+    logging.warning("Bulk formatting differs from datetime/time.strftime()")
+  strptime_time, expected_timestamps = _measure(parseWithStrptime, texts)
+  bulk_parse_time, parsed_timestamps = _measure(date_and_time.parseTimestamps, texts, utc)
+  if parsed_timestamps != expected_timestamps:
+    logging.warning("Bulk parsing differs from time.strptime()")
+
+  return {
+    "count": count,
+    "utc": utc,
+    "format_strftime_us": strftime_time / count * 1e6,
+    "format_bulk_us": bulk_format_time / count * 1e6,
+    "format_speedup": strftime_time / bulk_format_time if bulk_format_time > 0 else None,
+    "parse_strptime_us": strptime_time / count * 1e6,
+    "parse_bulk_us": bulk_parse_time / count * 1e6,
+    "parse_speedup": strptime_time / bulk_parse_time if bulk_parse_time > 0 else None,
+  }
+
+def main():
+  """Shell date and time benchmark"""
+
+  parser = argparse.ArgumentParser(description="Benchmark date_and_time.py timers")
+  parser.add_argument("-n", "--timer-counts", default=DEFAULT_TIMER_COUNTS,
+                      help="Comma separated numbers of timers (default: {})".format(DEFAULT_TIMER_COUNTS))
+  parser.add_argument("-i", "--implementations", default=",".join(TIMER_IMPLEMENTATIONS),
+                      help="Comma separated implementations (default: {})".format(",".join(TIMER_IMPLEMENTATIONS)))
+  parser.add_argument("--max-thread-timers", type=int, default=DEFAULT_MAX_THREAD_TIMERS,
+                      help="Maximum number of timers of the thread implementation (default: {})".format(
+                        DEFAULT_MAX_THREAD_TIMERS))
+  parser.add_argument("-d", "--max-delay", type=float, default=60.0, help="Maximum timer delay in seconds (default: 60)")
+  parser.add_argument("-c", "--cancel-ratio", type=float, default=0.5,
+                      help="Part of the timers cancelled before expiring (default: 0.5)")
+  parser.add_argument("-t", "--tick", type=float, default=0.01, help="Timing wheel resolution in seconds (default: 0.01)")
+  parser.add_argument("-f", "--format-count", type=int, default=DEFAULT_FORMAT_COUNT,
+                      help="Timestamps of the formatting/parsing benchmark, 0 to skip it (default: {})".format(
+                        DEFAULT_FORMAT_COUNT))
+  parser.add_argument("-u", "--utc", action="store_true", help="Format/parse UTC time instead of local time")
+  parser.add_argument("-j", "--json", help="Write results as JSON to this file (\"-\" for stdout)")
+  parser.add_argument("-v", "--verbose", action="store_true", help="Show debug information")
+  args = parser.parse_args()
+
+  if args.verbose:
+    logger = logging.getLogger()
+    logger.setLevel(logging.DEBUG)
+
+  timer_counts = [int(timer_count) for timer_count in args.timer_counts.split(",")]
+  implementations = [implementation.strip() for implementation in args.implementations.split(",")]
+  for implementation in implementations:
+    if implementation not in TIMER_IMPLEMENTATIONS:
+      logging.error("Unknown implementation {} (available: {}).".format(implementation,
+                                                                      ", ".join(TIMER_IMPLEMENTATIONS)))
+      sys.exit(1)
+
+  results = runBenchmark(timer_counts, implementations, args.max_thread_timers, args.max_delay,
+                         args.cancel_ratio, args.tick)
+  formatting_results = []
+  if args.format_count > 0:
+    logging.debug("Benchmark formatting/parsing with {} timestamps".format(args.format_count))
+    formatting_results.append(benchmarkFormatting(args.format_count, args.utc))
+
+  if args.json is not None:
+    report = {
+      "python_version": platform.python_version(),
+      "platform": platform.platform(),
+      "timestamp": time.time(),
+      "results": results,
+      "formatting_results": formatting_results,
+    }
+    if args.json == "-":
+      json.dump(report, sys.stdout, indent=2)
+      print("")
+      sys.exit(0)
+    with open(args.json, "w") as _file:
+      json.dump(report, _file, indent=2)
+
+  print("{:<10} {:>10} {:>14} {:>12} {:>14}".format("Timers", "Count", "Schedule (us)", "Cancel (us)",
+                                                    "Expire all (s)"))
+  for result in results:
+    print("{:<10} {:>10} {:>14.2f} {:>12.2f} {:>14.3f}".format(
+      result["implementation"], result["timer_count"], result["schedule_us"], result["cancel_us"],
+      result["expire_total_sec"]))
+
+  if formatting_results:
+    print("")
+    print("{:<10} {:>10} {:>14} {:>14} {:>10}".format("Timestamps", "Count", "Standard (us)", "Bulk (us)", "Speedup"))
+  for result in formatting_results:
+    for operation, standard in (("format", "strftime"), ("parse", "strptime")):
+      print("{:<10} {:>10} {:>14.2f} {:>14.2f} {:>9.1f}x".format(
+        operation, result["count"], result["{}_{}_us".format(operation, standard)],
+        result["{}_bulk_us".format(operation)], result["{}_speedup".format(operation)]))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+  Test the bulk timestamp parser of date_and_time.py against time.strptime()
+  (python -m unittest date_and_time_test)
+"""
+__author__ = 'Quentin Comte-Gaz'
+__email__ = "quentin@comte-gaz.com"
+__license__ = "MIT License"
+__copyright__ = "Copyright Quentin Comte-Gaz (2026)"
+__python_version__ = "3.5+"
+__version__ = "1.0 (2026/10/18)"
+__status__ = "Usable for any project"
+
+import os
+import sys
+import calendar
+import time
+import unittest
+
+# Modules of this folder (even when the tests are run from another folder)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import date_and_time
+
+# Date or hour fields that int() accepts (signs, spaces, underscores, non ASCII digits)
+MALFORMED_TIMESTAMPS = ["+201-01-01 00:00:00", "-201-01-01 00:00:00", " 201-01-01 00:00:00", "201 -01-01 00:00:00",
+                        "2_16-01-01 00:00:00", "2016-+1-01 00:00:00", "2016- 1-01 00:00:00", "2016-01-1 T00:00:00",
+                        "2016-01-01 +1:00:00", "2016-01-01 1 :00:00", "\uff12\uff10\uff11\uff16-01-01 00:00:00",
+                        "2016-01-01 \u0660\u0661:00:00"]
+
+class TestParseTimestamps(unittest.TestCase):
+  def testValidTimestamps(self):
+    texts = ["1970-01-01 00:00:00", "2016-02-29T23:59:59", "2016-12-31 12:30:00.25"]
+    expected = [calendar.timegm(time.strptime(text[:10]+" "+text[11:19], "%Y-%m-%d %H:%M:%S")) for text in texts]
+    expected[2] += 0.25
+    self.assertEqual(date_and_time.parseTimestamps(texts, utc=True), expected)
+
+  def testMalformedFieldsAreRejected(self):
+    for text in MALFORMED_TIMESTAMPS:
+      with self.assertRaises(ValueError, msg=text):
+        date_and_time.parseTimestamps([text], utc=True)
+
+  def testInvalidDatesAreRejected(self):
+    for text in ["2015-02-29 00:00:00", "2016-04-31 00:00:00", "2016-13-01 00:00:00", "2016-01-01 24:00:00",
+                 "0000-01-01 00:00:00"]:
+      with self.assertRaises(ValueError, msg=text):
+        date_and_time.parseTimestamps([text], utc=True)
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,311 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+  Benchmark of the Dropbox transfers of dropbox_handler.py against a local fake
+  Dropbox server (throughput, latency, connections and allocations)
+"""
+__author__ = 'Quentin Comte-Gaz'
+__email__ = "quentin@comte-gaz.com"
+__license__ = "MIT License"
+__copyright__ = "Copyright Quentin Comte-Gaz (2026)"
+__python_version__ = "3.4 to 3.6 (Dropbox API v1 SDK can't be imported with 3.7+)"
+__version__ = "1.0 (2026/10/18)"
+__status__ = "Usable for any project"
+__dependency__ = "Dropbox API v1 SDK (use 'pip install \"dropbox<=3.42\" \"urllib3<2\"' to install package)"
+
+import argparse # Manage program arguments
+import json # Machine readable results
+import logging
+import multiprocessing # Run the fake server in its own process (not measured)
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc # Allocations done by a transfer
+import warnings
+
+import dropbox_handler
+from dropbox_fake_server import FakeDropboxServer
+
+MODES = ["single", "single_no_pool", "put", "chunked", "streamed", "concurrent_upload", "concurrent_download"]
+
+def parseSize(size):
+  """Convert a human readable size to bytes
+
+  Keyword arguments:
+    size -- (string) Size (for example "512", "64K", "16M" or "4G")
+
+  return: (int) Size in bytes
+  """
+  size = size.strip().upper().rstrip("B")
+  multipliers = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+  if size and size[-1] in multipliers:
+    return int(float(size[:-1]) * multipliers[size[-1]])
+  return int(size)
+
+def _createFile(file_name, size):
+  """Create a file of random data"""
+  with open(file_name, "wb") as f:
+    remaining_size = size
+    while remaining_size > 0:
+      f.write(os.urandom(min(remaining_size, 1024 * 1024)))
+      remaining_size -= 1024 * 1024
+
+def _serveFakeDropbox(latency, bandwidth, pipe):
+  """Run a fake Dropbox server until asked to stop (run in a dedicated process)
+
+  Commands received on the pipe: "stats" (send the server statistics), "reset" (reset them, then
+  send True) and "stop".
+  """
+  with FakeDropboxServer(latency=latency, bandwidth=bandwidth) as server:
+    pipe.send((server.address, server.oauth2_token))
+    while True:
+      command = pipe.recv()
+      if command == "stats":
+        pipe.send(server.getStats())
+      elif command == "reset":
+        server.resetStats()
+        pipe.send(True)
+      elif command == "stop":
+        break
+
+class _FakeDropboxProcess(object):
+  """Fake Dropbox server running in its own process, so that its memory and CPU are not measured"""
+
+  def __init__(self, latency, bandwidth):
+    context = multiprocessing.get_context("fork") if hasattr(os, "fork") else multiprocessing.get_context()
+    self._pipe, child_pipe = context.Pipe()
+    self._process = context.Process(target=_serveFakeDropbox, args=(latency, bandwidth, child_pipe))
+    self._process.daemon = True
+    self._process.start()
+    self.address, self.oauth2_token = self._pipe.recv()
+
+  def getConnection(self, max_connections=dropbox_handler.DEFAULT_MAX_CONNECTIONS):
+    return dropbox_handler.DropboxConnection(self.oauth2_token, max_connections, api_host=self.address,
+                                             api_content_host=self.address, use_https=False)
+
+  def getStats(self):
+    self._pipe.send("stats")
+    return self._pipe.recv()
+
+  def resetStats(self):
+    self._pipe.send("reset")
+    self._pipe.recv()
+
+  def stop(self):
+    self._pipe.send("stop")
+    self._process.join()
+
+def _getPercentile(values, percentile):
+  """Get a percentile of a list of values (nearest rank)"""
+  if not values:
+    return None
+  values = sorted(values)
+  return values[min(len(values) - 1, int(round(percentile / 100.0 * (len(values) - 1))))]
+
+def _runTransfers(mode, server, connection, folder, small_files, large_file, workers):
+  """Run the transfers of a mode
+
+  return: (tuple) (number of bytes transferred, latency of each transfer in seconds)
+  """
+  latencies = []
+  transferred_bytes = 0
+
+  if mode in ("single", "single_no_pool"):
+    for index, file_name in enumerate(small_files):
+      start = time.perf_counter()
+      if mode == "single":
+        metadata = connection.uploadFile(file_name, "/single/{}".format(index), overwrite=True)
+      else:
+        # One client (and one new connection) per file
+        single_connection = server.getConnection()
+        metadata = single_connection.uploadFile(file_name, "/single/{}".format(index), overwrite=True)
+        single_connection.close()
+      latencies.append(time.perf_counter() - start)
+      transferred_bytes += metadata["bytes"]
+  elif mode in ("put", "chunked"):
+    start = time.perf_counter()
+    threshold = os.path.getsize(large_file) if mode == "put" else 0
+    metadata = connection.uploadFile(large_file, "/large.bin", chunked_upload_threshold=threshold, overwrite=True)
+    latencies.append(time.perf_counter() - start)
+    transferred_bytes += metadata["bytes"]
+  elif mode == "streamed":
+    start = time.perf_counter()
+    metadata = connection.downloadFile("/large.bin", os.path.join(folder, "large_copy.bin"))
+    latencies.append(time.perf_counter() - start)
+    transferred_bytes += metadata["bytes"]
+  elif mode in ("concurrent_upload", "concurrent_download"):
+    upload = mode == "concurrent_upload"
+    if upload:
+      transfers = [(file_name, "/concurrent/{}".format(index)) for index, file_name in enumerate(small_files)]
+    else:
+      transfers = [("/concurrent/{}".format(index), os.path.join(folder, "concurrent_copy", str(index)))
+                   for index in range(len(small_files))]
+    results = dropbox_handler.transferFilesWithDropbox(server.oauth2_token, transfers, upload, workers,
+                                                       overwrite=True)
+    for result in results:
+      if not result["ok"]:
+        raise IOError("Transfer of {} failed: {}".format(result["from"], result["error"]))
+      latencies.append(result["duration"])
+      transferred_bytes += result["bytes"]
+  else:
+    raise ValueError("Unknown mode {}".format(mode))
+  return transferred_bytes, latencies
+
+def runBenchmark(modes=MODES, size=64 * 1024 * 1024, small_size=64 * 1024, file_count=50, workers=4,
+                 latency=0.005, bandwidth=None, folder=None):
+  """Benchmark the Dropbox transfers against a local fake Dropbox server
+
+  Modes:
+    single -- small files uploaded one after the other (shared connection pool)
+    single_no_pool -- same as single with a new client for each file (previous behaviour)
+    put -- large file uploaded in a single request
+    chunked -- large file uploaded by chunks
+    streamed -- large file downloaded to disk by chunks
+    concurrent_upload -- small files uploaded by concurrent workers
+    concurrent_download -- small files downloaded by concurrent workers
+
+  Keyword arguments:
+    modes -- (list, optional) Modes to benchmark (see MODES)
+    size -- (int, optional) Size of the large file
+    small_size -- (int, optional) Size of each small file
+    file_count -- (int, optional) Number of small files
+    workers -- (int, optional) Number of workers of the concurrent modes
+    latency -- (float, optional) Latency of each request of the fake server (seconds)
+    bandwidth -- (int, optional) Bandwidth of each connection of the fake server (bytes per second)
+    folder -- (string, optional) Folder of the temporary files (default: system temporary folder)
+
+  return: (list) Result (dict) of each mode
+  """
+  server = _FakeDropboxProcess(latency, bandwidth)
+  try:
+    return _runModes(server, modes, size, small_size, file_count, workers, folder)
+  finally:
+    server.stop()
+
+def _runModes(server, modes, size, small_size, file_count, workers, folder):
+  """Benchmark the modes against a running fake server (see runBenchmark())"""
+  results = []
+  with tempfile.TemporaryDirectory(dir=folder) as temporary_folder:
+    connection = server.getConnection(max(workers, dropbox_handler.DEFAULT_MAX_CONNECTIONS))
+    dropbox_handler.registerDropboxConnection(server.oauth2_token, connection)
+
+    small_files = []
+    for index in range(file_count):
+      small_files.append(os.path.join(temporary_folder, "small_{}.bin".format(index)))
+      _createFile(small_files[-1], small_size)
+    large_file = os.path.join(temporary_folder, "large.bin")
+    _createFile(large_file, size)
+    # Files read by the download modes
+    if "streamed" in modes:
+      connection.uploadFile(large_file, "/large.bin", overwrite=True)
+    if "concurrent_download" in modes:
+      for index, file_name in enumerate(small_files):
+        connection.uploadFile(file_name, "/concurrent/{}".format(index), overwrite=True)
+
+    for mode in modes:
+      logging.debug("Benchmark {} mode".format(mode))
+      server.resetStats()
+      start = time.perf_counter()
+      transferred_bytes, latencies = _runTransfers(mode, server, connection, temporary_folder, small_files,
+                                                   large_file, workers)
+      total_time = time.perf_counter() - start
+      stats = server.getStats()
+
+      # Allocations are measured on a separate run of the large file modes since tracing slows down the code
+      allocated_peak = None
+      if mode in ("put", "chunked", "streamed"):
+        tracemalloc.start()
+        _runTransfers(mode, server, connection, temporary_folder, small_files, large_file, workers)
+        _, allocated_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+      results.append({
+        "mode": mode,
+        "files": len(latencies),
+        "bytes": transferred_bytes,
+        "total_time_sec": total_time,
+        "throughput_mb_per_sec": (transferred_bytes / (1024.0 * 1024.0)) / total_time if total_time > 0 else None,
+        "latency_mean_ms": sum(latencies) / len(latencies) * 1000 if latencies else None,
+        "latency_p50_ms": _getPercentile(latencies, 50) * 1000 if latencies else None,
+        "latency_p95_ms": _getPercentile(latencies, 95) * 1000 if latencies else None,
+        "requests": stats["requests"],
+        "connections": stats["connections"],
+        "allocated_peak_bytes": allocated_peak,
+      })
+
+    dropbox_handler.registerDropboxConnection(server.oauth2_token, None)
+    connection.close()
+  return results
+
+def _formatSize(size):
+  """Get a human readable size"""
+  if size is None:
+    return "-"
+  for unit in ("B", "KB", "MB", "GB"):
+    if abs(size) < 1024 or unit == "GB":
+      return "{:.0f}{}".format(size, unit) if unit == "B" else "{:.1f}{}".format(size, unit)
+    size /= 1024.0
+
+def main():
+  """Shell Dropbox transfer benchmark"""
+
+  parser = argparse.ArgumentParser(description="Benchmark dropbox_handler.py transfers against a local fake server")
+  parser.add_argument("-m", "--modes", default=",".join(MODES),
+                      help="Comma separated modes to benchmark (default: {})".format(",".join(MODES)))
+  parser.add_argument("-s", "--size", default="64M", help="Size of the large file (default: 64M)")
+  parser.add_argument("--small-size", default="64K", help="Size of each small file (default: 64K)")
+  parser.add_argument("-n", "--file-count", type=int, default=50, help="Number of small files (default: 50)")
+  parser.add_argument("-w", "--workers", type=int, default=4, help="Workers of the concurrent modes (default: 4)")
+  parser.add_argument("-l", "--latency", type=float, default=0.005,
+                      help="Latency of each request in seconds (default: 0.005)")
+  parser.add_argument("-b", "--bandwidth", help="Bandwidth of each connection per second (default: no limit)")
+  parser.add_argument("-t", "--temp-dir", help="Folder of the temporary files")
+  parser.add_argument("-j", "--json", help="Write results as JSON to this file (\"-\" for stdout)")
+  parser.add_argument("-v", "--verbose", action="store_true", help="Show debug information")
+  args = parser.parse_args()
+
+  if args.verbose:
+    logger = logging.getLogger()
+    logger.setLevel(logging.DEBUG)
+  # The Dropbox API v1 client is deprecated
+  warnings.simplefilter("ignore", DeprecationWarning)
+
+  modes = [mode.strip() for mode in args.modes.split(",")]
+  for mode in modes:
+    if mode not in MODES:
+      logging.error("Unknown mode {} (available: {}).".format(mode, ", ".join(MODES)))
+      sys.exit(1)
+  bandwidth = parseSize(args.bandwidth) if args.bandwidth else None
+
+  results = runBenchmark(modes, parseSize(args.size), parseSize(args.small_size), args.file_count, args.workers,
+                         args.latency, bandwidth, args.temp_dir)
+
+  if args.json is not None:
+    report = {
+      "python_version": platform.python_version(),
+      "platform": platform.platform(),
+      "latency_sec": args.latency,
+      "bandwidth_bytes_per_sec": bandwidth,
+      "timestamp": time.time(),
+      "results": results,
+    }
+    if args.json == "-":
+      json.dump(report, sys.stdout, indent=2)
+      print("")
+      sys.exit(0)
+    with open(args.json, "w") as _file:
+      json.dump(report, _file, indent=2)
+
+  print("{:<20} {:>6} {:>10} {:>10} {:>10} {:>10} {:>9} {:>12} {:>14}".format(
+    "Mode", "Files", "Size", "MB/s", "Mean (ms)", "P95 (ms)", "Requests", "Connections", "Allocated peak"))
+  for result in results:
+    print("{:<20} {:>6} {:>10} {:>10.1f} {:>10.1f} {:>10.1f} {:>9} {:>12} {:>14}".format(
+      result["mode"], result["files"], _formatSize(result["bytes"]), result["throughput_mb_per_sec"] or 0,
+      result["latency_mean_ms"] or 0, result["latency_p95_ms"] or 0, result["requests"], result["connections"],
+      _formatSize(result["allocated_peak_bytes"])))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,509 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+  Local fake Dropbox server (API v1 endpoints used by dropbox_handler.py) to test
+  and benchmark transfers without the real service
+"""
+__author__ = 'Quentin Comte-Gaz'
+__email__ = "quentin@comte-gaz.com"
+__license__ = "MIT License"
+__copyright__ = "Copyright Quentin Comte-Gaz (2026)"
+__python_version__ = "3.3+ (getConnection() needs the Python and dependency of dropbox_handler.py)"
+__version__ = "1.0 (2026/10/18)"
+__status__ = "Usable for any project"
+
+import email.utils # Date of the file metadata
+import hashlib
+import http.server # HTTP server
+import json
+import logging
+import posixpath
+import re
+import socketserver # One thread per connection
+import sys
+import threading
+import time
+import urllib.parse
+
+# Size of the blocks read and written by the server (bandwidth is limited block by block)
+_BLOCK_SIZE = 64 * 1024
+# Block size of the Dropbox content hash
+_CONTENT_HASH_BLOCK_SIZE = 4 * 1024 * 1024
+
+def _getContentHash(data):
+  """Get the Dropbox content hash of some data (see dropbox_handler.getDropboxContentHash())"""
+  block_hashes = hashlib.sha256()
+  for offset in range(0, len(data), _CONTENT_HASH_BLOCK_SIZE):
+    block_hashes.update(hashlib.sha256(data[offset:offset + _CONTENT_HASH_BLOCK_SIZE]).digest())
+  return block_hashes.hexdigest()
+
+def _formatSize(size):
+  """Get the human readable size of the Dropbox metadata ("225.4KB")"""
+  for unit in ("bytes", "KB", "MB", "GB"):
+    if size < 1024 or unit == "GB":
+      return "{} {}".format(size, unit) if unit == "bytes" else "{:.1f}{}".format(size, unit)
+    size /= 1024.0
+
+class _ThreadingHTTPServer(socketserver.ThreadingMixIn, http.server.HTTPServer):
+  """HTTP server handling each connection in its own thread"""
+  daemon_threads = True
+
+class _FakeDropboxRequestHandler(http.server.BaseHTTPRequestHandler):
+  """Handler of the requests of a FakeDropboxServer (one instance per connection)"""
+  protocol_version = "HTTP/1.1" # Keep-alive connections
+  # Headers and body are sent separately: without this, small responses wait for a delayed ACK
+  disable_nagle_algorithm = True
+  # Number of bytes of the response body sent before closing the connection (None: whole body)
+  _drop_after = None
+
+  def log_message(self, format, *args):
+    logging.debug("Fake Dropbox server: "+format % args)
+
+  def _throttle(self, transferred_bytes, start):
+    """Wait so that the transfer does not go faster than the server bandwidth"""
+    bandwidth = self.server.fake_dropbox.bandwidth
+    if bandwidth:
+      delay = start + float(transferred_bytes) / bandwidth - time.time()
+      if delay > 0:
+        time.sleep(delay)
+
+  def _readBody(self):
+    """Read the request body (Content-Length or chunked transfer encoding)"""
+    start = time.time()
+    blocks = []
+    received_bytes = 0
+    if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+      while True:
+        chunk_size = int(self.rfile.readline().split(b";")[0].strip(), 16)
+        remaining_bytes = chunk_size
+        while remaining_bytes > 0:
+          block = self.rfile.read(min(remaining_bytes, _BLOCK_SIZE))
+          if not block:
+            raise IOError("Connection closed during the request body")
+          blocks.append(block)
+          remaining_bytes -= len(block)
+          received_bytes += len(block)
+          self._throttle(received_bytes, start)
+        self.rfile.readline() # End of the chunk
+        if chunk_size == 0:
+          break
+    else:
+      remaining_bytes = int(self.headers.get("Content-Length", 0))
+      while remaining_bytes > 0:
+        block = self.rfile.read(min(remaining_bytes, _BLOCK_SIZE))
+        if not block:
+          raise IOError("Connection closed during the request body")
+        blocks.append(block)
+        remaining_bytes -= len(block)
+        received_bytes += len(block)
+        self._throttle(received_bytes, start)
+    self.server.fake_dropbox._addStats(received_bytes=received_bytes)
+    return b"".join(blocks)
+
+  def _sendResponse(self, status, body=b"", headers=None):
+    """Send a response (after the server latency, body limited to the server bandwidth)"""
+    if isinstance(body, (dict, list)):
+      body = json.dumps(body).encode("utf-8")
+      headers = dict(headers or {}, **{"Content-Type": "application/json"})
+    self.send_response(status)
+    for name, value in (headers or {}).items():
+      self.send_header(name, value)
+    self.send_header("Content-Length", str(len(body)))
+    self.end_headers()
+
+    # Connection dropped in the middle of the body (injected fault)
+    sent_size = len(body)
+    if self._drop_after is not None and self._drop_after < sent_size:
+      sent_size = self._drop_after
+      self.close_connection = True
+
+    start = time.time()
+    view = memoryview(body)
+    for offset in range(0, sent_size, _BLOCK_SIZE):
+      self.wfile.write(view[offset:min(offset + _BLOCK_SIZE, sent_size)])
+      self._throttle(min(offset + _BLOCK_SIZE, sent_size), start)
+    self.server.fake_dropbox._addStats(sent_bytes=sent_size)
+
+  def _sendError(self, status, message, **fields):
+    """Send a Dropbox error ({"error": message, ...})"""
+    fields["error"] = message
+    self._sendResponse(status, fields)
+
+  def _handle(self, method):
+    """Handle a request"""
+    fake_dropbox = self.server.fake_dropbox
+    fake_dropbox._addStats(requests=1, client=self.client_address)
+    self._drop_after = None
+    url = urllib.parse.urlsplit(self.path)
+    params = dict(urllib.parse.parse_qsl(url.query))
+    path = urllib.parse.unquote(url.path)
+    try:
+      body = self._readBody() if method in ("PUT", "POST") else b""
+    except (IOError, ValueError) as err:
+      logging.debug("Fake Dropbox server: invalid request body ({})".format(str(err)))
+      self.close_connection = True
+      return
+    if method == "POST" and self.headers.get("Content-Type", "").startswith("application/x-www-form-urlencoded"):
+      params.update(urllib.parse.parse_qsl(body.decode("utf-8")))
+
+    if fake_dropbox.latency > 0:
+      time.sleep(fake_dropbox.latency)
+
+    if self.headers.get("Authorization") != "Bearer "+fake_dropbox.oauth2_token:
+      self._sendError(401, "The given OAuth 2 access token doesn't exist or has expired.")
+      return
+
+    # Endpoint name: "/1/<endpoint>/..."
+    fault = fake_dropbox._popFault(path.split("/")[2] if path.count("/") >= 2 else "")
+    if fault is not None:
+      self._drop_after = fault["drop_after"]
+      if fault["status"] is not None:
+        self._sendError(fault["status"], "Injected fault")
+        return
+
+    for route_method, route_pattern, route_function in _ROUTES:
+      match = re.match(route_pattern, path)
+      if method == route_method and match:
+        route_function(self, match.group(1) if match.groups() else None, params, body)
+        return
+    self._sendError(404, "Unknown endpoint {} {}".format(method, path))
+
+  def do_GET(self):
+    self._handle("GET")
+
+  def do_PUT(self):
+    self._handle("PUT")
+
+  def do_POST(self):
+    self._handle("POST")
+
+  def _filesPut(self, path, params, body):
+    """PUT /1/files_put/auto/<path>"""
+    metadata = self.server.fake_dropbox._storeFile(path, body, params.get("overwrite", "False") == "True")
+    self._sendResponse(200, metadata)
+
+  def _chunkedUpload(self, _, params, body):
+    """PUT /1/chunked_upload?upload_id=...&offset=..."""
+    upload_id, offset, error = self.server.fake_dropbox._addUploadChunk(params.get("upload_id"),
+                                                                      int(params.get("offset", 0)), body)
+    if error is not None:
+      self._sendError(400 if offset is not None else 404, error, upload_id=upload_id, offset=offset)
+      return
+    self._sendResponse(200, {"upload_id": upload_id, "offset": offset,
+                             "expires": email.utils.formatdate(time.time() + 86400, usegmt=True)})
+
+  def _commitChunkedUpload(self, path, params, _):
+    """POST /1/commit_chunked_upload/auto/<path>"""
+    data = self.server.fake_dropbox._popUpload(params.get("upload_id"))
+    if data is None:
+      self._sendError(400, "Invalid upload_id")
+      return
+    metadata = self.server.fake_dropbox._storeFile(path, data, params.get("overwrite", "False") == "True")
+    self._sendResponse(200, metadata)
+
+  def _files(self, path, params, _):
+    """GET /1/files/auto/<path> (with range requests)"""
+    metadata, data = self.server.fake_dropbox._getFile(path, params.get("rev"))
+    if metadata is None:
+      self._sendError(404, "File not found")
+      return
+    if not self.server.fake_dropbox.send_download_size:
+      metadata = dict((key, value) for key, value in metadata.items() if key not in ("bytes", "size"))
+    headers = {"x-dropbox-metadata": json.dumps(metadata), "Accept-Ranges": "bytes"}
+    range_match = re.match(r"bytes=(\d*)-(\d*)$", self.headers.get("Range", ""))
+    if not range_match:
+      self._sendResponse(200, data, headers)
+      return
+    start, end = range_match.groups()
+    if start == "":
+      start, end = max(0, len(data) - int(end or 0)), len(data) - 1
+    else:
+      start, end = int(start), min(int(end), len(data) - 1) if end else len(data) - 1
+    if start >= len(data) or start > end:
+      self._sendError(416, "Requested range not satisfiable")
+      return
+    headers["Content-Range"] = "bytes {}-{}/{}".format(start, end, len(data))
+    self._sendResponse(206, data[start:end + 1], headers)
+
+  def _metadata(self, path, params, _):
+    """GET /1/metadata/auto/<path>"""
+    metadata = self.server.fake_dropbox._getMetadata(path, params.get("list", "true").lower() != "false",
+                                                     params.get("rev"))
+    if metadata is None:
+      self._sendError(404, "Path '{}' not found".format(path))
+      return
+    self._sendResponse(200, metadata)
+
+_ROUTES = [
+  ("PUT", r"^/1/files_put/auto(/.*)$", _FakeDropboxRequestHandler._filesPut),
+  ("PUT", r"^/1/chunked_upload/?$", _FakeDropboxRequestHandler._chunkedUpload),
+  ("POST", r"^/1/commit_chunked_upload/auto(/.*)$", _FakeDropboxRequestHandler._commitChunkedUpload),
+  ("GET", r"^/1/files/auto(/.*)$", _FakeDropboxRequestHandler._files),
+  ("GET", r"^/1/metadata/auto(/.*)?$", _FakeDropboxRequestHandler._metadata),
+]
+
+class FakeDropboxServer(object):
+  """Local HTTP server behaving like the Dropbox API v1 used by dropbox_handler.py (thread safe)
+
+  Implemented endpoints: files_put, chunked_upload, commit_chunked_upload, files
+  (with revisions and range requests) and metadata. Files are kept in memory.
+  Latency is added to each request and bandwidth is limited for each connection.
+  Errors and dropped connections can be injected to test the retries of clients.
+
+  example:
+    '''
+    with FakeDropboxServer(latency=0.05, bandwidth=10 * 1024 * 1024) as server:
+      connection = server.getConnection()
+      connection.uploadFile("test.txt", "/test.txt")
+      connection.downloadFile("/test.txt", "test_copy.txt")
+      print(server.getStats())
+    '''
+  """
+
+  def __init__(self, host="127.0.0.1", port=0, latency=0.0, bandwidth=None, oauth2_token=None,
+               send_content_hash=False, send_download_size=True):
+    """Initialize the server (call start() to serve requests)
+
+    Keyword arguments:
+        host -- (string, optional) Listening address
+        port -- (int, optional) Listening port (default: any free port)
+        latency -- (float, optional) Delay added before each response (seconds)
+        bandwidth -- (int, optional) Maximum bytes per second of each connection (default: no limit)
+        oauth2_token -- (string, optional) Accepted access token (default: "fake" token of 64 characters)
+        send_content_hash -- (bool, optional) Add the "content_hash" field to the file metadata (API v2 field)
+        send_download_size -- (bool, optional) Give the size of downloaded files in their x-dropbox-metadata header
+    """
+    self.latency = latency
+    self.bandwidth = bandwidth
+    self.oauth2_token = oauth2_token if oauth2_token is not None else "fake" * 16
+    self.send_content_hash = send_content_hash
+    self.send_download_size = send_download_size
+    self._lock = threading.Lock()
+    # Lower case path -> {"path", "rev", "revisions": {rev: (metadata, data)}}
+    self._files = {}
+    self._uploads = {}
+    self._revision = 0
+    self._stats = {"requests": 0, "received_bytes": 0, "sent_bytes": 0}
+    self._clients = set()
+    self._faults = []
+    self._server = _ThreadingHTTPServer((host, port), _FakeDropboxRequestHandler)
+    self._server.fake_dropbox = self
+    self._thread = None
+
+  @property
+  def address(self):
+    """(string) "host:port" address of the server"""
+    return "{}:{}".format(*self._server.server_address[:2])
+
+  def start(self):
+    """Serve requests in a background thread"""
+    self._thread = threading.Thread(target=self._server.serve_forever)
+    self._thread.daemon = True
+    self._thread.start()
+    logging.debug("Fake Dropbox server listening on {}".format(self.address))
+
+  def stop(self):
+    """Stop the server"""
+    self._server.shutdown()
+    self._server.server_close()
+    if self._thread is not None:
+      self._thread.join()
+
+  def __enter__(self):
+    self.start()
+    return self
+
+  def __exit__(self, exc_type, exc_value, traceback):
+    self.stop()
+
+  def getConnection(self, max_connections=None):
+    """Get a dropbox_handler connection to this server
+
+    Keyword arguments:
+        max_connections -- (int, optional) Maximum number of keep-alive connections
+
+    return: (dropbox_handler.DropboxConnection) Connection to this server
+    """
+    import dropbox_handler
+    if max_connections is None:
+      max_connections = dropbox_handler.DEFAULT_MAX_CONNECTIONS
+    return dropbox_handler.DropboxConnection(self.oauth2_token, max_connections, api_host=self.address,
+                                             api_content_host=self.address, use_https=False)
+
+  def getStats(self):
+    """Get the server statistics
+
+    return: (dict) "requests", "connections" (number of client sockets), "received_bytes" and "sent_bytes"
+    """
+    with self._lock:
+      return dict(self._stats, connections=len(self._clients))
+
+  def resetStats(self):
+    """Reset the server statistics"""
+    with self._lock:
+      self._stats = {"requests": 0, "received_bytes": 0, "sent_bytes": 0}
+      self._clients = set()
+
+  def addFault(self, endpoint, status=None, drop_after=None, count=1, skip=0):
+    """Make the next requests of an endpoint fail
+
+    Keyword arguments:
+        endpoint -- (string) Endpoint name ("files_put", "chunked_upload", "commit_chunked_upload", "files"
+                             or "metadata")
+        status -- (int, optional) HTTP error status sent instead of handling the request (500 for example)
+        drop_after -- (int, optional) Close the connection after sending this number of bytes of the response body
+        count -- (int, optional) Number of requests failing
+        skip -- (int, optional) Number of requests of the endpoint handled normally before the first failure
+    """
+    with self._lock:
+      self._faults.append({"endpoint": endpoint, "status": status, "drop_after": drop_after, "count": count,
+                           "skip": skip})
+
+  def _popFault(self, endpoint):
+    """Get the fault to apply to a request of an endpoint (None if no fault)"""
+    with self._lock:
+      for fault in self._faults:
+        if fault["endpoint"] == endpoint:
+          if fault["skip"] > 0:
+            fault["skip"] -= 1
+            return None
+          fault["count"] -= 1
+          if fault["count"] <= 0:
+            self._faults.remove(fault)
+          return fault
+    return None
+
+  def _addStats(self, requests=0, received_bytes=0, sent_bytes=0, client=None):
+    with self._lock:
+      self._stats["requests"] += requests
+      self._stats["received_bytes"] += received_bytes
+      self._stats["sent_bytes"] += sent_bytes
+      if client is not None:
+        self._clients.add(client)
+
+  def _createMetadata(self, path, data, rev):
+    """Create the metadata of a file (lock must be held)"""
+    metadata = {"path": path, "is_dir": False, "bytes": len(data), "size": _formatSize(len(data)), "rev": rev,
+                "revision": self._revision, "modified": email.utils.formatdate(time.time(), usegmt=True),
+                "root": "dropbox", "thumb_exists": False, "icon": "page_white"}
+    if self.send_content_hash:
+      metadata["content_hash"] = _getContentHash(data)
+    return metadata
+
+  def _storeFile(self, path, data, overwrite):
+    """Store a new file or revision (conflicting files are renamed "<name> (1).<ext>" without overwrite)
+
+    return: (dict) Metadata of the stored file
+    """
+    path = posixpath.normpath("/"+path.lstrip("/"))
+    with self._lock:
+      if not overwrite and path.lower() in self._files:
+        name, extension = posixpath.splitext(path)
+        copy_number = 1
+        while "{} ({}){}".format(name, copy_number, extension).lower() in self._files:
+          copy_number += 1
+        path = "{} ({}){}".format(name, copy_number, extension)
+      self._revision += 1
+      rev = "{:x}fake".format(self._revision)
+      metadata = self._createMetadata(path, data, rev)
+      entry = self._files.setdefault(path.lower(), {"path": path, "revisions": {}})
+      entry["rev"] = rev
+      entry["revisions"][rev] = (metadata, data)
+      return metadata
+
+  def _addUploadChunk(self, upload_id, offset, data):
+    """Add a chunk to an upload session
+
+    return: (tuple) (upload id, offset of the next chunk, error message or None)
+    """
+    with self._lock:
+      if not upload_id:
+        self._revision += 1
+        upload_id = "upload{}".format(self._revision)
+        self._uploads[upload_id] = bytearray()
+        offset = 0
+      upload = self._uploads.get(upload_id)
+      if upload is None:
+        return upload_id, None, "Unknown upload_id"
+      if offset != len(upload):
+        return upload_id, len(upload), "Submitted input out of alignment: got [{}] expected [{}]".format(offset,
+                                                                                                      len(upload))
+      upload += data
+      return upload_id, len(upload), None
+
+  def _popUpload(self, upload_id):
+    """Remove a finished upload session (None if unknown)"""
+    with self._lock:
+      upload = self._uploads.pop(upload_id, None)
+    return bytes(upload) if upload is not None else None
+
+  def _getFile(self, path, rev=None):
+    """Get a file (last revision by default)
+
+    return: (tuple) (metadata, data) or (None, None) if not found
+    """
+    path = posixpath.normpath("/"+path.lstrip("/"))
+    with self._lock:
+      entry = self._files.get(path.lower())
+      if entry is None or (rev or entry["rev"]) not in entry["revisions"]:
+        return None, None
+      return entry["revisions"][rev or entry["rev"]]
+
+  def _getMetadata(self, path, list_contents, rev=None):
+    """Get the metadata of a file (last revision by default) or a folder (with its direct children)
+
+    return: (dict) Metadata (None if not found)
+    """
+    path = posixpath.normpath("/"+(path or "/").lstrip("/"))
+    with self._lock:
+      entry = self._files.get(path.lower())
+      if entry is not None:
+        if (rev or entry["rev"]) not in entry["revisions"]:
+          return None
+        return entry["revisions"][rev or entry["rev"]][0]
+      prefix = path.lower().rstrip("/")+"/"
+      contents = {}
+      for key, entry in self._files.items():
+        if not key.startswith(prefix):
+          continue
+        child_name = entry["path"][len(prefix):].split("/", 1)[0]
+        child_path = entry["path"][:len(prefix)]+child_name
+        if child_path.lower() == key:
+          contents[key] = entry["revisions"][entry["rev"]][0]
+        else:
+          contents.setdefault(child_path.lower(), {"path": child_path, "is_dir": True, "bytes": 0,
+                                                   "size": "0 bytes", "root": "dropbox", "icon": "folder"})
+      if not contents and path != "/":
+        return None
+      metadata = {"path": path, "is_dir": True, "bytes": 0, "size": "0 bytes", "root": "dropbox", "icon": "folder"}
+      if list_contents:
+        metadata["contents"] = sorted(contents.values(), key=lambda child: child["path"].lower())
+      return metadata
+
+def main():
+  """Run a fake Dropbox server until interrupted"""
+
+  import argparse # Manage program arguments
+  parser = argparse.ArgumentParser(description="Local fake Dropbox server (API v1 endpoints of dropbox_handler.py)")
+  parser.add_argument("--host", default="127.0.0.1", help="Listening address (default: 127.0.0.1)")
+  parser.add_argument("-p", "--port", type=int, default=8080, help="Listening port (default: 8080)")
+  parser.add_argument("-l", "--latency", type=float, default=0.0, help="Latency of each request in seconds")
+  parser.add_argument("-b", "--bandwidth", type=int, help="Bandwidth of each connection in bytes per second")
+  parser.add_argument("-t", "--token", help="Accepted access token (default: \"fake\" * 16)")
+  parser.add_argument("-v", "--verbose", action="store_true", help="Show each request")
+  args = parser.parse_args()
+
+  logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO)
+  server = FakeDropboxServer(args.host, args.port, args.latency, args.bandwidth, args.token)
+  server.start()
+  print("Fake Dropbox server listening on {} (token: {})".format(server.address, server.oauth2_token))
+  try:
+    while True:
+      time.sleep(1)
+  except KeyboardInterrupt:
+    server.stop()
+    sys.exit(0)
+
+if __name__ == "__main__":
+    main()
@@ -8,36 +8,390 @@ __author__ = 'Quentin Comte-Gaz'
 __email__ = "quentin@comte-gaz.com"
 __license__ = "MIT License"
 __copyright__ = "Copyright Quentin Comte-Gaz (2017)"
-__python_version__ = "2.7+ and 3.+"
-__version__ = "1.0 (2017/04/24)"
+__python_version__ = "3.3 to 3.6 (Dropbox API v1 SDK can't be imported with 3.7+)"
+__version__ = "1.1 (2026/10/18)"
 __status__ = "Usable for any project"
-__dependency__ = "Dropbox (use 'pip install dropbox' to install package)"
+__dependency__ = "Dropbox API v1 SDK (use 'pip install \"dropbox<=3.42\" \"urllib3<2\"' to install package)"
 
-import sys, getopt, logging
+import sys, os, time, json, getopt, logging, threading, posixpath, hashlib, errno
+import multiprocessing.pool # Concurrent transfers of the batch mode
 import dropbox
+import urllib3 # Errors raised while reading a download (dropbox dependency)
 
-def uploadFileToDropbox(oauth2_token, file_from, dropbox_file_to):
+# Files bigger than this are sent by chunks (a single request is used for smaller files)
+DEFAULT_CHUNKED_UPLOAD_THRESHOLD = 8 * 1024 * 1024
+# Size of each chunk sent (only one chunk is in memory at a time)
+DEFAULT_UPLOAD_CHUNK_SIZE = 4 * 1024 * 1024
+# Size of each block read from a download and written to disk
+DEFAULT_DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+# Suffixes of the partial download file and of the file with its Dropbox revision
+PARTIAL_DOWNLOAD_SUFFIX = ".part"
+PARTIAL_DOWNLOAD_REV_SUFFIX = ".part.rev"
+# Maximum number of keep-alive connections per Dropbox server of a DropboxConnection
+DEFAULT_MAX_CONNECTIONS = 8
+# Number of files transferred at the same time by the batch mode
+DEFAULT_BATCH_WORKERS = 4
+# Block size of the Dropbox content hash
+DROPBOX_HASH_BLOCK_SIZE = 4 * 1024 * 1024
+# Index of the content hashes of a synchronized folder (stored in the folder, never uploaded)
+DEFAULT_SYNC_INDEX_FILE = ".dropbox_sync_index.json"
+# Number of times a failed chunk is sent (or a failed download resumed) again before giving up
+DEFAULT_MAX_RETRIES = 5
+# Delay before the first retry (doubled after each failure)
+DEFAULT_RETRY_DELAY = 1.0
+
+def _isRetryableError(err):
+  """Check if a Dropbox request may succeed if sent again
+
+    Keyword arguments:
+      err -- (Exception) Error raised by the Dropbox client
+
+  return: (bool) Request may be sent again
+  """
+  if isinstance(err, dropbox.rest.ErrorResponse):
+    # Server errors and rate limiting
+    return err.status >= 500 or err.status == 429
+  return isinstance(err, dropbox.rest.RESTSocketError)
+
+def _uploadFileByChunks(client, f, file_size, dropbox_file_to, chunk_size, max_retries, retry_delay, overwrite=False):
+  """Upload an opened file to Dropbox by chunks (chunked upload session)
+
+  A failed chunk is sent again (up to max_retries times) without sending the
+  previous chunks again (only the current chunk is kept in memory).
+
+    Keyword arguments:
+      client -- (DropboxClient) Dropbox client
+      f -- (file) File opened in binary mode
+      file_size -- (int) Size of the file
+      dropbox_file_to -- (string) File path in dropbox cloud
+      chunk_size -- (int) Size of each chunk
+      max_retries -- (int) Maximum number of retries of a chunk
+      retry_delay -- (float) Delay before the first retry of a chunk (seconds)
+      overwrite -- (bool, optional) Replace an existing file (else Dropbox renames the uploaded file)
+
+  return: (dict) Metadata of the uploaded file
+  """
+  uploader = client.get_chunked_uploader(f, file_size)
+  retries = 0
+  failed_offset = None
+
+  while True:
+    try:
+      # Continue the upload from the last chunk received by the server
+      if uploader.offset < file_size:
+        uploader.upload_chunked(chunk_size)
+      return uploader.finish(str(dropbox_file_to), overwrite=overwrite)
+    except (dropbox.rest.ErrorResponse, dropbox.rest.RESTSocketError) as err:
+      if not _isRetryableError(err):
+        raise
+      # Retries are counted for each chunk
+      if uploader.offset != failed_offset:
+        failed_offset = uploader.offset
+        retries = 0
+      retries += 1
+      if retries > max_retries:
+        raise
+      logging.debug("File {}: upload failed at offset {}/{} ({}), retry {}/{}".format(
+        str(dropbox_file_to), uploader.offset, file_size, str(err), retries, max_retries))
+      time.sleep(retry_delay * 2 ** (retries - 1))
+
+def _getResponseMetadata(response):
+  """Get the file metadata sent with a Dropbox download (x-dropbox-metadata header)
+
+    Keyword arguments:
+      response -- (RESTResponse) Response of DropboxClient.get_file()
+
+  return: (dict) Metadata of the file (empty if not sent)
+  """
+  metadata = response.getheader("x-dropbox-metadata")
+  if not metadata:
+    return {}
+  try:
+    return json.loads(metadata)
+  except ValueError:
+    return {}
+
+def _readPartialDownloadRev(part_file, rev_file):
+  """Get the Dropbox revision of a partial download (None if there is no partial download)"""
+  if not os.path.exists(part_file):
+    return None
+  try:
+    with open(rev_file, "r") as f:
+      return f.read().strip() or None
+  except IOError:
+    return None
+
+def _getDownloadSize(client, dropbox_file, rev):
+  """Get the size of a file revision from its metadata (when the download does not give it)
+
+    Keyword arguments:
+      client -- (DropboxClient) Dropbox client
+      dropbox_file -- (string) Downloaded file
+      rev -- (string) Downloaded revision (None for the last one)
+
+  return: (int) Size of the file in bytes
+  raise: IOError if the size of this revision is not available
+  """
+  metadata = client.metadata(dropbox_file, list=False, rev=rev)
+  if "bytes" not in metadata or (rev is not None and metadata.get("rev") != rev):
+    raise IOError("Size of {} (rev {}) is not available.".format(dropbox_file, rev))
+  return metadata["bytes"]
+
+def _downloadFileByChunks(client, dropbox_file_from, file_to, chunk_size, max_retries, retry_delay):
+  """Download a file from Dropbox to disk by chunks
+
+  The file is written to "<file_to>.part" and renamed to file_to once complete.
+  If the download is interrupted, it continues (HTTP range request) from the end
+  of the partial file, here or on the next call, with the same Dropbox revision.
+
+    Keyword arguments:
+      client -- (DropboxClient) Dropbox client
+      dropbox_file_from -- (string) File to download from dropbox
+      file_to -- (string) File path to save the file
+      chunk_size -- (int) Size of each block read and written
+      max_retries -- (int) Maximum number of retries without progress
+      retry_delay -- (float) Delay before the first retry (seconds)
+
+  return: (dict) Metadata of the downloaded file
+  """
+  part_file = file_to+PARTIAL_DOWNLOAD_SUFFIX
+  rev_file = file_to+PARTIAL_DOWNLOAD_REV_SUFFIX
+  rev = _readPartialDownloadRev(part_file, rev_file)
+  retries = 0
+  failed_offset = None
+
+  try:
+    with open(part_file, "ab") as f:
+      if rev is None:
+        f.truncate(0)
+      offset = f.tell()
+      if offset > 0:
+        logging.debug("File {}: resume download at offset {} (rev {})".format(str(dropbox_file_from), offset, rev))
+
+      while True:
+        response = None
+        try:
+          response = client.get_file(str(dropbox_file_from), rev=rev, start=offset if offset > 0 else None)
+          metadata = _getResponseMetadata(response)
+          if rev is None and metadata.get("rev"):
+            rev = metadata["rev"]
+            with open(rev_file, "w") as rev_f:
+              rev_f.write(rev)
+          if offset > 0 and response.status != 206:
+            # Range not supported: download the whole file again
+            f.truncate(0)
+            offset = 0
+
+          while True:
+            data = response.read(chunk_size)
+            if not data:
+              break
+            f.write(data)
+            offset += len(data)
+
+          expected_size = metadata.get("bytes")
+          if expected_size is None:
+            # Size needed to detect a truncated download
+            expected_size = _getDownloadSize(client, str(dropbox_file_from), rev)
+          if offset == expected_size:
+            break
+          logging.debug("File {}: download ended at offset {}/{}".format(str(dropbox_file_from), offset,
+                                                                         expected_size))
+          if offset > expected_size:
+            f.truncate(0)
+            offset = 0
+        except dropbox.rest.ErrorResponse as err:
+          # Revision of the partial download not available anymore or invalid range: start again
+          if offset > 0 and err.status in (404, 416):
+            logging.debug("File {}: can't resume download ({}), start again".format(str(dropbox_file_from), str(err)))
+            f.truncate(0)
+            offset = 0
+            rev = None
+          elif not _isRetryableError(err):
+            raise
+        except (dropbox.rest.RESTSocketError, urllib3.exceptions.HTTPError) as err:
+          logging.debug("File {}: download failed at offset {} ({})".format(str(dropbox_file_from), offset, str(err)))
+        finally:
+          if response is not None:
+            response.close()
+
+        f.flush()
+        # Retries are counted while the download does not progress
+        if offset != failed_offset:
+          failed_offset = offset
+          retries = 0
+        retries += 1
+        if retries > max_retries:
+          raise IOError("Download of {} failed after {} retries.".format(str(dropbox_file_from), max_retries))
+        time.sleep(retry_delay * 2 ** (retries - 1))
+  except dropbox.rest.ErrorResponse:
+    # Not retryable (missing file, ...): Don't leave an empty partial download behind
+    if offset == 0:
+      for path in (part_file, rev_file):
+        if os.path.exists(path):
+          os.remove(path)
+    raise
+
+  os.replace(part_file, file_to)
+  if os.path.exists(rev_file):
+    os.remove(rev_file)
+  return metadata
+
+class DropboxConnection(object):
+  """Dropbox connection reused by all transfers (thread safe)
+
+  Keep-alive connections to the Dropbox servers are kept in a pool, so many
+  transfers (from one or several threads) don't pay for a new client and a
+  new TLS connection each time.
+
+  example:
+    '''
+    connection = DropboxConnection(oauth2_token)
+    for file_name in file_names:
+      connection.uploadFile(file_name, "/backup/"+os.path.basename(file_name))
+    connection.close()
+    '''
+  """
+
+  def __init__(self, oauth2_token, max_connections=DEFAULT_MAX_CONNECTIONS, api_host=None, api_content_host=None,
+               use_https=True):
+    """Initialize the Dropbox client and its connection pool
+
+    Keyword arguments:
+        oauth2_token -- (string) Dropbox OAuth 2 access token (https://dropbox.com/developers/apps)
+        max_connections -- (int, optional) Maximum number of keep-alive connections per server
+        api_host -- (string, optional) Dropbox API server ("host:port", for test servers)
+        api_content_host -- (string, optional) Dropbox content server ("host:port", for test servers)
+        use_https -- (bool, optional) Use HTTPS (HTTP is only meant for local test servers)
+    """
+    self.rest_client = dropbox.rest.RESTClientObject(max_reusable_connections=max_connections)
+    self.client = dropbox.client.DropboxClient(str(oauth2_token), rest_client=self.rest_client)
+    session = self.client.session
+    if api_host is not None:
+      session.API_HOST = api_host
+    if api_content_host is not None:
+      session.API_CONTENT_HOST = api_content_host
+    if not use_https:
+      # The Dropbox client always builds HTTPS URLs
+      build_path = session.build_path
+      session.build_url = lambda host, target, params=None: "http://{}{}".format(host, build_path(target, params))
+
+  def uploadFile(self, file_from, dropbox_file_to, chunked_upload_threshold=DEFAULT_CHUNKED_UPLOAD_THRESHOLD,
+                 chunk_size=DEFAULT_UPLOAD_CHUNK_SIZE, max_retries=DEFAULT_MAX_RETRIES, retry_delay=DEFAULT_RETRY_DELAY,
+                 overwrite=False):
+    """Upload a file to Dropbox (see uploadFileToDropbox())
+
+    Keyword arguments:
+        overwrite -- (bool, optional) Replace an existing file (else Dropbox renames the uploaded file)
+
+    return: (dict) Metadata of the uploaded file
+
+    raise: IOError (local file), dropbox.rest.ErrorResponse or dropbox.rest.RESTSocketError
+    """
+    with open(file_from, 'rb') as f:
+      file_size = os.fstat(f.fileno()).st_size
+      if file_size > chunked_upload_threshold:
+        return _uploadFileByChunks(self.client, f, file_size, dropbox_file_to, chunk_size, max_retries, retry_delay,
+                                   overwrite)
+      return self.client.put_file(str(dropbox_file_to), f, overwrite=overwrite)
+
+  def downloadFile(self, dropbox_file_from, file_to, chunk_size=DEFAULT_DOWNLOAD_CHUNK_SIZE,
+                   max_retries=DEFAULT_MAX_RETRIES, retry_delay=DEFAULT_RETRY_DELAY):
+    """Download a file from Dropbox (see downloadFileFromDropbox())
+
+    return: (dict) Metadata of the downloaded file
+
+    raise: IOError (local file or download failure), dropbox.rest.ErrorResponse or dropbox.rest.RESTSocketError
+    """
+    return _downloadFileByChunks(self.client, dropbox_file_from, str(file_to), chunk_size, max_retries, retry_delay)
+
+  def listFiles(self, dropbox_folder):
+    """List the files of a Dropbox folder and its sub folders
+
+    Keyword arguments:
+        dropbox_folder -- (string) Folder path in dropbox cloud
+
+    return: (list) Metadata (dict) of each file
+
+    raise: dropbox.rest.ErrorResponse or dropbox.rest.RESTSocketError
+    """
+    files = []
+    folders = [str(dropbox_folder)]
+    while folders:
+      metadata = self.client.metadata(folders.pop(), list=True)
+      for entry in metadata.get("contents", []):
+        if entry.get("is_dir"):
+          folders.append(entry["path"])
+        elif not entry.get("is_deleted"):
+          files.append(entry)
+    return files
+
+  def close(self):
+    """Close the connections of the pool"""
+    self.rest_client.pool_manager.clear()
+
+# Connections shared by the functions of this module (one per token)
+_connections = {}
+_connections_lock = threading.Lock()
+
+def getDropboxConnection(oauth2_token):
+  """Get the shared Dropbox connection of a token (created on first use)
+
+    Keyword arguments:
+      oauth2_token -- (string) Dropbox OAuth 2 access token (https://dropbox.com/developers/apps)
+
+  return: (DropboxConnection) Connection shared by all callers using this token
+  """
+  with _connections_lock:
+    connection = _connections.get(str(oauth2_token))
+    if connection is None:
+      connection = _connections[str(oauth2_token)] = DropboxConnection(oauth2_token)
+    return connection
+
+def registerDropboxConnection(oauth2_token, connection):
+  """Use a connection for a token in the functions of this module (custom pool size, test server, ...)
+
+    Keyword arguments:
+      oauth2_token -- (string) Dropbox OAuth 2 access token (https://dropbox.com/developers/apps)
+      connection -- (DropboxConnection) Connection to use (None to remove the registered connection)
+  """
+  with _connections_lock:
+    if connection is None:
+      _connections.pop(str(oauth2_token), None)
+    else:
+      _connections[str(oauth2_token)] = connection
+
+def uploadFileToDropbox(oauth2_token, file_from, dropbox_file_to,
+                        chunked_upload_threshold=DEFAULT_CHUNKED_UPLOAD_THRESHOLD,
+                        chunk_size=DEFAULT_UPLOAD_CHUNK_SIZE, max_retries=DEFAULT_MAX_RETRIES,
+                        retry_delay=DEFAULT_RETRY_DELAY):
   """Upload a file to Dropbox
 
+  Files bigger than chunked_upload_threshold are sent by chunks of chunk_size
+  bytes (memory usage is limited to one chunk and a failed chunk is sent again
+  without restarting the whole upload).
+
     Keyword arguments:
       oauth2_token -- (string) Dropbox OAuth 2 access token (https://dropbox.com/developers/apps)
       file_from -- (string) File to send to dropbox
       dropbox_file_to -- (string) File path in dropbox cloud
+      chunked_upload_threshold -- (int, optional) Minimum file size to upload by chunks
+      chunk_size -- (int, optional) Size of each chunk
+      max_retries -- (int, optional) Maximum number of retries of a chunk
+      retry_delay -- (float, optional) Delay before the first retry of a chunk (seconds)
 
   return: (bool) File uploaded
   """
   return_value = False
 
-  # Initialize the dropbox connection
-  client = dropbox.client.DropboxClient(str(oauth2_token))
-
   try:
-    # Upload file to dropbox
-    f = open(file_from, 'rb')
-    response = client.put_file(str(dropbox_file_to), f)
+    # Upload file to dropbox (with the connection pool of this token)
+    response = getDropboxConnection(oauth2_token).uploadFile(file_from, dropbox_file_to, chunked_upload_threshold,
+                                                              chunk_size, max_retries, retry_delay)
     logging.debug("File {} uploaded: {}".format(str(file_from), str(response)))
-    f.close()
     return_value = True
+  except dropbox.rest.RESTSocketError as err:
+    logging.warning("Dropbox connection error: {}".format(str(err)))
   except IOError:
     logging.warning("File {} does not exist.".format(str(file_from)))
   except dropbox.rest.ErrorResponse as err:
@@ -46,37 +400,356 @@ def uploadFileToDropbox(oauth2_token, file_from, dropbox_file_to):
   return return_value
 
 
-def downloadFileFromDropbox(oauth2_token, dropbox_file_from, file_to):
+def downloadFileFromDropbox(oauth2_token, dropbox_file_from, file_to, chunk_size=DEFAULT_DOWNLOAD_CHUNK_SIZE,
+                            max_retries=DEFAULT_MAX_RETRIES, retry_delay=DEFAULT_RETRY_DELAY):
   """Download a file from Dropbox
 
+  The file is streamed to disk by chunks of chunk_size bytes (the whole file is
+  never in memory) and file_to is only replaced once the download is complete.
+  An interrupted download is resumed from where it stopped (even on the next call).
+
     Keyword arguments:
       oauth2_token -- (string) Dropbox OAuth 2 access token (https://dropbox.com/developers/apps)
       dropbox_file_from -- (string) File to download from dropbox
       file_to -- (string) File path to save the file
+      chunk_size -- (int, optional) Size of each block read and written
+      max_retries -- (int, optional) Maximum number of retries without progress
+      retry_delay -- (float, optional) Delay before the first retry (seconds)
 
   return: (bool) File downloaded
   """
   return_value = False
 
-  # Initialize the dropbox connection
-  client = dropbox.client.DropboxClient(str(oauth2_token))
-
   try:
-    # Download file from dropbox
-    f, metadata = client.get_file_and_metadata(str(dropbox_file_from))
-    out = open(str(file_to), 'wb')
-    out.write(f.read())
-    out.close()
+    # Download file from dropbox (with the connection pool of this token)
+    metadata = getDropboxConnection(oauth2_token).downloadFile(dropbox_file_from, file_to, chunk_size,
+                                                                max_retries, retry_delay)
     logging.debug("File {} metadata: {}".format(str(dropbox_file_from), str(metadata)))
     return_value = True
-  except IOError:
-    logging.warning("Could not write file {}.".format(file_to))
+  except dropbox.rest.RESTSocketError as err:
+    logging.warning("Dropbox connection error: {}".format(str(err)))
+  except IOError as err:
+    logging.warning("Could not download file {} to {}: {}".format(str(dropbox_file_from), file_to, str(err)))
   except dropbox.rest.ErrorResponse as err:
     logging.warning("Dropbox error: {}".format(str(err)))
 
   return return_value
 
 
+def readTransferManifest(manifest_file, default_folder_to=""):
+  """Read the files to transfer from a manifest
+
+  Each line of the manifest is "<from>" or "<from><tab><to>" (empty lines and lines
+  starting with "#" are ignored). Without destination, the file is transferred
+  in default_folder_to with the same name.
+
+    Keyword arguments:
+      manifest_file -- (string) Manifest file
+      default_folder_to -- (string, optional) Destination folder of the lines without destination
+
+  return: (list) (from, to) tuples
+
+  raise: IOError if the manifest can't be read
+  """
+  transfers = []
+  with open(manifest_file, "r") as f:
+    for line in f:
+      line = line.rstrip("\r\n")
+      if not line.strip() or line.startswith("#"):
+        continue
+      if "\t" in line:
+        file_from, file_to = line.split("\t", 1)
+      else:
+        file_from = line
+        file_to = posixpath.join(default_folder_to, os.path.basename(file_from.replace("/", os.sep)))
+      transfers.append((file_from, file_to))
+  return transfers
+
+def _transferFile(connection, file_from, file_to, upload, overwrite=False):
+  """Transfer a file of a batch (run in a worker thread)
+
+  return: (dict) Result of the transfer (see transferFilesWithDropbox())
+  """
+  result = {"from": file_from, "to": file_to, "ok": False, "bytes": 0, "rev": None, "duration": 0.0, "error": None}
+  start = time.time()
+  try:
+    if upload:
+      metadata = connection.uploadFile(file_from, file_to, overwrite=overwrite)
+    else:
+      folder_to = os.path.dirname(file_to)
+      if folder_to:
+        os.makedirs(folder_to, exist_ok=True)
+      metadata = connection.downloadFile(file_from, file_to)
+    result["bytes"] = metadata.get("bytes", 0)
+    result["rev"] = metadata.get("rev")
+    result["ok"] = True
+  except (IOError, dropbox.rest.ErrorResponse) as err:
+    # IOError includes connection errors (dropbox.rest.RESTSocketError)
+    result["error"] = str(err)
+  result["duration"] = time.time() - start
+  return result
+
+def transferFilesWithDropbox(oauth2_token, transfers, upload, workers=DEFAULT_BATCH_WORKERS, progress_callback=None,
+                             overwrite=False):
+  """Upload or download many files with concurrent workers sharing the same connection pool
+
+    Keyword arguments:
+      oauth2_token -- (string) Dropbox OAuth 2 access token (https://dropbox.com/developers/apps)
+      transfers -- (list) (from, to) tuples of the files to transfer
+      upload -- (bool) Upload files to dropbox (else download them from dropbox)
+      workers -- (int, optional) Number of files transferred at the same time
+      progress_callback -- (function, optional) Function called after each file with
+                                                (result, transferred files, total files, transferred bytes)
+      overwrite -- (bool, optional) Replace existing Dropbox files when uploading (else Dropbox renames them)
+
+  return: (list) Result (dict) of each transfer, in the transfers order: "from", "to", "ok" (bool),
+                 "bytes", "rev" (Dropbox revision), "duration" (seconds) and "error" (None or message)
+  """
+  connection = getDropboxConnection(oauth2_token)
+  results = [None] * len(transfers)
+  progress = {"files": 0, "bytes": 0}
+  progress_lock = threading.Lock()
+
+  def onTransferDone(index, result):
+    results[index] = result
+    with progress_lock:
+      progress["files"] += 1
+      progress["bytes"] += result["bytes"]
+      if progress_callback is not None:
+        progress_callback(result, progress["files"], len(transfers), progress["bytes"])
+
+  pool = multiprocessing.pool.ThreadPool(max(1, workers))
+  try:
+    for index, (file_from, file_to) in enumerate(transfers):
+      pool.apply_async(_transferFile, (connection, file_from, file_to, upload, overwrite),
+                       callback=lambda result, index=index: onTransferDone(index, result),
+                       error_callback=lambda err, index=index, file_from=file_from, file_to=file_to: onTransferDone(
+                         index, {"from": file_from, "to": file_to, "ok": False, "bytes": 0, "rev": None,
+                                 "duration": 0.0, "error": str(err)}))
+  finally:
+    pool.close()
+    pool.join()
+  return results
+
+def _checkLocalFolder(folder):
+  """Check that a local folder to upload exists (a mistyped folder is not an empty folder)
+
+  raise: FileNotFoundError or NotADirectoryError
+  """
+  if not os.path.isdir(folder):
+    if os.path.exists(folder):
+      raise NotADirectoryError(errno.ENOTDIR, os.strerror(errno.ENOTDIR), folder)
+    raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), folder)
+
+def uploadFolderToDropbox(oauth2_token, folder_from, dropbox_folder_to, workers=DEFAULT_BATCH_WORKERS,
+                          progress_callback=None):
+  """Upload all files of a folder (and sub folders) to Dropbox
+
+    Keyword arguments:
+      oauth2_token -- (string) Dropbox OAuth 2 access token (https://dropbox.com/developers/apps)
+      folder_from -- (string) Folder to send to dropbox
+      dropbox_folder_to -- (string) Folder path in dropbox cloud
+      workers -- (int, optional) Number of files transferred at the same time
+      progress_callback -- (function, optional) See transferFilesWithDropbox()
+
+  return: (list) Result (dict) of each file (see transferFilesWithDropbox())
+
+  raise: FileNotFoundError or NotADirectoryError if folder_from is not a folder
+  """
+  _checkLocalFolder(folder_from)
+  transfers = []
+  for root, _, file_names in os.walk(folder_from):
+    relative_root = os.path.relpath(root, folder_from)
+    for file_name in sorted(file_names):
+      relative_path = file_name if relative_root == "." else os.path.join(relative_root, file_name)
+      transfers.append((os.path.join(root, file_name),
+                        posixpath.join(dropbox_folder_to, relative_path.replace(os.sep, "/"))))
+  return transferFilesWithDropbox(oauth2_token, transfers, True, workers, progress_callback)
+
+def downloadFolderFromDropbox(oauth2_token, dropbox_folder_from, folder_to, workers=DEFAULT_BATCH_WORKERS,
+                              progress_callback=None):
+  """Download all files of a Dropbox folder (and sub folders)
+
+    Keyword arguments:
+      oauth2_token -- (string) Dropbox OAuth 2 access token (https://dropbox.com/developers/apps)
+      dropbox_folder_from -- (string) Folder to download from dropbox
+      folder_to -- (string) Folder path to save the files
+      workers -- (int, optional) Number of files transferred at the same time
+      progress_callback -- (function, optional) See transferFilesWithDropbox()
+
+  return: (list) Result (dict) of each file (see transferFilesWithDropbox())
+
+  raise: dropbox.rest.ErrorResponse or dropbox.rest.RESTSocketError if the folder can't be listed
+  """
+  prefix = posixpath.join("/", str(dropbox_folder_from)).rstrip("/").lower() + "/"
+  transfers = []
+  for metadata in getDropboxConnection(oauth2_token).listFiles(dropbox_folder_from):
+    # Dropbox paths are case insensitive
+    relative_path = metadata["path"][len(prefix):] if metadata["path"].lower().startswith(prefix) \
+                    else posixpath.basename(metadata["path"])
+    transfers.append((metadata["path"], os.path.join(folder_to, relative_path.replace("/", os.sep))))
+  return transferFilesWithDropbox(oauth2_token, transfers, False, workers, progress_callback)
+
+
+def getDropboxContentHash(file_name):
+  """Get the Dropbox content hash of a file
+
+  The file is split in 4 MB blocks, the hash is the SHA-256 of the concatenated
+  SHA-256 of each block (same value as the Dropbox "content_hash").
+
+    Keyword arguments:
+      file_name -- (string) File to hash
+
+  return: (string) Content hash (hexadecimal)
+
+  raise: IOError if the file can't be read
+  """
+  block_hashes = hashlib.sha256()
+  with open(file_name, "rb") as f:
+    while True:
+      block = f.read(DROPBOX_HASH_BLOCK_SIZE)
+      if not block:
+        break
+      block_hashes.update(hashlib.sha256(block).digest())
+  return block_hashes.hexdigest()
+
+def _loadSyncIndex(index_file):
+  """Load the content hash index of a synchronized folder (empty if missing or invalid)"""
+  try:
+    with open(index_file, "r") as f:
+      index = json.load(f)
+    return index if isinstance(index, dict) else {}
+  except (IOError, ValueError):
+    return {}
+
+def _saveSyncIndex(index_file, index):
+  """Save the content hash index of a synchronized folder (atomic replacement)"""
+  with open(index_file+".tmp", "w") as f:
+    json.dump(index, f, indent=1, sort_keys=True)
+  os.replace(index_file+".tmp", index_file)
+
+def _hashSyncFile(file_name, file_stat, index_entry):
+  """Get the content hash of a file, from the index if the file did not change since (run in a worker thread)
+
+  return: (tuple) (content hash or None if unreadable, hash computed)
+  """
+  if index_entry is not None and index_entry.get("size") == file_stat.st_size \
+     and index_entry.get("mtime_ns") == file_stat.st_mtime_ns and index_entry.get("content_hash"):
+    return index_entry["content_hash"], False
+  try:
+    return getDropboxContentHash(file_name), True
+  except IOError as err:
+    logging.warning("Could not hash file {}: {}".format(file_name, str(err)))
+    return None, True
+
+def syncFolderToDropbox(oauth2_token, folder_from, dropbox_folder_to, workers=DEFAULT_BATCH_WORKERS,
+                        index_file=None, dry_run=False, progress_callback=None):
+  """Upload the files of a folder (and sub folders) that differ from the Dropbox copy
+
+  Dropbox content hashes of the local files are kept in an index (keyed by path,
+  size and modification time) so that only new or modified files are hashed again.
+  A file is uploaded if it is not in Dropbox, or if its hash differs from the
+  Dropbox "content_hash" (when the server gives it) or else from the hash of the
+  last synchronization of the same Dropbox revision. Unchanged files are not sent.
+
+    Keyword arguments:
+      oauth2_token -- (string) Dropbox OAuth 2 access token (https://dropbox.com/developers/apps)
+      folder_from -- (string) Folder to synchronize
+      dropbox_folder_to -- (string) Folder path in dropbox cloud
+      workers -- (int, optional) Number of files hashed or transferred at the same time
+      index_file -- (string, optional) Content hash index (default: DEFAULT_SYNC_INDEX_FILE in folder_from)
+      dry_run -- (bool, optional) Only get the files to upload (nothing is sent, index is not updated)
+      progress_callback -- (function, optional) See transferFilesWithDropbox()
+
+  return: (dict) "results": result of each uploaded file (see transferFilesWithDropbox()),
+                 "to_upload": (from, to) of each file to upload, "unchanged": number of unchanged files,
+                 "unchanged_bytes": size of the unchanged files and "hashed": number of files hashed
+
+  raise: FileNotFoundError or NotADirectoryError if folder_from is not a folder,
+         dropbox.rest.ErrorResponse or dropbox.rest.RESTSocketError if the Dropbox folder can't be listed
+  """
+  _checkLocalFolder(folder_from)
+  if index_file is None:
+    index_file = os.path.join(folder_from, DEFAULT_SYNC_INDEX_FILE)
+  index = _loadSyncIndex(index_file)
+  connection = getDropboxConnection(oauth2_token)
+
+  # Dropbox files (paths are case insensitive)
+  prefix = posixpath.join("/", str(dropbox_folder_to)).rstrip("/").lower() + "/"
+  remote_files = {}
+  try:
+    for metadata in connection.listFiles(dropbox_folder_to):
+      if metadata["path"].lower().startswith(prefix):
+        remote_files[metadata["path"][len(prefix):].lower()] = metadata
+  except dropbox.rest.ErrorResponse as err:
+    if err.status != 404:
+      raise
+    logging.debug("Dropbox folder {} does not exist yet".format(str(dropbox_folder_to)))
+
+  # Local files
+  local_files = []
+  for root, _, file_names in os.walk(folder_from):
+    for file_name in sorted(file_names):
+      local_path = os.path.join(root, file_name)
+      if os.path.abspath(local_path) in (os.path.abspath(index_file), os.path.abspath(index_file+".tmp")):
+        continue
+      try:
+        file_stat = os.stat(local_path)
+      except OSError:
+        continue
+      relative_path = os.path.relpath(local_path, folder_from).replace(os.sep, "/")
+      local_files.append((relative_path, local_path, file_stat))
+
+  # Content hashes (only new or modified files are read)
+  pool = multiprocessing.pool.ThreadPool(max(1, workers))
+  try:
+    hashes = pool.map(lambda local_file: _hashSyncFile(local_file[1], local_file[2], index.get(local_file[0])),
+                      local_files)
+  finally:
+    pool.close()
+    pool.join()
+
+  result = {"results": [], "to_upload": [], "unchanged": 0, "unchanged_bytes": 0,
+            "hashed": sum(1 for _, hashed in hashes if hashed)}
+  new_index = {}
+  uploads = {}
+  for (relative_path, local_path, file_stat), (content_hash, _) in zip(local_files, hashes):
+    if content_hash is None:
+      continue
+    index_entry = index.get(relative_path) or {}
+    remote_file = remote_files.get(relative_path.lower())
+    new_index[relative_path] = {"size": file_stat.st_size, "mtime_ns": file_stat.st_mtime_ns,
+                                "content_hash": content_hash, "rev": None}
+    if remote_file is not None:
+      if "content_hash" in remote_file:
+        unchanged = remote_file["content_hash"] == content_hash
+      else:
+        unchanged = remote_file.get("bytes") == file_stat.st_size and remote_file.get("rev") is not None \
+                    and index_entry.get("rev") == remote_file.get("rev") \
+                    and index_entry.get("content_hash") == content_hash
+      if unchanged:
+        new_index[relative_path]["rev"] = remote_file.get("rev")
+        result["unchanged"] += 1
+        result["unchanged_bytes"] += file_stat.st_size
+        continue
+    dropbox_path = posixpath.join(dropbox_folder_to, relative_path)
+    uploads[dropbox_path] = relative_path
+    result["to_upload"].append((local_path, dropbox_path))
+
+  logging.debug("Sync of {}: {} files to upload, {} unchanged, {} hashed".format(
+    folder_from, len(result["to_upload"]), result["unchanged"], result["hashed"]))
+  if dry_run:
+    return result
+
+  result["results"] = transferFilesWithDropbox(oauth2_token, result["to_upload"], True, workers, progress_callback,
+                                               overwrite=True)
+  for transfer_result in result["results"]:
+    if transfer_result["ok"]:
+      new_index[uploads[transfer_result["to"]]]["rev"] = transfer_result["rev"]
+  _saveSyncIndex(index_file, new_index)
+  return result
+
+
 ################################# HELP FUNCTION ################################
 def __help():
   # Help
@@ -86,9 +759,40 @@ def __help():
   print("OUT (-o, --out): Output file (file to write to dropbox or computer)")
   print("UPLOAD (-u, --upload): Upload file from the computer to dropbox")
   print("DOWNLOAD (-d, --download): Download file from dropbox to the computer")
+  print("RECURSIVE (-r, --recursive): IN and OUT are folders, transfer all their files (batch mode)")
+  print("MANIFEST (-m, --manifest): Transfer the files listed in this file, one \"IN\" or \"IN<tab>OUT\" per line (batch mode, OUT is then the default destination folder)")
+  print("SYNC (-s, --sync): Upload only the files of the IN folder that differ from the OUT dropbox folder (content hash)")
+  print("WORKERS (-w, --workers): Number of files transferred at the same time in batch mode (default: {})".format(DEFAULT_BATCH_WORKERS))
   print("\n\n")
   print("Example (upload): python dropbox_handler.py --token \"{token key here}\" --in \"/home/user/test.txt\" --out \"/test.txt\" --upload")
   print("Example (download): python dropbox_handler.py --token \"{token key here}\" --in \"/test.txt\" --out \"/home/user/test.txt\" --download")
+  print("Example (folder upload): python dropbox_handler.py --token \"{token key here}\" --in \"/home/user/backup\" --out \"/backup\" --upload --recursive --workers 8")
+  print("Example (folder sync): python dropbox_handler.py --token \"{token key here}\" --in \"/home/user/backup\" --out \"/backup\" --sync")
+  print("Example (manifest download): python dropbox_handler.py --token \"{token key here}\" --manifest \"files.txt\" --out \"/home/user/restore\" --download")
+
+def _printBatchProgress(result, transferred_files, total_files, transferred_bytes):
+  """Show the progress of a batch transfer (see transferFilesWithDropbox())"""
+  print("[{}/{}] {} {} -> {} ({} bytes transferred)".format(transferred_files, total_files,
+                                                           "OK" if result["ok"] else "FAILED",
+                                                           result["from"], result["to"], transferred_bytes))
+
+def _printBatchSummary(results):
+  """Show the result of each file of a batch transfer
+
+  return: (bool) All files transferred
+  """
+  failed_results = [result for result in results if not result["ok"]]
+  print("\n---------------------- Summary ----------------------")
+  for result in results:
+    if result["ok"]:
+      print("OK     {} -> {} ({} bytes, {:.2f}s)".format(result["from"], result["to"], result["bytes"],
+                                                         result["duration"]))
+    else:
+      print("FAILED {} -> {}: {}".format(result["from"], result["to"], result["error"]))
+  print("{} files transferred ({} bytes), {} failed".format(len(results) - len(failed_results),
+                                                            sum(result["bytes"] for result in results),
+                                                            len(failed_results)))
+  return not failed_results
 
 
 ################################# MAIN FUNCTION ###############################
@@ -110,11 +814,16 @@ def main():
   _oauth2_token = ""
   _download = False
   _upload = False
+  _recursive = False
+  _manifest = ""
+  _sync = False
+  _workers = DEFAULT_BATCH_WORKERS
 
   # Get options
   try:
-    opts, args = getopt.getopt(sys.argv[1:], "ht:i:o:ud",
-                               ["help", "token=", "in=", "out=", "upload", "download"])
+    opts, args = getopt.getopt(sys.argv[1:], "ht:i:o:udrm:sw:",
+                               ["help", "token=", "in=", "out=", "upload", "download", "recursive", "manifest=",
+                                "sync", "workers="])
   except getopt.GetoptError as err:
     print("[ERROR] "+str(err))
     __help()
@@ -143,16 +852,35 @@ def main():
     if o in ("-d", "--download"):
       _download = True
       continue
+    if o in ("-r", "--recursive"):
+      _recursive = True
+      continue
+    if o in ("-m", "--manifest"):
+      _manifest = str(a)
+      continue
+    if o in ("-s", "--sync"):
+      # Synchronization only uploads files
+      _sync = True
+      _upload = True
+      continue
+    if o in ("-w", "--workers"):
+      try:
+        _workers = int(a)
+      except ValueError:
+        print("[ERROR] Number of workers must be an integer")
+        __help()
+        sys.exit(1)
+      continue
 
   if _oauth2_token == "":
     print("[ERROR] No authentification token specified")
     __help()
     sys.exit(1)
-  if _in == "":
+  if _in == "" and _manifest == "":
     print("[ERROR] No input file specified")
     __help()
     sys.exit(1)
-  if _out == "":
+  if _out == "" and _manifest == "":
     print("[ERROR] No output file specified")
     __help()
     sys.exit(1)
@@ -165,6 +893,40 @@ def main():
     __help()
     sys.exit(1)
 
+  # Synchronization mode
+  if _sync:
+    try:
+      result = syncFolderToDropbox(_oauth2_token, _in, _out, _workers, progress_callback=_printBatchProgress)
+    except IOError as err:
+      print("[ERROR] "+str(err))
+      sys.exit(1)
+    except dropbox.rest.ErrorResponse as err:
+      print("[ERROR] Dropbox error: "+str(err))
+      sys.exit(1)
+    all_uploaded = _printBatchSummary(result["results"])
+    print("{} files unchanged ({} bytes not sent), {} files hashed".format(result["unchanged"],
+                                                                          result["unchanged_bytes"], result["hashed"]))
+    sys.exit(0 if all_uploaded else 1)
+
+  # Batch mode
+  if _recursive or _manifest != "":
+    try:
+      if _manifest != "":
+        default_folder_to = _out if _out != "" else ("." if _download else "/")
+        transfers = readTransferManifest(_manifest, default_folder_to)
+        results = transferFilesWithDropbox(_oauth2_token, transfers, _upload, _workers, _printBatchProgress)
+      elif _download:
+        results = downloadFolderFromDropbox(_oauth2_token, _in, _out, _workers, _printBatchProgress)
+      else:
+        results = uploadFolderToDropbox(_oauth2_token, _in, _out, _workers, _printBatchProgress)
+    except IOError as err:
+      print("[ERROR] "+str(err))
+      sys.exit(1)
+    except dropbox.rest.ErrorResponse as err:
+      print("[ERROR] Dropbox error: "+str(err))
+      sys.exit(1)
+    sys.exit(0 if _printBatchSummary(results) else 1)
+
   return_value = False
   if _download:
     return_value = downloadFileFromDropbox(oauth2_token=_oauth2_token, dropbox_file_from=_in, file_to=_out)
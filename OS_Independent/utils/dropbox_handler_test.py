@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+  Test the retries of dropbox_handler.py transfers against a local fake Dropbox server
+  (python -m unittest dropbox_handler_test)
+"""
+__author__ = 'Quentin Comte-Gaz'
+__email__ = "quentin@comte-gaz.com"
+__license__ = "MIT License"
+__copyright__ = "Copyright Quentin Comte-Gaz (2026)"
+__python_version__ = "3.3 to 3.6 (Dropbox API v1 SDK can't be imported with 3.7+)"
+__version__ = "1.0 (2026/10/18)"
+__status__ = "Usable for any project"
+__dependency__ = "Dropbox API v1 SDK (use 'pip install \"dropbox<=3.42\" \"urllib3<2\"' to install package)"
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+# Modules of this folder (even when the tests are run from another folder)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from dropbox_fake_server import FakeDropboxServer
+try:
+  import dropbox.client
+  import dropbox.rest
+  import dropbox_handler
+except (ImportError, SyntaxError):
+  dropbox_handler = None
+
+CHUNK_SIZE = 64 * 1024
+
+@unittest.skipIf(dropbox_handler is None, "Dropbox API v1 SDK not available (see __dependency__)")
+class TestDropboxHandler(unittest.TestCase):
+  def setUp(self):
+    self.folder = tempfile.mkdtemp()
+    self.server = FakeDropboxServer()
+    self.server.start()
+    self.connection = self.server.getConnection()
+
+  def tearDown(self):
+    self.connection.close()
+    self.server.stop()
+    shutil.rmtree(self.folder)
+
+  def _createFile(self, name, size):
+    """Create a local file of random data
+
+    return: (tuple) (path, data)
+    """
+    path = os.path.join(self.folder, name)
+    data = os.urandom(size)
+    with open(path, "wb") as f:
+      f.write(data)
+    return path, data
+
+  def _readFile(self, path):
+    with open(path, "rb") as f:
+      return f.read()
+
+  def testChunkFailureIsRetried(self):
+    path, data = self._createFile("upload.bin", 3 * CHUNK_SIZE)
+    # Second chunk fails once
+    self.server.addFault("chunked_upload", status=500, skip=1)
+
+    metadata = self.connection.uploadFile(path, "/upload.bin", chunked_upload_threshold=CHUNK_SIZE,
+                                          chunk_size=CHUNK_SIZE, retry_delay=0)
+
+    self.assertEqual(metadata["bytes"], len(data))
+    self.assertEqual(self.server._getFile("/upload.bin")[1], data)
+    # Only the failed chunk is sent again: 3 chunks + 1 retry + commit
+    stats = self.server.getStats()
+    self.assertEqual(stats["requests"], 5)
+    # (commit request body is a few bytes long)
+    self.assertGreaterEqual(stats["received_bytes"], len(data) + CHUNK_SIZE)
+    self.assertLess(stats["received_bytes"], len(data) + CHUNK_SIZE + 1024)
+
+  def testChunkFailureAfterMaxRetries(self):
+    path, _ = self._createFile("upload.bin", 3 * CHUNK_SIZE)
+    self.server.addFault("chunked_upload", status=500, count=3)
+
+    with self.assertRaises(dropbox.rest.ErrorResponse):
+      self.connection.uploadFile(path, "/upload.bin", chunked_upload_threshold=CHUNK_SIZE,
+                                 chunk_size=CHUNK_SIZE, max_retries=2, retry_delay=0)
+    self.assertEqual(self.server._getFile("/upload.bin"), (None, None))
+
+  def testDroppedDownloadIsResumedFromPartialFile(self):
+    _, data = self._createFile("source.bin", 4 * CHUNK_SIZE)
+    self.server._storeFile("/download.bin", data, False)
+    path = os.path.join(self.folder, "download.bin")
+    # Connection closed after 2 chunks and no retry: the partial download is kept
+    self.server.addFault("files", drop_after=2 * CHUNK_SIZE)
+
+    with self.assertRaises(IOError):
+      self.connection.downloadFile("/download.bin", path, chunk_size=CHUNK_SIZE, max_retries=0, retry_delay=0)
+    self.assertFalse(os.path.exists(path))
+    self.assertEqual(self._readFile(path+dropbox_handler.PARTIAL_DOWNLOAD_SUFFIX), data[:2 * CHUNK_SIZE])
+
+    self.server.resetStats()
+    metadata = self.connection.downloadFile("/download.bin", path, chunk_size=CHUNK_SIZE, retry_delay=0)
+
+    self.assertEqual(metadata["bytes"], len(data))
+    self.assertEqual(self._readFile(path), data)
+    self.assertFalse(os.path.exists(path+dropbox_handler.PARTIAL_DOWNLOAD_SUFFIX))
+    self.assertFalse(os.path.exists(path+dropbox_handler.PARTIAL_DOWNLOAD_REV_SUFFIX))
+    # Only the missing end of the file is downloaded
+    stats = self.server.getStats()
+    self.assertEqual(stats["requests"], 1)
+    self.assertEqual(stats["sent_bytes"], len(data) - 2 * CHUNK_SIZE)
+
+  def testDroppedDownloadIsRetried(self):
+    _, data = self._createFile("source.bin", 4 * CHUNK_SIZE)
+    self.server._storeFile("/download.bin", data, False)
+    path = os.path.join(self.folder, "download.bin")
+    self.server.addFault("files", drop_after=CHUNK_SIZE)
+
+    self.connection.downloadFile("/download.bin", path, chunk_size=CHUNK_SIZE, retry_delay=0)
+
+    self.assertEqual(self._readFile(path), data)
+    self.assertEqual(self.server.getStats()["sent_bytes"], len(data))
+
+  def testDroppedDownloadWithoutSizeIsRetried(self):
+    _, data = self._createFile("source.bin", 4 * CHUNK_SIZE)
+    self.server._storeFile("/download.bin", data, False)
+    # Size read from the metadata of the revision instead of the download header
+    self.server.send_download_size = False
+    path = os.path.join(self.folder, "download.bin")
+    self.server.addFault("files", drop_after=CHUNK_SIZE)
+
+    metadata = self.connection.downloadFile("/download.bin", path, chunk_size=CHUNK_SIZE, retry_delay=0)
+
+    self.assertEqual(self._readFile(path), data)
+    self.assertEqual(metadata["rev"], self.server._getFile("/download.bin")[0]["rev"])
+    self.assertGreater(self.server.getStats()["sent_bytes"], len(data))
+
+  def testRevisionMismatchRestartsDownload(self):
+    _, old_data = self._createFile("old.bin", 4 * CHUNK_SIZE)
+    self.server._storeFile("/download.bin", old_data, False)
+    path = os.path.join(self.folder, "download.bin")
+    self.server.addFault("files", drop_after=2 * CHUNK_SIZE)
+    with self.assertRaises(IOError):
+      self.connection.downloadFile("/download.bin", path, chunk_size=CHUNK_SIZE, max_retries=0, retry_delay=0)
+
+    # Revision of the partial download not available anymore
+    with open(path+dropbox_handler.PARTIAL_DOWNLOAD_REV_SUFFIX, "w") as f:
+      f.write("unknownrev")
+    _, new_data = self._createFile("new.bin", 3 * CHUNK_SIZE)
+    new_metadata = self.server._storeFile("/download.bin", new_data, True)
+    self.server.resetStats()
+
+    metadata = self.connection.downloadFile("/download.bin", path, chunk_size=CHUNK_SIZE, retry_delay=0)
+
+    self.assertEqual(metadata["rev"], new_metadata["rev"])
+    self.assertEqual(self._readFile(path), new_data)
+    # Resume refused (404) then whole new revision downloaded
+    stats = self.server.getStats()
+    self.assertEqual(stats["requests"], 2)
+    self.assertFalse(os.path.exists(path+dropbox_handler.PARTIAL_DOWNLOAD_SUFFIX))
+
+  def testMissingFileLeavesNoPartialDownload(self):
+    path = os.path.join(self.folder, "missing.bin")
+
+    with self.assertRaises(dropbox.rest.ErrorResponse):
+      self.connection.downloadFile("/missing.bin", path, retry_delay=0)
+    self.assertEqual(os.listdir(self.folder), [])
+
+  def testMissingLocalFolderIsAnError(self):
+    dropbox_handler.registerDropboxConnection(self.server.oauth2_token, self.connection)
+    try:
+      missing_folder = os.path.join(self.folder, "missing")
+      with self.assertRaises(FileNotFoundError):
+        dropbox_handler.uploadFolderToDropbox(self.server.oauth2_token, missing_folder, "/backup")
+      with self.assertRaises(FileNotFoundError):
+        dropbox_handler.syncFolderToDropbox(self.server.oauth2_token, missing_folder, "/backup")
+      self.assertEqual(self.server.getStats()["requests"], 0)
+    finally:
+      dropbox_handler.registerDropboxConnection(self.server.oauth2_token, None)
+
+if __name__ == '__main__':
+  unittest.main()
@@ -8,13 +8,51 @@ __author__ = 'Quentin Comte-Gaz'
 __email__ = "quentin@comte-gaz.com"
 __license__ = "MIT License"
 __copyright__ = "Copyright Quentin Comte-Gaz (2016)"
-__python_version__ = "2.7+ and 3.+"
-__version__ = "1.0 (2016/08/12)"
+__python_version__ = "3.6+"
+__version__ = "1.1 (2026/10/18)"
 __status__ = "Usable for any project"
 
 import os
+import collections
+import ctypes # Linux inotify from libc, process state on Windows
+import ctypes.util
+import errno
+import hashlib # Compare files with the same size but a different mtime
+import heapq # Find the oldest entries to clean
 import shutil
+import stat
+import struct
+import sys
 import logging
+import multiprocessing.pool # Remove files from several threads
+import select
+import sqlite3 # Folder scan index
+import threading
+import time
+import uuid
+
+# Number of threads removing files in parallel
+DEFAULT_REMOVE_WORKERS = 16
+# Number of files removed by a thread in a row
+_REMOVE_BATCH_SIZE = 256
+# Number of threads removing files of a folder removed in background
+DEFAULT_BACKGROUND_REMOVE_WORKERS = 4
+# Number of threads comparing/copying files when synchronizing folders
+DEFAULT_SYNC_WORKERS = 8
+# Amount of data read at once when hashing or copying files without zero copy
+_COPY_CHUNK_SIZE = 1024 * 1024
+# Delay without new change before a batch of changes is given to a folder watcher callback (seconds)
+DEFAULT_WATCH_COALESCE_DELAY = 0.05
+# Delay between two scans of a watched folder when inotify is not available (seconds)
+DEFAULT_WATCH_POLL_INTERVAL = 1.0
+# Prefix of folders renamed before being removed in background
+# (full name: prefix + folder name + "-" + pid of the process removing it + "-" + unique id)
+_TRASH_PREFIX = ".removeFolder-trash-"
+
+# Trash folders being removed and parent folders already swept (by this process)
+_trash_lock = threading.Lock()
+_trash_in_progress = set()
+_swept_folders = set()
 
 def createFolder(path):
   """Create a new directory
@@ -23,12 +61,69 @@ def createFolder(path):
       path -- (string) name of the folder to create (relative or absolute)
   """
   try:
-    os.stat(path)
-  except:
     os.mkdir(path)
-    logging.debug("Folder "+path+" created")
-  else:
+  except FileExistsError:
     logging.debug("Folder "+path+" already exist")
+  else:
+    logging.debug("Folder "+path+" created")
+
+def _getFolderAndParents(path):
+  """Get a folder and all its parent folders (root excluded)
+
+  Keyword arguments:
+      path -- (string) Folder (relative or absolute)
+
+  return: (list) Folder then its parent folders (deepest first)
+  """
+  folders = []
+  path = os.path.normpath(path)
+  while path and path != os.curdir:
+    parent = os.path.dirname(path)
+    if parent == path:
+      break
+    folders.append(path)
+    path = parent
+  return folders
+
+def createFolders(paths, known_folders=None):
+  """Create a lot of directories (and their missing parent directories) at once
+
+  Each folder needed is created only once (parents first) with a single mkdir
+  call per folder (no stat call), folders created by someone else in the meantime
+  are not an error.
+
+  Keyword arguments:
+      paths -- (iterable) Folders to create (relative or absolute)
+      known_folders -- (set, optional) Folders known to exist, updated with the folders
+                                       checked or created (give the same set to
+                                       successive calls to skip folders already handled)
+
+  return: (list) Folders created (parents first)
+  """
+  if known_folders is None:
+    known_folders = set()
+
+  folders_to_create = set()
+  for path in paths:
+    for folder in _getFolderAndParents(path):
+      if folder in known_folders or folder in folders_to_create:
+        # Parents of this folder are already handled too
+        break
+      folders_to_create.add(folder)
+
+  created_folders = []
+  for folder in sorted(folders_to_create, key=lambda folder: (folder.count(os.sep), folder)):
+    try:
+      os.mkdir(folder)
+      created_folders.append(folder)
+    except FileExistsError:
+      # Already there (or created concurrently), only an error if it is not a folder
+      if not os.path.isdir(folder):
+        raise
+    known_folders.add(folder)
+
+  logging.debug("{} folders created ({} folders checked)".format(len(created_folders), len(folders_to_create)))
+  return created_folders
 
 def removeFolder(path):
   """Delete an existing directory
@@ -45,6 +140,1085 @@ def removeFolder(path):
   else:
     logging.debug("Folder "+path+" does not exist")
 
+def _removeFiles(file_paths):
+  """Remove a batch of files (thread pool worker)
+
+  Keyword arguments:
+      file_paths -- (list) Files (or links) to remove
+
+  return: (tuple) Number of files removed and bytes freed
+  """
+  freed_bytes = 0
+  for file_path in file_paths:
+    freed_bytes += os.lstat(file_path).st_size
+    os.unlink(file_path)
+  return len(file_paths), freed_bytes
+
+def _waitForFileRemovals(pending_batches, stats):
+  """Wait for batches of files removed by a thread pool
+
+  Every batch is waited for before raising the first error (like shutil.rmtree)
+
+  Keyword arguments:
+      pending_batches -- (list) AsyncResult of each _removeFiles() call
+      stats -- (dict) Removal statistics to update (files and bytes)
+  """
+  first_error = None
+  for pending_batch in pending_batches:
+    try:
+      removed_files, freed_bytes = pending_batch.get()
+      stats["files"] += removed_files
+      stats["bytes"] += freed_bytes
+    except OSError as err:
+      if first_error is None:
+        first_error = err
+  if first_error is not None:
+    raise first_error
+
+def _removeFolderTree(path, pool, stats, tree=None):
+  """Remove a folder tree with files removed by a thread pool
+
+  Keyword arguments:
+      path -- (string) Folder to remove
+      pool -- (ThreadPool) Pool removing the files
+      stats -- (dict) Removal statistics to update (files, folders and bytes)
+      tree -- (tuple, optional) Files and folders of the tree already enumerated by _getTreeSizeAndMtime()
+  """
+  if os.path.islink(path):
+    raise OSError("Cannot remove a symbolic link to a folder: {}".format(path))
+
+  if tree is not None:
+    file_paths = [file_path for file_path, _, _ in tree[0]]
+    folders = tree[1]
+    pending_batches = [pool.apply_async(_removeFiles, (file_paths[i:i + _REMOVE_BATCH_SIZE],))
+                       for i in range(0, len(file_paths), _REMOVE_BATCH_SIZE)]
+    _waitForFileRemovals(pending_batches, stats)
+    for folder in reversed(folders):
+      try:
+        os.rmdir(folder)
+      except OSError as err:
+        if err.errno not in (errno.ENOTEMPTY, errno.EEXIST):
+          raise
+        # Content created since the enumeration
+        _removeFolderTree(folder, pool, stats)
+        continue
+      stats["folders"] += 1
+    return
+
+  # Enumerate the tree once, files are removed while the rest of the tree is being scanned
+  folders = [path]
+  folders_to_scan = [path]
+  pending_batches = []
+  file_batch = []
+  while folders_to_scan:
+    with os.scandir(folders_to_scan.pop()) as entries:
+      for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+          folders.append(entry.path)
+          folders_to_scan.append(entry.path)
+        else:
+          file_batch.append(entry.path)
+          if len(file_batch) >= _REMOVE_BATCH_SIZE:
+            pending_batches.append(pool.apply_async(_removeFiles, (file_batch,)))
+            file_batch = []
+  if file_batch:
+    pending_batches.append(pool.apply_async(_removeFiles, (file_batch,)))
+  _waitForFileRemovals(pending_batches, stats)
+
+  # Sub folders were found after their parent folder so reversed order removes them first
+  for folder in reversed(folders):
+    os.rmdir(folder)
+    stats["folders"] += 1
+
+def removeFolderParallel(path, workers=DEFAULT_REMOVE_WORKERS):
+  """Delete an existing directory removing its files from several threads
+
+  Much faster than removeFolder() for folders containing a lot of small files.
+
+  Keyword arguments:
+      path -- (string) Name of the folder to delete (relative or absolute)
+                       Only last folder of the path will be deleted
+      workers -- (int, optional) Number of threads removing files
+
+  return: (dict) Number of "files" and "folders" removed and "bytes" freed
+  """
+  stats = {"files": 0, "folders": 0, "bytes": 0}
+
+  # Check if folder exists
+  if not os.path.exists(path):
+    logging.debug("Folder "+path+" does not exist")
+    return stats
+
+  pool = multiprocessing.pool.ThreadPool(workers)
+  try:
+    _removeFolderTree(path, pool, stats)
+  finally:
+    pool.close()
+    pool.join()
+  logging.debug("Folder {} removed ({} files, {} folders, {} bytes)".format(path, stats["files"],
+                                                                          stats["folders"], stats["bytes"]))
+  return stats
+
+def _getTreeSizeAndMtime(path, entry_stat, file_paths=None, folder_paths=None):
+  """Get the total size and most recent mtime of a folder tree (or a file)
+
+  Keyword arguments:
+      path -- (string) Folder (or file) path
+      entry_stat -- (os.stat_result) Stat (not following links) of the path
+      file_paths -- (list, optional) List to add the (path, size, mtime) of every file to
+      folder_paths -- (list, optional) List to add the path of every folder to (parents first)
+
+  return: (tuple) Total size and most recent mtime
+  """
+  if not stat.S_ISDIR(entry_stat.st_mode):
+    if file_paths is not None:
+      file_paths.append((path, entry_stat.st_size, entry_stat.st_mtime))
+    return entry_stat.st_size, entry_stat.st_mtime
+
+  if folder_paths is not None:
+    folder_paths.append(path)
+  total_size = 0
+  newest_mtime = entry_stat.st_mtime
+  folders_to_scan = [path]
+  while folders_to_scan:
+    with os.scandir(folders_to_scan.pop()) as entries:
+      for entry in entries:
+        sub_entry_stat = entry.stat(follow_symlinks=False)
+        newest_mtime = max(newest_mtime, sub_entry_stat.st_mtime)
+        if entry.is_dir(follow_symlinks=False):
+          folders_to_scan.append(entry.path)
+          if folder_paths is not None:
+            folder_paths.append(entry.path)
+        else:
+          total_size += sub_entry_stat.st_size
+          if file_paths is not None:
+            file_paths.append((entry.path, sub_entry_stat.st_size, sub_entry_stat.st_mtime))
+  return total_size, newest_mtime
+
+def cleanFolder(path, max_size=None, max_age=None, per_file=False, workers=DEFAULT_REMOVE_WORKERS, dry_run=False):
+  """Delete the oldest entries of a folder to respect a size budget and/or a maximum age
+
+  By default every entry of the folder (dated output folder, file, ...) is a
+  candidate, its age is given by the most recent mtime of its content. With
+  per_file, every file of the folder tree is a candidate instead (folders and the
+  folder itself are kept, a link to a folder is cleaned like the folder).
+  The tree is enumerated once, entries older than max_age are deleted, then the
+  oldest remaining entries (found with a heap) are deleted until the total size
+  fits in max_size. Files are removed by a pool of threads.
+
+  Keyword arguments:
+      path -- (string) Folder to clean
+      max_size -- (int, optional) Maximum total size of the folder in bytes (default: no limit)
+      max_age -- (float, optional) Maximum age of the entries in seconds (default: no limit)
+      per_file -- (bool, optional) Clean file by file instead of entry by entry
+      workers -- (int, optional) Number of threads removing files
+      dry_run -- (bool, optional) Only compute the entries to delete (nothing is deleted)
+
+  return: (dict) "deleted" entries (oldest first), "remaining_bytes" (once cleaned), number of
+                 "files" and "folders" removed and "bytes" freed (0 in dry run mode)
+  """
+  result = {"deleted": [], "remaining_bytes": 0, "files": 0, "folders": 0, "bytes": 0}
+  if not os.path.exists(path):
+    logging.debug("Folder "+path+" does not exist")
+    return result
+
+  # Root is never a candidate (a link to a folder is followed like os.scandir() does)
+  root_stat = os.stat(path)
+  if not stat.S_ISDIR(root_stat.st_mode):
+    raise NotADirectoryError(errno.ENOTDIR, os.strerror(errno.ENOTDIR), path)
+
+  # Single enumeration: (mtime, path, size, tree) of each candidate, the tree (files and
+  # folders, None for a file) is kept so that deleted folders are not enumerated again
+  candidates = []
+  if per_file:
+    file_paths = []
+    _getTreeSizeAndMtime(path, root_stat, file_paths)
+    candidates = [(mtime, file_path, size, None) for file_path, size, mtime in file_paths]
+  else:
+    with os.scandir(path) as entries:
+      for entry in entries:
+        entry_stat = entry.stat(follow_symlinks=False)
+        if stat.S_ISDIR(entry_stat.st_mode):
+          tree = ([], [])
+          size, mtime = _getTreeSizeAndMtime(entry.path, entry_stat, tree[0], tree[1])
+        else:
+          tree = None
+          size, mtime = _getTreeSizeAndMtime(entry.path, entry_stat)
+        candidates.append((mtime, entry.path, size, tree))
+
+  remaining_bytes = sum(candidate[2] for candidate in candidates)
+  entries_to_delete = []
+  if max_age is not None:
+    oldest_mtime_kept = time.time() - max_age
+    entries_to_delete = sorted(candidate for candidate in candidates if candidate[0] < oldest_mtime_kept)
+    candidates = [candidate for candidate in candidates if candidate[0] >= oldest_mtime_kept]
+    remaining_bytes -= sum(candidate[2] for candidate in entries_to_delete)
+  if max_size is not None:
+    heapq.heapify(candidates)
+    while candidates and remaining_bytes > max_size:
+      candidate = heapq.heappop(candidates)
+      entries_to_delete.append(candidate)
+      remaining_bytes -= candidate[2]
+
+  result["deleted"] = [candidate[1] for candidate in entries_to_delete]
+  result["remaining_bytes"] = remaining_bytes
+  if dry_run or not entries_to_delete:
+    return result
+
+  pool = multiprocessing.pool.ThreadPool(workers)
+  try:
+    files_to_delete = [candidate[1] for candidate in entries_to_delete if candidate[3] is None]
+    pending_batches = [pool.apply_async(_removeFiles, (files_to_delete[i:i + _REMOVE_BATCH_SIZE],))
+                       for i in range(0, len(files_to_delete), _REMOVE_BATCH_SIZE)]
+    # Folders share the same pool (their files are removed in parallel with the other entries)
+    for candidate in entries_to_delete:
+      if candidate[3] is not None:
+        _removeFolderTree(candidate[1], pool, result, candidate[3])
+    _waitForFileRemovals(pending_batches, result)
+  finally:
+    pool.close()
+    pool.join()
+
+  logging.debug("Folder {} cleaned: {} entries deleted ({} bytes freed, {} bytes remaining)"
+                .format(path, len(result["deleted"]), result["bytes"], remaining_bytes))
+  return result
+
+class FolderRemovalHandle(object):
+  """Follow the removal of a folder in background
+
+  example:
+    '''
+    handle = removeFolderInBackground("build_cache")
+    print("Folder is already gone, doing other stuff while it is removed")
+    handle.wait()
+    print("Removal statistics: "+str(handle.stats))
+    '''
+  """
+
+  def __init__(self, path, trash_path):
+    """Initialize the handle
+
+    Keyword arguments:
+        path -- (string) Folder to remove
+        trash_path -- (string) Hidden folder the folder was renamed to (None if nothing to remove)
+    """
+    self.path = path
+    self.trash_path = trash_path
+    # Removal statistics (see removeFolderParallel()), available once done
+    self.stats = None
+    # Error raised during the removal (if any)
+    self.error = None
+    self._done = threading.Event()
+
+  def isDone(self):
+    """Check if the removal is finished
+
+    return: (bool) Removal finished
+    """
+    return self._done.is_set()
+
+  def wait(self, timeout=None):
+    """Wait for the removal to be finished
+
+    Keyword arguments:
+        timeout -- (float, optional) Maximum time to wait in seconds (default: no limit)
+
+    return: (bool) Removal finished
+    """
+    return self._done.wait(timeout)
+
+def _lowerThreadPriority():
+  """Lower the priority of the current thread (when supported by the OS)"""
+  try:
+    os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 19)
+  except (AttributeError, OSError):
+    pass
+
+def _removeTrashFolder(handle, workers):
+  """Remove a trash folder (background thread)"""
+  _lowerThreadPriority()
+  try:
+    handle.stats = removeFolderParallel(handle.trash_path, workers)
+  except OSError as err:
+    handle.error = err
+    logging.warning("Could not remove folder {}: {}".format(handle.trash_path, err))
+  finally:
+    with _trash_lock:
+      _trash_in_progress.discard(handle.trash_path)
+    handle._done.set()
+
+def _startTrashRemoval(path, trash_path, workers):
+  """Start removing a trash folder in background (already claimed in _trash_in_progress)
+
+  return: (FolderRemovalHandle) Handle of the removal
+  """
+  handle = FolderRemovalHandle(path, trash_path)
+  # Daemon thread: Exiting does not wait for a huge folder to be removed, what remains is swept on next run
+  thread = threading.Thread(target=_removeTrashFolder, args=(handle, workers),
+                            name="removeFolder "+os.path.basename(trash_path), daemon=True)
+  thread.start()
+  return handle
+
+def _isProcessAlive(pid):
+  """Check if a process is running
+
+  Keyword arguments:
+      pid -- (int) Process ID
+
+  return: (bool) Process is running (or its state is unknown)
+  """
+  if os.name == "nt":
+    # os.kill() would terminate the process on Windows
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    process = kernel32.OpenProcess(0x1000, False, pid) # PROCESS_QUERY_LIMITED_INFORMATION
+    if not process:
+      return ctypes.get_last_error() == 5 # ERROR_ACCESS_DENIED: Running process of another user
+    try:
+      exit_code = ctypes.c_ulong()
+      return not kernel32.GetExitCodeProcess(process, ctypes.byref(exit_code)) or exit_code.value == 259 # STILL_ACTIVE
+    finally:
+      kernel32.CloseHandle(process)
+
+  try:
+    os.kill(pid, 0)
+  except ProcessLookupError:
+    return False
+  except PermissionError:
+    pass # Running process of another user
+  return True
+
+def _getTrashOwner(trash_name):
+  """Get the ID of the process which created a trash folder
+
+  Keyword arguments:
+      trash_name -- (string) Name of the trash folder
+
+  return: (int) Process ID (None if not found in the name)
+  """
+  parts = trash_name.rsplit("-", 2)
+  if len(parts) != 3 or not parts[1].isdigit():
+    return None
+  return int(parts[1])
+
+def sweepFolderTrash(folder, workers=DEFAULT_BACKGROUND_REMOVE_WORKERS):
+  """Remove in background the trash folders left in a folder (after a crash for example)
+
+  Trash folders being removed by this process or by another running process are skipped.
+
+  Keyword arguments:
+      folder -- (string) Folder which may contain trash folders
+      workers -- (int, optional) Number of threads removing files of each trash folder
+
+  return: (list) FolderRemovalHandle of each trash folder found
+  """
+  handles = []
+  # Absolute paths: same names as the trash folders claimed by removeFolderInBackground()
+  folder = os.path.abspath(folder)
+  with _trash_lock:
+    _swept_folders.add(folder)
+  with os.scandir(folder) as entries:
+    for entry in entries:
+      if not entry.name.startswith(_TRASH_PREFIX) or not entry.is_dir(follow_symlinks=False):
+        continue
+      owner_pid = _getTrashOwner(entry.name)
+      if owner_pid is not None and owner_pid != os.getpid() and _isProcessAlive(owner_pid):
+        logging.debug("Trash folder "+entry.path+" is being removed by process "+str(owner_pid))
+        continue
+      # Checked and claimed at once so that two sweeps (or a sweep and a removal) never remove the same folder
+      with _trash_lock:
+        if entry.path in _trash_in_progress:
+          continue
+        _trash_in_progress.add(entry.path)
+      logging.debug("Removing trash folder "+entry.path+" left by a previous run")
+      handles.append(_startTrashRemoval(entry.path, entry.path, workers))
+  return handles
+
+def removeFolderInBackground(path, workers=DEFAULT_BACKGROUND_REMOVE_WORKERS):
+  """Delete an existing directory without waiting for its content to be removed
+
+  The folder is atomically renamed to a hidden trash folder next to it (same
+  file system) so it is gone immediately, then a low priority thread removes it.
+  Trash folders left by a previous run (crash, ...) in the same parent folder are
+  removed the first time a folder of this parent folder is removed.
+  The removal thread does not prevent the program from exiting: A folder which
+  is not fully removed at exit is removed by the next sweep of its parent folder.
+
+  Keyword arguments:
+      path -- (string) Name of the folder to delete (relative or absolute)
+                       Only last folder of the path will be deleted
+      workers -- (int, optional) Number of threads removing files
+
+  return: (FolderRemovalHandle) Handle to wait for or poll the end of the removal
+  """
+  # Check if folder exists
+  if not os.path.exists(path):
+    logging.debug("Folder "+path+" does not exist")
+    handle = FolderRemovalHandle(path, None)
+    handle.stats = {"files": 0, "folders": 0, "bytes": 0}
+    handle._done.set()
+    return handle
+
+  if os.path.islink(path):
+    raise OSError("Cannot remove a symbolic link to a folder: {}".format(path))
+
+  absolute_path = os.path.abspath(path)
+  parent_folder = os.path.dirname(absolute_path)
+  with _trash_lock:
+    parent_folder_swept = parent_folder in _swept_folders
+  if not parent_folder_swept:
+    sweepFolderTrash(parent_folder, workers)
+
+  trash_path = os.path.join(parent_folder, _TRASH_PREFIX+os.path.basename(absolute_path)+"-"+str(os.getpid())+"-"+uuid.uuid4().hex)
+  # Claimed before being renamed: a concurrent sweep must not see it as left by a previous run
+  with _trash_lock:
+    _trash_in_progress.add(trash_path)
+  try:
+    os.rename(path, trash_path)
+  except OSError:
+    with _trash_lock:
+      _trash_in_progress.discard(trash_path)
+    raise
+  logging.debug("Folder "+path+" moved to "+trash_path+" to be removed in background")
+
+  return _startTrashRemoval(path, trash_path, workers)
+
+class FolderIndex(object):
+  """Index of a folder tree (path, size, mtime and inode of every file) stored in SQLite
+
+  A folder content only changes (file added, removed or renamed) when the folder
+  mtime changes, so later scans only list the folders whose mtime changed.
+  Note: a file modified in place does not change its folder mtime, use
+  update(full_scan=True) to also refresh the size/mtime of such files.
+
+  example:
+    '''
+    index = FolderIndex("/var/spool/logs", "/var/cache/logs_index.sqlite")
+    index.update()
+    print("Total size: "+str(index.getTotalSize()))
+    print("Largest files: "+str(index.getLargestFiles(10)))
+    index.close()
+    '''
+  """
+
+  def __init__(self, root, index_file):
+    """Open (or create) the index of a folder
+
+    Keyword arguments:
+        root -- (string) Folder to index
+        index_file -- (string) SQLite file of the index (":memory:" for a temporary index)
+    """
+    self.root = os.path.abspath(root)
+    self._connection = sqlite3.connect(index_file)
+    self._connection.executescript("""
+      CREATE TABLE IF NOT EXISTS folders (path TEXT PRIMARY KEY, parent TEXT, mtime_ns INTEGER, scan_id INTEGER);
+      CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, folder TEXT, size INTEGER, mtime REAL, inode INTEGER);
+      CREATE INDEX IF NOT EXISTS folders_parent ON folders (parent);
+      CREATE INDEX IF NOT EXISTS files_folder ON files (folder);
+      CREATE INDEX IF NOT EXISTS files_size ON files (size);
+      CREATE INDEX IF NOT EXISTS files_mtime ON files (mtime);
+    """)
+
+  def close(self):
+    """Close the index"""
+    self._connection.close()
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, exc_type, exc_value, traceback):
+    self.close()
+
+  def _getAbsolutePath(self, relative_path):
+    return os.path.join(self.root, relative_path) if relative_path else self.root
+
+  def update(self, full_scan=False):
+    """Update the index from the folder tree
+
+    Keyword arguments:
+        full_scan -- (bool, optional) List every folder even if its mtime did not change
+
+    return: (dict) Number of "scanned_folders", "skipped_folders" (unchanged) and "files" indexed
+    """
+    stats = {"scanned_folders": 0, "skipped_folders": 0, "files": 0}
+    cursor = self._connection.cursor()
+    scan_id = (cursor.execute("SELECT MAX(scan_id) FROM folders").fetchone()[0] or 0) + 1
+
+    with self._connection:
+      folders_to_scan = [("", None)]
+      while folders_to_scan:
+        folder, parent = folders_to_scan.pop()
+        try:
+          # Root may be a symbolic link to the folder (its own mtime never changes)
+          stat_function = os.stat if folder == "" else os.lstat
+          folder_mtime_ns = stat_function(self._getAbsolutePath(folder)).st_mtime_ns
+        except FileNotFoundError:
+          # Removed during the scan, will be removed from the index with the other missing folders
+          continue
+        row = cursor.execute("SELECT mtime_ns FROM folders WHERE path = ?", (folder,)).fetchone()
+
+        if row is not None and row[0] == folder_mtime_ns and not full_scan:
+          # Folder content did not change, only sub folders need to be checked
+          stats["skipped_folders"] += 1
+          cursor.execute("UPDATE folders SET scan_id = ? WHERE path = ?", (scan_id, folder))
+          sub_folders = [sub_folder for (sub_folder,) in
+                         cursor.execute("SELECT path FROM folders WHERE parent = ?", (folder,)).fetchall()]
+        else:
+          stats["scanned_folders"] += 1
+          sub_folders, files = self._scanFolder(folder)
+          cursor.execute("DELETE FROM files WHERE folder = ?", (folder,))
+          cursor.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)", files)
+          cursor.execute("INSERT OR REPLACE INTO folders VALUES (?, ?, ?, ?)",
+                         (folder, parent, folder_mtime_ns, scan_id))
+
+        folders_to_scan += [(sub_folder, folder) for sub_folder in sub_folders]
+
+      # Folders not found during this scan do not exist anymore
+      cursor.execute("DELETE FROM files WHERE folder IN (SELECT path FROM folders WHERE scan_id != ?)", (scan_id,))
+      cursor.execute("DELETE FROM folders WHERE scan_id != ?", (scan_id,))
+
+    stats["files"] = cursor.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+    logging.debug("Index of {} updated: {}".format(self.root, stats))
+    return stats
+
+  def _scanFolder(self, folder):
+    """List a folder
+
+    return: (tuple) Sub folders (list of relative paths) and files (list of index rows)
+    """
+    sub_folders = []
+    files = []
+    try:
+      with os.scandir(self._getAbsolutePath(folder)) as entries:
+        for entry in entries:
+          relative_path = os.path.join(folder, entry.name) if folder else entry.name
+          try:
+            if entry.is_dir(follow_symlinks=False):
+              sub_folders.append(relative_path)
+            else:
+              entry_stat = entry.stat(follow_symlinks=False)
+              files.append((relative_path, folder, entry_stat.st_size, entry_stat.st_mtime, entry_stat.st_ino))
+          except FileNotFoundError:
+            continue
+    except (FileNotFoundError, NotADirectoryError):
+      pass
+    return sub_folders, files
+
+  def getTotalSize(self):
+    """Get the size of all the files of the folder tree
+
+    return: (int) Total size in bytes
+    """
+    return self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM files").fetchone()[0]
+
+  def getFileCount(self):
+    """Get the number of files of the folder tree
+
+    return: (int) Number of files
+    """
+    return self._connection.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+  def getLargestFiles(self, count):
+    """Get the largest files of the folder tree
+
+    Keyword arguments:
+        count -- (int) Number of files to get
+
+    return: (list) (absolute path, size) of the largest files (largest first)
+    """
+    rows = self._connection.execute("SELECT path, size FROM files ORDER BY size DESC LIMIT ?", (count,))
+    return [(self._getAbsolutePath(path), size) for path, size in rows]
+
+  def getFilesOlderThan(self, timestamp):
+    """Get the files last modified before a date
+
+    Keyword arguments:
+        timestamp -- (float) Date (seconds since epoch, see time.time())
+
+    return: (list) (absolute path, mtime) of the files (oldest first)
+    """
+    rows = self._connection.execute("SELECT path, mtime FROM files WHERE mtime < ? ORDER BY mtime", (timestamp,))
+    return [(self._getAbsolutePath(path), mtime) for path, mtime in rows]
+
+def _listFolderTree(root):
+  """List a folder tree
+
+  Keyword arguments:
+      root -- (string) Folder to list
+
+  return: (dict) os.stat_result (not following links) of each entry, by relative path
+  """
+  entries_stat = {}
+  if not os.path.isdir(root):
+    return entries_stat
+  folders_to_scan = [""]
+  while folders_to_scan:
+    folder = folders_to_scan.pop()
+    with os.scandir(os.path.join(root, folder)) as entries:
+      for entry in entries:
+        relative_path = os.path.join(folder, entry.name) if folder else entry.name
+        entries_stat[relative_path] = entry.stat(follow_symlinks=False)
+        if entry.is_dir(follow_symlinks=False):
+          folders_to_scan.append(relative_path)
+  return entries_stat
+
+def _hashFile(path):
+  """Get the hash of a file content"""
+  file_hash = hashlib.blake2b()
+  with open(path, "rb") as _file:
+    for chunk in iter(lambda: _file.read(_COPY_CHUNK_SIZE), b""):
+      file_hash.update(chunk)
+  return file_hash.digest()
+
+def _copyFileContent(source_file, destination_file):
+  """Copy the content of a file with zero copy system calls when available
+
+  copy_file_range (Linux 4.5+, may even share blocks on some file systems) is
+  tried first, then sendfile and finally a normal read/write copy.
+
+  Keyword arguments:
+      source_file -- (file object) File to copy (opened in binary mode)
+      destination_file -- (file object) Destination file (opened in binary mode)
+  """
+  source_fd = source_file.fileno()
+  destination_fd = destination_file.fileno()
+  remaining_size = os.fstat(source_fd).st_size
+
+  for copy_function in (getattr(os, "copy_file_range", None),
+                        getattr(os, "sendfile", None)):
+    if copy_function is None:
+      continue
+    try:
+      while remaining_size > 0:
+        if copy_function is os.sendfile:
+          copied_size = os.sendfile(destination_fd, source_fd, None, remaining_size)
+        else:
+          copied_size = copy_function(source_fd, destination_fd, remaining_size)
+        if copied_size == 0:
+          break
+        remaining_size -= copied_size
+      return
+    except OSError as err:
+      # Not supported for these files (nothing was copied with this function)
+      if err.errno not in (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTSUP):
+        raise
+
+  shutil.copyfileobj(source_file, destination_file, _COPY_CHUNK_SIZE)
+
+def _copyFile(source, destination):
+  """Copy a file (or symbolic link) with its mtime and permissions, replacing the destination atomically"""
+  temporary_destination = os.path.join(os.path.dirname(destination),
+                                       ".sync-"+uuid.uuid4().hex+"-"+os.path.basename(destination))
+  try:
+    if os.path.islink(source):
+      os.symlink(os.readlink(source), temporary_destination)
+    else:
+      with open(source, "rb") as source_file:
+        with open(temporary_destination, "wb") as destination_file:
+          _copyFileContent(source_file, destination_file)
+      shutil.copystat(source, temporary_destination)
+    os.replace(temporary_destination, destination)
+  except BaseException:
+    if os.path.lexists(temporary_destination):
+      os.unlink(temporary_destination)
+    raise
+
+def _compareFiles(source, destination, source_stat, destination_stat):
+  """Get the action needed to synchronize a file (thread pool worker)
+
+  return: (string) "unchanged", "update_mtime" or "copy"
+  """
+  if stat.S_ISLNK(source_stat.st_mode) or stat.S_ISLNK(destination_stat.st_mode):
+    same_links = stat.S_ISLNK(source_stat.st_mode) and stat.S_ISLNK(destination_stat.st_mode) and \
+                 os.readlink(source) == os.readlink(destination)
+    return "unchanged" if same_links else "copy"
+  if not stat.S_ISREG(destination_stat.st_mode) or source_stat.st_size != destination_stat.st_size:
+    return "copy"
+  if source_stat.st_mtime_ns == destination_stat.st_mtime_ns:
+    return "unchanged"
+  if _hashFile(source) != _hashFile(destination):
+    return "copy"
+  # Same content: The destination file system may not store the source mtime precision (FAT: 2 seconds)
+  if destination_stat.st_mtime_ns % 1000000000 == 0 and \
+     abs(source_stat.st_mtime_ns - destination_stat.st_mtime_ns) < 2000000000:
+    return "unchanged"
+  return "update_mtime"
+
+def syncFolder(source, destination, delete=False, dry_run=False, workers=DEFAULT_SYNC_WORKERS):
+  """Mirror a folder tree to another folder copying only what changed
+
+  Files are compared by size and mtime (nanoseconds) first and only hashed when
+  they have the same size but a different mtime. Changed files are copied by a
+  pool of threads using zero copy system calls and replace the destination files
+  atomically. Special files (FIFO, devices, sockets) are skipped.
+
+  Keyword arguments:
+      source -- (string) Folder to mirror (must exist: A missing source folder is an error, not an empty tree)
+      destination -- (string) Mirror folder (created if needed)
+      delete -- (bool, optional) Delete files and folders which are not in the source folder
+      dry_run -- (bool, optional) Only compute the plan (nothing is modified)
+      workers -- (int, optional) Number of threads comparing and copying files
+
+  return: (dict) Plan (relative paths): "create_folders", "copy", "update_mtime", "delete"
+                 lists, "unchanged" files count and "copied_bytes"
+  """
+  plan = {"create_folders": [], "copy": [], "update_mtime": [], "delete": [], "unchanged": 0, "copied_bytes": 0}
+
+  # Never mirror an empty tree because of a mistyped or unmounted source folder
+  if not os.path.isdir(source):
+    if os.path.exists(source):
+      raise NotADirectoryError(errno.ENOTDIR, os.strerror(errno.ENOTDIR), source)
+    raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), source)
+
+  source_entries = _listFolderTree(source)
+  destination_entries = _listFolderTree(destination)
+
+  files_to_compare = []
+  for relative_path, source_stat in sorted(source_entries.items()):
+    if not (stat.S_ISREG(source_stat.st_mode) or stat.S_ISDIR(source_stat.st_mode) or
+            stat.S_ISLNK(source_stat.st_mode)):
+      logging.debug("Special file "+os.path.join(source, relative_path)+" not synchronized")
+      continue
+    destination_stat = destination_entries.get(relative_path)
+    source_is_folder = stat.S_ISDIR(source_stat.st_mode)
+    destination_is_folder = destination_stat is not None and stat.S_ISDIR(destination_stat.st_mode)
+
+    # An entry of the wrong type must be removed even if delete is False
+    if destination_stat is not None and source_is_folder != destination_is_folder:
+      plan["delete"].append(relative_path)
+      destination_stat = None
+
+    if source_is_folder:
+      if destination_stat is None:
+        plan["create_folders"].append(relative_path)
+    elif destination_stat is None:
+      plan["copy"].append(relative_path)
+    else:
+      files_to_compare.append((relative_path, source_stat, destination_stat))
+
+  # Content of a deleted folder is deleted with the folder (parents are sorted before their content)
+  deleted_entries = set(plan["delete"])
+  for relative_path in sorted(destination_entries):
+    if os.path.dirname(relative_path) in deleted_entries:
+      deleted_entries.add(relative_path)
+    elif delete and relative_path not in source_entries:
+      deleted_entries.add(relative_path)
+      plan["delete"].append(relative_path)
+
+  pool = multiprocessing.pool.ThreadPool(workers)
+  try:
+    comparisons = pool.map(lambda file_to_compare: _compareFiles(os.path.join(source, file_to_compare[0]),
+                                                               os.path.join(destination, file_to_compare[0]),
+                                                               file_to_compare[1], file_to_compare[2]),
+                           files_to_compare)
+    for (relative_path, _, _), action in zip(files_to_compare, comparisons):
+      if action == "unchanged":
+        plan["unchanged"] += 1
+      else:
+        plan[action].append(relative_path)
+    plan["copied_bytes"] = sum(source_entries[relative_path].st_size for relative_path in plan["copy"])
+
+    if dry_run:
+      return plan
+
+    for relative_path in plan["delete"]:
+      destination_path = os.path.join(destination, relative_path)
+      if stat.S_ISDIR(destination_entries[relative_path].st_mode):
+        removeFolderParallel(destination_path)
+      else:
+        os.unlink(destination_path)
+
+    known_folders = set()
+    createFolders([destination], known_folders)
+    createFolders([os.path.join(destination, relative_path) for relative_path in plan["create_folders"]],
+                  known_folders)
+
+    pool.map(lambda relative_path: _copyFile(os.path.join(source, relative_path),
+                                             os.path.join(destination, relative_path)),
+             plan["copy"], chunksize=1)
+    for relative_path in plan["update_mtime"]:
+      source_stat = source_entries[relative_path]
+      os.utime(os.path.join(destination, relative_path), ns=(source_stat.st_atime_ns, source_stat.st_mtime_ns))
+  finally:
+    pool.close()
+    pool.join()
+
+  logging.debug("Folder {} synchronized to {}: {} copied ({} bytes), {} mtime updated, {} deleted, {} unchanged"
+                .format(source, destination, len(plan["copy"]), plan["copied_bytes"], len(plan["update_mtime"]),
+                        len(plan["delete"]), plan["unchanged"]))
+  return plan
+
+# inotify constants (see "man 7 inotify")
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ISDIR = 0x40000000
+_IN_WATCH_MASK = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE | \
+                 _IN_DELETE_SELF | _IN_MOVE_SELF
+_INOTIFY_EVENT = struct.Struct("iIII")
+
+def _loadInotify():
+  """Get the libc giving access to inotify (None if not available)"""
+  if not sys.platform.startswith("linux"):
+    return None
+  try:
+    libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    libc.inotify_init1.argtypes = [ctypes.c_int]
+    libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+    return libc
+  except (OSError, AttributeError):
+    return None
+
+class FolderWatcher(threading.Thread):
+  """Call a function with batches of changes of a folder (files created, modified or deleted)
+
+  Linux inotify is used when available (no polling at all), otherwise the folder
+  is scanned periodically and compared to the previous scan. Changes happening in
+  a burst are coalesced into a single batch.
+
+  example:
+    '''
+    def onChanges(changes):
+      for change, path in changes:
+        print(change+": "+path)
+
+    watcher = FolderWatcher("/var/spool/incoming", onChanges, recursive=True)
+    watcher.start()
+    print("Doing some stuff here without being blocked")
+    time.sleep(60)
+    watcher.stop()
+    '''
+  """
+
+  def __init__(self, path, callback, recursive=False, coalesce_delay=DEFAULT_WATCH_COALESCE_DELAY,
+               poll_interval=DEFAULT_WATCH_POLL_INTERVAL, use_inotify=True):
+    """Initialize the watcher thread
+
+    Keyword arguments:
+        path -- (string) Folder to watch
+        callback -- (function) Function called with a list of (change, path) tuples
+                               (change is "created", "modified", "deleted" or
+                               "overflow" if some changes were lost)
+        recursive -- (bool, optional) Also watch sub folders
+        coalesce_delay -- (float, optional) Delay without new change before calling callback (seconds)
+        poll_interval -- (float, optional) Delay between two scans without inotify (seconds)
+        use_inotify -- (bool, optional) Use inotify if available (False to always poll)
+    """
+    threading.Thread.__init__(self)
+    self.daemon = True
+
+    self.path = path
+    self.callback = callback
+    self.recursive = recursive
+    self.coalesce_delay = coalesce_delay
+    self.poll_interval = poll_interval
+    self._libc = _loadInotify() if use_inotify else None
+    self.uses_inotify = self._libc is not None
+
+    self._stop_event = threading.Event()
+    # Set once the folder is watched (changes done after start() returns are never missed)
+    self._ready_event = threading.Event()
+    # Pipe waking up the inotify thread when stopping (only open while the thread runs)
+    self._wake_up_lock = threading.Lock()
+    self._wake_up_pipe = None
+
+  def start(self):
+    """Start the thread and wait for the folder to be watched"""
+    threading.Thread.start(self)
+    self._ready_event.wait()
+
+  def stop(self):
+    """Stop the thread (immediately effective)"""
+    self._stop_event.set()
+    with self._wake_up_lock:
+      if self._wake_up_pipe is not None:
+        os.write(self._wake_up_pipe[1], b"x")
+
+  def run(self):
+    if self.uses_inotify:
+      with self._wake_up_lock:
+        self._wake_up_pipe = os.pipe()
+    try:
+      if self.uses_inotify:
+        self._runInotify()
+      else:
+        self._runPolling()
+    finally:
+      self._ready_event.set()
+      with self._wake_up_lock:
+        if self._wake_up_pipe is not None:
+          for fd in self._wake_up_pipe:
+            os.close(fd)
+          self._wake_up_pipe = None
+
+  def _notify(self, changes):
+    """Give a batch of changes to the callback"""
+    if not changes:
+      return
+    try:
+      self.callback([(change, path) for path, change in changes.items()])
+    except Exception:
+      logging.exception("Folder watcher callback failed")
+
+  @staticmethod
+  def _addChange(changes, path, change):
+    """Add a change to a batch, merging it with the previous change of the same path"""
+    previous_change = changes.get(path)
+    if previous_change == "created" and change == "modified":
+      return
+    if previous_change == "created" and change == "deleted":
+      del changes[path]
+      return
+    if previous_change == "deleted" and change == "created":
+      change = "modified"
+    changes[path] = change
+
+  def _listFiles(self):
+    """List the watched files (polling mode)
+
+    return: (dict) (mtime, size) of each path
+    """
+    files = {}
+    folders_to_scan = [self.path]
+    while folders_to_scan:
+      try:
+        with os.scandir(folders_to_scan.pop()) as entries:
+          for entry in entries:
+            try:
+              entry_stat = entry.stat(follow_symlinks=False)
+            except FileNotFoundError:
+              continue
+            files[entry.path] = (entry_stat.st_mtime_ns, entry_stat.st_size)
+            if self.recursive and entry.is_dir(follow_symlinks=False):
+              folders_to_scan.append(entry.path)
+      except (FileNotFoundError, NotADirectoryError):
+        continue
+    return files
+
+  def _runPolling(self):
+    previous_files = self._listFiles()
+    self._ready_event.set()
+    while not self._stop_event.wait(self.poll_interval):
+      files = self._listFiles()
+      changes = collections.OrderedDict()
+      for path, file_state in files.items():
+        previous_file_state = previous_files.get(path)
+        if previous_file_state is None:
+          changes[path] = "created"
+        elif previous_file_state != file_state:
+          changes[path] = "modified"
+      for path in previous_files:
+        if path not in files:
+          changes[path] = "deleted"
+      previous_files = files
+      self._notify(changes)
+
+  def _addWatch(self, inotify_fd, folder, watched_folders, changes=None):
+    """Watch a folder (and its sub folders in recursive mode)
+
+    Keyword arguments:
+        changes -- (dict, optional) Batch to add the content of the folder to (folder created after the start)
+    """
+    folders_to_watch = [folder]
+    while folders_to_watch:
+      folder = folders_to_watch.pop()
+      watch_descriptor = self._libc.inotify_add_watch(inotify_fd, os.fsencode(folder), _IN_WATCH_MASK)
+      if watch_descriptor < 0:
+        logging.warning("Could not watch folder {}: {}".format(folder, os.strerror(ctypes.get_errno())))
+        continue
+      watched_folders[watch_descriptor] = folder
+      if not self.recursive and changes is None:
+        continue
+      try:
+        with os.scandir(folder) as entries:
+          for entry in entries:
+            # Files may have been created before the folder was watched
+            if changes is not None:
+              self._addChange(changes, entry.path, "created")
+            if self.recursive and entry.is_dir(follow_symlinks=False):
+              folders_to_watch.append(entry.path)
+      except (FileNotFoundError, NotADirectoryError):
+        continue
+
+  def _readInotifyEvents(self, inotify_fd, watched_folders, changes):
+    """Read the available inotify events and add them to the batch of changes"""
+    try:
+      data = os.read(inotify_fd, 64 * 1024)
+    except BlockingIOError:
+      return
+    offset = 0
+    while offset < len(data):
+      watch_descriptor, mask, _, name_size = _INOTIFY_EVENT.unpack_from(data, offset)
+      offset += _INOTIFY_EVENT.size
+      name = os.fsdecode(data[offset:offset + name_size].rstrip(b"\0"))
+      offset += name_size
+
+      if mask & _IN_Q_OVERFLOW:
+        logging.warning("Too many changes in folder {}, some changes were lost".format(self.path))
+        changes[self.path] = "overflow"
+        continue
+      folder = watched_folders.get(watch_descriptor)
+      if folder is None:
+        continue
+      if mask & _IN_IGNORED:
+        del watched_folders[watch_descriptor]
+        continue
+      if mask & (_IN_DELETE_SELF | _IN_MOVE_SELF):
+        if folder == self.path:
+          self._addChange(changes, folder, "deleted")
+        continue
+
+      path = os.path.join(folder, name)
+      if mask & (_IN_CREATE | _IN_MOVED_TO):
+        self._addChange(changes, path, "created")
+        if self.recursive and (mask & _IN_ISDIR):
+          self._addWatch(inotify_fd, path, watched_folders, changes)
+      elif mask & (_IN_DELETE | _IN_MOVED_FROM):
+        self._addChange(changes, path, "deleted")
+      elif mask & (_IN_MODIFY | _IN_CLOSE_WRITE):
+        self._addChange(changes, path, "modified")
+
+  def _runInotify(self):
+    inotify_fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    if inotify_fd < 0:
+      logging.warning("Could not use inotify ({}), polling folder instead".format(os.strerror(ctypes.get_errno())))
+      self.uses_inotify = False
+      self._runPolling()
+      return
+
+    try:
+      watched_folders = {}
+      self._addWatch(inotify_fd, self.path, watched_folders)
+      self._ready_event.set()
+      changes = collections.OrderedDict()
+      first_change_time = last_change_time = None
+      # Changes are given at least this often even if the burst of changes does not end
+      max_batch_delay = max(1.0, 10 * self.coalesce_delay)
+      while not self._stop_event.is_set():
+        # Block until a change happens, then wait for the burst of changes to end
+        timeout = None
+        if changes:
+          deadline = min(last_change_time + self.coalesce_delay, first_change_time + max_batch_delay)
+          timeout = max(0, deadline - time.monotonic())
+        readable_fds, _, _ = select.select([inotify_fd, self._wake_up_pipe[0]], [], [], timeout)
+        if inotify_fd in readable_fds:
+          if not changes:
+            first_change_time = time.monotonic()
+          self._readInotifyEvents(inotify_fd, watched_folders, changes)
+          last_change_time = time.monotonic()
+        if changes and (not readable_fds or time.monotonic() >= first_change_time + max_batch_delay):
+          self._notify(changes)
+          changes = collections.OrderedDict()
+    finally:
+      os.close(inotify_fd)
+
 def main():
   """Demo of the folder utility functions"""
 
@@ -66,6 +1240,50 @@ def main():
   print("\n-----------------Delete folder----------------------")
   removeFolder(folder_path)
 
+  print("\n--------Create folders (with parent folders)---------")
+  createFolders([os.path.join(folder_path, "a", "b"), os.path.join(folder_path, "a", "c")])
+  with open(os.path.join(folder_path, "a", "b", "file.txt"), "w") as _file:
+    _file.write("Some data")
+
+  print("\n-----------------Index folder-----------------------")
+  with FolderIndex(folder_path, ":memory:") as index:
+    print("First scan: "+str(index.update()))
+    print("Second scan: "+str(index.update()))
+    print("Total size: "+str(index.getTotalSize())+" bytes")
+    print("Largest files: "+str(index.getLargestFiles(5)))
+
+  print("\n----------------Synchronize folder------------------")
+  mirror_folder_path = folder_path+"Mirror"
+  print("First synchronization: "+str(syncFolder(folder_path, mirror_folder_path)))
+  print("Second synchronization: "+str(syncFolder(folder_path, mirror_folder_path)))
+  removeFolder(mirror_folder_path)
+
+  print("\n------------------Watch folder----------------------")
+  watcher = FolderWatcher(folder_path, lambda changes: print("Changes: "+str(changes)), recursive=True)
+  watcher.start()
+  with open(os.path.join(folder_path, "a", "new_file.txt"), "w") as _file:
+    _file.write("Some data")
+  time.sleep(watcher.poll_interval * 2)
+  watcher.stop()
+
+  print("\n------------------Clean folder----------------------")
+  print("Keep less than 5 bytes (dry run): "+str(cleanFolder(folder_path, max_size=5, dry_run=True)))
+  print("Keep files of less than 1 day: "+str(cleanFolder(folder_path, max_age=24 * 3600)))
+  removeFolder(folder_path)
+
+  print("\n-----------Delete folder (parallel mode)------------")
+  createFolder(folder_path)
+  with open(os.path.join(folder_path, "file.txt"), "w") as _file:
+    _file.write("Some data")
+  print("Removal statistics: "+str(removeFolderParallel(folder_path)))
+
+  print("\n----------Delete folder (background mode)-----------")
+  createFolder(folder_path)
+  handle = removeFolderInBackground(folder_path)
+  print("Folder still exists: "+str(os.path.exists(folder_path)))
+  handle.wait()
+  print("Removal statistics: "+str(handle.stats))
+
   print("\n----------------------------------------------------")
   print("-------------------End of demo----------------------")
   print("----------------------------------------------------\n")